@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start cost of ``pywhmcs.client``.
+
+Each scenario runs in a fresh interpreter so nothing is cached between
+runs. Usage::
+
+    python benchmarks/bench_import.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+SCENARIOS = {
+    'import pywhmcs.client': 'import pywhmcs.client',
+    'Client() + general bridge': (
+        'from pywhmcs import client\n'
+        'client.Client("https://example.invalid/includes/api.php", "u", "p").general'
+    ),
+    'Client() + all bridges': (
+        'from pywhmcs import client\n'
+        'c = client.Client("https://example.invalid/includes/api.php", "u", "p")\n'
+        'c.clients, c.general, c.invoices, c.orders, c.products, c.promotions, c.tickets'
+    ),
+    'import requests + phpserialize': 'import requests, phpserialize',
+}
+
+TEMPLATE = '''
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+'''
+
+
+def measure(code, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, '-c', TEMPLATE.format(code=code)],
+            cwd=ROOT,
+            env=dict(os.environ, PYTHONPATH=ROOT)
+        )
+        timings.append(float(output))
+
+    return timings
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    for (name, code) in SCENARIOS.items():
+        timings = measure(code, runs)
+        print(f'{name:<35} median {statistics.median(timings) * 1000:8.2f} ms'
+              f'  min {min(timings) * 1000:8.2f} ms  ({runs} runs)')
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    main()
+    print(f'total {time.perf_counter() - start:.1f}s')
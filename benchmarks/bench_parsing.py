@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Compare record parsing throughput of the schema-generated parsers against
+the hand-written mappings they replaced. Usage::
+
+    python benchmarks/bench_parsing.py [records]
+"""
+
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from pywhmcs import invoices  # noqa: E402 pylint: disable=wrong-import-position
+from pywhmcs import orders  # noqa: E402 pylint: disable=wrong-import-position
+
+INVOICE = {
+    'id': '1001', 'userid': '42', 'invoicenum': '', 'date': '2020-01-01',
+    'duedate': '2020-01-15', 'datepaid': '2020-01-03 10:11:12', 'subtotal': '10.00',
+    'credit': '0.00', 'tax': '1.50', 'tax2': '0.00', 'total': '11.50', 'balance': '0.00',
+    'taxrate': '15.00', 'taxrate2': '0.00', 'status': 'Paid', 'paymentmethod': 'paypal',
+    'notes': '', 'ccgateway': False,
+}
+
+ORDER = {
+    'id': '77', 'ordernum': '123456', 'userid': '42', 'contactid': '0', 'date': '2020-01-01 09:00:00',
+    'nameservers': '', 'transfersecret': '', 'renewals': '', 'promocode': '', 'promotype': '',
+    'promovalue': '', 'orderdata': '[]', 'amount': '11.50', 'paymentmethod': 'paypal',
+    'invoiceid': '1001', 'status': 'Active', 'ipaddress': '127.0.0.1', 'fraudmodule': '',
+    'fraudoutput': '', 'frauddata': '', 'notes': '', 'paymentmethodname': 'PayPal',
+    'paymentstatus': 'Paid', 'name': 'John Dough', 'currencyprefix': '$', 'currencysuffix': ' USD',
+    'lineitems': {'lineitem': []},
+}
+
+
+def legacy_invoice(whmcs_invoice):
+    try:
+        date_paid = datetime.datetime.strptime(whmcs_invoice['datepaid'], '%Y-%m-%d %H:%M:%S').date(),
+    except ValueError:
+        date_paid = None
+
+    return dict(
+        balance=float(whmcs_invoice.get('balance', 0.0)),
+        cc_gateway=whmcs_invoice.get('ccgateway'),
+        client_id=int(whmcs_invoice['userid']),
+        credit=float(whmcs_invoice['credit']),
+        date=datetime.datetime.strptime(whmcs_invoice['date'], '%Y-%m-%d').date(),
+        date_due=datetime.datetime.strptime(whmcs_invoice['duedate'], '%Y-%m-%d').date(),
+        date_paid=date_paid,
+        id=int(whmcs_invoice['id']),
+        invoice_num=whmcs_invoice['invoicenum'],
+        items=whmcs_invoice['items']['item'] if whmcs_invoice.get('items') else None,
+        notes=whmcs_invoice['notes'],
+        payment_method=whmcs_invoice['paymentmethod'],
+        status=whmcs_invoice['status'].lower(),
+        subtotal=float(whmcs_invoice['subtotal']),
+        tax2=float(whmcs_invoice['tax2']),
+        tax=float(whmcs_invoice['tax']),
+        taxrate2=float(whmcs_invoice['taxrate2']),
+        taxrate=float(whmcs_invoice['taxrate']),
+        total=float(whmcs_invoice['total']),
+        transactions=whmcs_invoice.get('transactions', []),
+    )
+
+
+def legacy_order(whmcs_order):
+    return dict(
+        id=int(whmcs_order['id']),
+        amount=float(whmcs_order['amount']),
+        client_id=int(whmcs_order['userid']),
+        contact_id=int(whmcs_order['contactid']) or None,
+        currency_prefix=whmcs_order['currencyprefix'],
+        currency_suffix=whmcs_order['currencysuffix'],
+        date=datetime.datetime.strptime(whmcs_order['date'], '%Y-%m-%d %H:%M:%S'),
+        fraud_data=whmcs_order['frauddata'] or None,
+        fraud_module=whmcs_order['fraudmodule'] or None,
+        fraud_output=whmcs_order['fraudoutput'] or None,
+        invoice_id=int(whmcs_order['invoiceid']),
+        ip_address=whmcs_order['ipaddress'],
+        line_items=whmcs_order['lineitems'],
+        name=whmcs_order['name'],
+        nameservers=whmcs_order['nameservers'] or None,
+        notes=whmcs_order['notes'] or None,
+        order_data=whmcs_order['orderdata'],
+        order_num=int(whmcs_order['ordernum']),
+        payment_method=whmcs_order['paymentmethod'],
+        payment_method_name=whmcs_order['paymentmethodname'],
+        payment_status=whmcs_order['paymentstatus'],
+        promo_code=whmcs_order['promocode'] or None,
+        promo_type=whmcs_order['promotype'] or None,
+        promo_value=whmcs_order['promovalue'] or None,
+        renewals=whmcs_order['renewals'] or None,
+        status=whmcs_order['status'].lower(),
+        transfer_secret=whmcs_order['transfersecret'] or None,
+    )
+
+
+def variants(record, count):
+    """
+    Copies of ``record`` with dates spread over a year, as in a real listing.
+    """
+
+    start = datetime.datetime(2020, 1, 1, 9, 0, 0)
+    records = []
+    for index in range(count):
+        stamp = start + datetime.timedelta(days=index % 365, seconds=index % 86400)
+        records.append({
+            **record,
+            **{
+                key: stamp.strftime('%Y-%m-%d %H:%M:%S' if len(record[key]) > 10 else '%Y-%m-%d')
+                for key in ('date', 'duedate', 'datepaid') if key in record
+            },
+        })
+    return records
+
+
+CASES = {
+    'invoice': (INVOICE, legacy_invoice, invoices.parse_invoice),
+    'order': (ORDER, legacy_order, orders.parse_order),
+}
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    for (name, (record, legacy, compiled)) in CASES.items():
+        page = variants(record, records)
+        for (label, func) in (('hand-written', legacy), ('schema', compiled)):
+            elapsed = min(timeit.repeat(lambda: [func(item) for item in page], number=1, repeat=5))
+            print(f'{name:<8} {label:<13} {records / elapsed:>12,.0f} records/s')
+
+
+if __name__ == '__main__':
+    main()
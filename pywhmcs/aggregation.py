@@ -0,0 +1,185 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Union
+import concurrent.futures
+import contextvars
+import dataclasses
+import datetime
+
+from pywhmcs import invoices
+
+#: Grouping key: an :class:`~pywhmcs.invoices.Invoice` field name or a
+#: callable taking an invoice
+Key = Union[str, Callable[[invoices.Invoice], Any]]
+
+#: Invoice fields that can be summed
+FIELDS = ('balance', 'total', 'subtotal', 'credit', 'tax', 'tax2')
+
+
+def month(invoice: invoices.Invoice) -> datetime.date:
+    """
+    Grouping key for the first day of the invoice's month.
+    """
+
+    return invoice.date.replace(day=1)
+
+
+@dataclasses.dataclass
+class Totals:
+    """
+    Running count and field sums for one group of invoices.
+    """
+
+    count: int = 0
+    sums: Dict[str, float] = dataclasses.field(default_factory=dict)
+
+    def __getitem__(self, field: str) -> float:
+        return self.sums.get(field, 0.0)
+
+    def add(self, invoice: invoices.Invoice, fields: Sequence[str]) -> None:
+        self.count += 1
+        for field in fields:
+            self.sums[field] = self.sums.get(field, 0.0) + (getattr(invoice, field) or 0.0)
+
+    def merge(self, other: 'Totals') -> None:
+        self.count += other.count
+        for (field, value) in other.sums.items():
+            self.sums[field] = self.sums.get(field, 0.0) + value
+
+
+def _key_func(key: Key) -> Callable[[invoices.Invoice], Any]:
+    if callable(key):
+        return key
+
+    return lambda invoice: getattr(invoice, key)
+
+
+def group(records: Iterable[invoices.Invoice],
+          key: Key,
+          fields: Sequence[str] = ('total',),
+          where: Optional[Callable[[invoices.Invoice], bool]] = None) -> Dict[Any, Totals]:
+    """
+    Count and sum invoices by group as they are iterated.
+
+    Only the running totals are kept, so memory use depends on the number of
+    groups rather than the number of invoices.
+
+    :param records: Invoices, e.g. from :meth:`~pywhmcs.invoices.InvoiceBridge.iter`
+    :param key: Invoice field name or callable to group by
+    :param fields: Invoice fields to sum
+    :param where: Only count invoices for which this returns true
+    :return: Totals keyed by group
+    :rtype: dict
+    """
+
+    key_func = _key_func(key)
+    results: Dict[Any, Totals] = {}
+
+    for invoice in records:
+        if where is not None and not where(invoice):
+            continue
+
+        group_key = key_func(invoice)
+        totals = results.get(group_key)
+        if totals is None:
+            totals = results[group_key] = Totals()
+        totals.add(invoice, fields)
+
+    return results
+
+
+def aggregate(bridge: invoices.InvoiceBridge,
+              key: Key,
+              fields: Sequence[str] = ('total',),
+              where: Optional[Callable[[invoices.Invoice], bool]] = None,
+              client_id: Optional[int] = None,
+              status: Optional[str] = None,
+              page_size: int = 500,
+              workers: Optional[int] = None) -> Dict[Any, Totals]:
+    """
+    Stream invoices from WHMCS and count and sum them by group::
+
+        by_method = aggregate(whmcs.invoices, 'payment_method', status='Paid')
+        by_method['paypal'].count, by_method['paypal']['total']
+
+    With ``workers``, the number of matching invoices is requested first and
+    the pages are then fetched concurrently, each page reduced to its own
+    totals before they are merged. Invoices created or changed while pages
+    are fetched may be missed or counted twice, as with any paged listing.
+
+    :param bridge: Invoice bridge to read from
+    :param key: Invoice field name or callable to group by
+    :param fields: Invoice fields to sum
+    :param where: Only count invoices for which this returns true
+    :param int client_id: Client ID to filter by
+    :param str status: Status to filter by
+    :param int page_size: Number of invoices to request per page
+    :param int workers: Number of pages to fetch at once. Defaults to the
+        ``max_limit`` of the client's
+        :class:`~pywhmcs.limiter.AdaptiveLimiter`, if it has one.
+    :return: Totals keyed by group
+    :rtype: dict
+    """
+
+    unknown = set(fields) - set(FIELDS)
+    if unknown:
+        raise ValueError(f'Cannot sum invoice fields: {", ".join(sorted(unknown))}')
+
+    filters: Dict[str, Any] = {'client_id': client_id, 'status': status}
+
+    if workers is None and bridge.client.limiter is not None:
+        workers = bridge.client.limiter.max_limit
+
+    if not workers or workers < 2:
+        return group(bridge.iter(page_size=page_size, **filters), key, fields, where)
+
+    params = {
+        name: value for (name, value)
+        in {'userid': client_id, 'status': status, 'limitstart': 0, 'limitnum': 1}.items()
+        if value is not None
+    }
+    total = int(bridge.client.send_request('getinvoices', params).get('totalresults') or 0)
+
+    def page(marker):
+        records = bridge.iter(page_size=page_size, marker=marker, limit=page_size, **filters)
+        return group(records, key, fields, where)
+
+    results: Dict[Any, Totals] = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, page, marker)
+            for marker in range(0, total, page_size)
+        ]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                for (group_key, totals) in future.result().items():
+                    results.setdefault(group_key, Totals()).merge(totals)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return results
+
+
+def outstanding_by_client(bridge: invoices.InvoiceBridge, **options) -> Dict[int, Totals]:
+    """
+    Unpaid invoice count and ``balance``/``total`` sums per client ID.
+    """
+
+    return aggregate(bridge, 'client_id', ('balance', 'total'), status='Unpaid', **options)
+
+
+def revenue_by_payment_method(bridge: invoices.InvoiceBridge, **options) -> Dict[str, Totals]:
+    """
+    Paid invoice count and ``total`` sums per payment method.
+    """
+
+    return aggregate(bridge, 'payment_method', ('total',), status='Paid', **options)
+
+
+def tax_by_month(bridge: invoices.InvoiceBridge, **options) -> Dict[datetime.date, Totals]:
+    """
+    Paid invoice ``subtotal``, ``tax``, ``tax2`` and ``total`` sums per
+    month of the invoice date.
+    """
+
+    return aggregate(bridge, month, ('subtotal', 'tax', 'tax2', 'total'), status='Paid', **options)
@@ -1,10 +1,21 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+import collections
+import concurrent.futures
+import contextvars
 import dataclasses
 import logging
+import queue
+import threading
+
+from pywhmcs import exceptions
+from pywhmcs import schema
 
 LOGGER = logging.getLogger(__name__)
 
+#: Number of resources :meth:`BaseBridge._hydrate` fetches at once by default
+HYDRATE_WORKERS = 4
+
 
 def getid(obj):
     """
@@ -19,12 +30,64 @@ def getid(obj):
         return obj
 
 
+def prefetch(iterable: Iterable[Any], buffer: int = 100) -> Iterator[Any]:
+    """
+    Iterate over ``iterable`` on a background thread, keeping up to
+    ``buffer`` items ready ahead of the consumer.
+
+    Used to fetch the next page of a listing while the current one is
+    being processed. Exceptions are re-raised in the consumer.
+    """
+
+    items: queue.Queue = queue.Queue(maxsize=buffer)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((False, item)):
+                    return
+        except BaseException as exc:  # pylint: disable=broad-except
+            put((True, exc))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+            put((False, done))
+
+    # Run with the caller's context, e.g. its request priority
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(produce,), name='whmcs-prefetch', daemon=True).start()
+
+    try:
+        while True:
+            (failed, item) = items.get()
+            if item is done:
+                return
+            if failed:
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
 class BaseBridge:
 
     def __init__(self, client):
         self.client = client
 
-    def list(self, detailed=True, marker=None, limit=None, **filters) -> List[Union[BaseResource, str]]:
+    def list(self, detailed=False, marker=None, limit=None, **filters) -> List[Union[BaseResource, str]]:
         pass
 
     def update(self, resource, **properties):
@@ -33,6 +96,191 @@ class BaseBridge:
     def delete(self, resource):
         pass
 
+    def _paginate(self,
+                  action: str,
+                  params: Dict[str, Any],
+                  collection: str,
+                  item: str,
+                  page_size: int = 100,
+                  marker: int = 0,
+                  limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the records of a paginated WHMCS list action.
+
+        Pages are requested with ``limitstart``/``limitnum`` until
+        ``totalresults`` records (or ``limit`` records) have been returned.
+        Records are streamed, see :meth:`pywhmcs.client.Client.stream_request`.
+        Raises :class:`~pywhmcs.exceptions.IncompleteListing` if a page
+        comes back empty before ``totalresults`` records were returned.
+
+        :param str action: List action to perform, e.g. ``gettickets``
+        :param dict params: API parameters to send with every page
+        :param str collection: Response key holding the records
+        :param str item: Key of the record list within ``collection``
+        :param int page_size: Number of records to request per page
+        :param int marker: Offset of the first record
+        :param int limit: Maximum number of records to return
+        """
+
+        start = marker or 0
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            page_limit = page_size if remaining is None else min(page_size, remaining)
+            meta: Dict[str, Any] = {}
+            count = 0
+
+            records = self.client.stream_request(
+                action,
+                params=dict(params, limitstart=start, limitnum=page_limit),
+                path=f'{collection}.{item}',
+                meta=meta
+            )
+
+            for record in records:
+                count += 1
+                yield record
+
+            start += count
+            if remaining is not None:
+                remaining -= count
+
+            if start >= int(meta.get('totalresults') or 0):
+                return
+
+            # A short page (e.g. WHMCS capping ``limitnum``) is followed by
+            # more requests; an empty one means records went missing
+            if not count:
+                raise exceptions.IncompleteListing(action=action)
+
+    def _iter_resources(self,
+                        action: str,
+                        params: Dict[str, Any],
+                        collection: str,
+                        item: str,
+                        parse: Callable[[Dict[str, Any]], Dict[str, Any]],
+                        cls: type,
+                        page_size: int = 100,
+                        marker: int = 0,
+                        limit: Optional[int] = None) -> Iterator[BaseResource]:
+        """
+        Iterate over the resources of a paginated WHMCS list action.
+
+        Records are converted with ``parse``, a module-level function
+        returning ``cls`` field values. If the client has a
+        :class:`~pywhmcs.parsing.ProcessParser`, pages are fetched raw on a
+        thread pool and parsed on its worker processes, up to its
+        ``max_pending`` pages at a time. Short pages are completed with
+        further requests, see :meth:`_paginate`.
+        """
+
+        parser = self.client.parser
+
+        if parser is None:
+            records = self._paginate(
+                action,
+                params,
+                collection,
+                item,
+                page_size=page_size,
+                marker=marker,
+                limit=limit
+            )
+            for record in records:
+                yield cls(self, **parse(record))
+            return
+
+        path = f'{collection}.{item}'
+        names = [field.name for field in dataclasses.fields(cls)]
+        # Unpickled strings are new objects; intern enum-like values again
+        interned = [
+            index for (index, name) in enumerate(names)
+            if name in getattr(parse, '__interned__', ())
+        ]
+
+        def fetch(start, count):
+            response = self.client.fetch_raw(action, dict(params, limitstart=start, limitnum=count))
+            (meta, page) = parser.submit(response.content, path, parse, names).result()
+            self.client.raise_for_error(meta, action)
+            if interned:
+                page = [schema.intern_row(row, interned) for row in page]
+            return (meta, [cls(self, *row) for row in page])
+
+        def complete(start, count, meta, resources):
+            # A short page (e.g. WHMCS capping ``limitnum``) is not the end
+            while len(resources) < min(count, int(meta.get('totalresults') or 0) - start):
+                (meta, more) = fetch(start + len(resources), count - len(resources))
+                if not more:
+                    raise exceptions.IncompleteListing(action=action)
+                resources.extend(more)
+            return resources
+
+        start = marker or 0
+        count = page_size if limit is None else min(page_size, limit)
+        (meta, resources) = fetch(start, count)
+        resources = complete(start, count, meta, resources)
+        yield from resources
+
+        total = int(meta.get('totalresults') or 0)
+        end = total if limit is None else min(total, start + limit)
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=parser.max_pending,
+            thread_name_prefix='whmcs-pages'
+        )
+        pending: collections.deque = collections.deque()
+
+        try:
+            for offset in range(start + len(resources), end, page_size):
+                count = min(page_size, end - offset)
+                future = executor.submit(contextvars.copy_context().run, fetch, offset, count)
+                pending.append((offset, count, future))
+                if len(pending) >= parser.max_pending:
+                    (offset, count, future) = pending.popleft()
+                    yield from complete(offset, count, *future.result())
+
+            while pending:
+                (offset, count, future) = pending.popleft()
+                yield from complete(offset, count, *future.result())
+        finally:
+            for (_, _, future) in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _hydrate(self,
+                 func: Callable[[Any], Any],
+                 items: Iterable[Any],
+                 workers: Optional[int] = None) -> Iterator[Any]:
+        """
+        Map ``func`` over ``items``, preserving order.
+
+        With ``workers`` greater than one, calls run on a bounded thread pool
+        with at most ``workers * 2`` calls in flight. If ``workers`` is not
+        given and the client has an
+        :class:`~pywhmcs.limiter.AdaptiveLimiter`, its ``max_limit`` is used
+        and the limiter decides how many requests run at once; otherwise
+        :data:`HYDRATE_WORKERS` is used. Pass ``1`` to run calls in turn.
+        """
+
+        if workers is None:
+            limiter = self.client.limiter
+            workers = HYDRATE_WORKERS if limiter is None else limiter.max_limit
+
+        if not workers or workers <= 1:
+            yield from map(func, items)
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: collections.deque = collections.deque()
+
+            for item in items:
+                pending.append(executor.submit(contextvars.copy_context().run, func, item))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
 
 @dataclasses.dataclass
 class BaseResource:
@@ -0,0 +1,169 @@
+from typing import Callable, Dict, Optional
+import threading
+import time
+
+from pywhmcs import exceptions
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def action_group(action: str) -> str:
+    """
+    Default grouping of actions: ``read`` for ``get*`` actions and ``write``
+    for everything else.
+    """
+
+    return 'read' if action.lower().startswith('get') else 'write'
+
+
+class _Circuit:
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the WHMCS endpoint is failing.
+
+    Each action group has its own circuit. A circuit opens after
+    ``failure_threshold`` consecutive failures: requests that raised (connection
+    errors, timeouts), returned an HTTP 5xx status, or took longer than
+    ``slow_call`` seconds. Errors reported by WHMCS itself (``result: error``)
+    are not failures.
+
+    While open, requests raise :class:`~pywhmcs.exceptions.CircuitOpen`
+    without being sent. After ``reset_timeout`` seconds the circuit
+    half-opens and lets up to ``probes`` requests through: a successful probe
+    closes it, a failed one opens it again.
+
+    Pass it to :class:`pywhmcs.client.Client` as ``breaker``; state changes
+    are emitted to instrumentation hooks as ``circuit`` events with ``action``,
+    ``group`` and ``state`` keys.
+
+    :param int failure_threshold: Consecutive failures that open a circuit
+    :param float reset_timeout: Seconds a circuit stays open before probing
+    :param float slow_call: Seconds after which a request counts as failed
+        even if it succeeds. ``None`` disables the latency threshold.
+    :param int probes: Requests let through at once while half-open
+    :param group: Callable mapping an action to its group, see
+        :func:`action_group`
+    """
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0,
+                 slow_call: Optional[float] = None,
+                 probes: int = 1,
+                 group: Callable[[str], str] = action_group):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call = slow_call
+        self.probes = probes
+        self.group = group
+
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def state(self, action_or_group: str) -> str:
+        """
+        Current state of the circuit for an action group.
+        """
+
+        with self._lock:
+            circuit = self._circuits.get(action_or_group)
+            if circuit is None:
+                circuit = self._circuits.get(self.group(action_or_group))
+
+            return circuit.state if circuit is not None else CLOSED
+
+    def allow(self, action: str) -> Optional[str]:
+        """
+        Check whether a request for ``action`` may be sent.
+
+        :return: The circuit's new state if this call changed it
+        :raises: :class:`pywhmcs.exceptions.CircuitOpen`
+        """
+
+        group = self.group(action)
+
+        with self._lock:
+            circuit = self._circuits.setdefault(group, _Circuit())
+
+            if circuit.state == CLOSED:
+                return None
+
+            if circuit.state == OPEN:
+                retry_after = circuit.opened_at + self.reset_timeout - time.monotonic()
+                if retry_after > 0:
+                    raise exceptions.CircuitOpen(action=action, group=group, retry_after=retry_after)
+
+                circuit.state = HALF_OPEN
+                circuit.probes = 1
+                return HALF_OPEN
+
+            if circuit.probes >= self.probes:
+                raise exceptions.CircuitOpen(action=action, group=group, retry_after=0.0)
+
+            circuit.probes += 1
+            return None
+
+    def cancel(self, action: str) -> None:
+        """
+        Forget a request allowed by :meth:`allow` that never reached the
+        server, freeing its probe if the circuit is half-open.
+        """
+
+        with self._lock:
+            circuit = self._circuits.setdefault(self.group(action), _Circuit())
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(circuit.probes - 1, 0)
+
+    def record(self, action: str, failed: bool, elapsed: Optional[float] = None) -> Optional[str]:
+        """
+        Record the outcome of a request allowed by :meth:`allow`.
+
+        :param str action: Action the request was for
+        :param bool failed: Whether the request failed
+        :param float elapsed: Seconds the request took
+        :return: The circuit's new state if this call changed it
+        """
+
+        if self.slow_call is not None and elapsed is not None and elapsed > self.slow_call:
+            failed = True
+
+        with self._lock:
+            circuit = self._circuits.setdefault(self.group(action), _Circuit())
+
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(circuit.probes - 1, 0)
+
+            if not failed:
+                circuit.failures = 0
+                if circuit.state != HALF_OPEN:
+                    return None
+                circuit.state = CLOSED
+                return CLOSED
+
+            circuit.failures += 1
+
+            if circuit.state == HALF_OPEN or (
+                    circuit.state == CLOSED and circuit.failures >= self.failure_threshold):
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+                return OPEN
+
+            return None
+
+    def reset(self) -> None:
+        """
+        Close all circuits.
+        """
+
+        with self._lock:
+            self._circuits.clear()
@@ -0,0 +1,155 @@
+from typing import Any, Callable, Dict, Hashable, Optional
+import collections
+import concurrent.futures
+import copy
+import threading
+import time
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Convert a (possibly nested) params structure into a hashable key.
+
+    Dicts become frozensets of their items, so their keys need not be
+    comparable with each other (e.g. custom field IDs given as both ints
+    and strings).
+    """
+
+    if isinstance(value, dict):
+        return frozenset((key, freeze(item)) for (key, item) in value.items())
+
+    if isinstance(value, (list, tuple, set)):
+        return tuple(freeze(item) for item in value)
+
+    return value
+
+
+class TTLCache:
+    """
+    Thread-safe mapping whose entries expire ``ttl`` seconds after being set.
+
+    A ``ttl`` of ``None`` or ``0`` disables the cache: :meth:`set` becomes a
+    no-op and :meth:`get` always misses. Expired entries are dropped as new
+    ones are set, and beyond ``maxsize`` entries the oldest are dropped.
+    Pass ``maxsize=None`` for no limit.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, maxsize: Optional[int] = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+        self._lock = threading.Lock()
+        self._entries: 'collections.OrderedDict[Hashable, Any]' = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                (expires, value) = self._entries[key]
+            except KeyError:
+                return default
+
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.ttl:
+            return
+
+        now = time.monotonic()
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            # Entries are kept in the order they expire in
+            while self._entries:
+                (expires, _) = next(iter(self._entries.values()))
+                if expires > now:
+                    break
+                self._entries.popitem(last=False)
+
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _copy_exception(exc: BaseException) -> BaseException:
+    try:
+        clone = copy.copy(exc)
+    except Exception:  # pylint: disable=broad-except
+        # Exceptions that cannot be rebuilt from their args are shared
+        return exc
+
+    clone.__cause__ = exc.__cause__
+    clone.__context__ = exc.__context__
+    clone.__suppress_context__ = exc.__suppress_context__
+
+    return clone.with_traceback(exc.__traceback__)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls sharing a key into a single call.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for and share its result. If it raises, each caller of
+    :meth:`do` raises its own copy of the exception, so tracebacks added
+    while it propagates are not shared between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, concurrent.futures.Future] = {}
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        future = self.future(key, func, *args, **kwargs)
+
+        exc = future.exception()
+        if exc is None:
+            return future.result()
+
+        raise _copy_exception(exc)
+
+    def future(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Like :meth:`do`, but return the shared :class:`~concurrent.futures.Future`.
+
+        The leading caller runs ``func`` before this returns; other callers
+        get the in-flight future, which can also be awaited from asyncio
+        via :func:`asyncio.wrap_future`. Unlike :meth:`do`, every caller then
+        raises the same exception object.
+        """
+
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future
+
+            future = concurrent.futures.Future()
+            self._calls[key] = future
+
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as exc:  # pylint: disable=broad-except
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return future
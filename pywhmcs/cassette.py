@@ -0,0 +1,215 @@
+from typing import Any, Deque, Dict, Hashable, IO, List, Optional, Tuple
+import collections
+import gzip
+import json
+import threading
+import time
+
+from pywhmcs import cache
+from pywhmcs import exceptions
+from pywhmcs import transports
+
+#: Form fields and response keys whose values are never written to a
+#: cassette; they are replayed as ``***``
+REDACTED = frozenset({
+    'accesskey',
+    'bank_account',
+    'bankacct',
+    'bankcode',
+    'card_number',
+    'cardnum',
+    'cclastfour',
+    'cvv',
+    'expdate',
+    'password',
+    'password2',
+    'securityqans',
+    'username',
+})
+
+#: Form fields every request carries; they are not part of the request key
+ENVELOPE = frozenset({'action', 'responsetype', 'username', 'password', 'accesskey'})
+
+
+def redact(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return request form data without envelope fields and with secrets masked.
+    """
+
+    return {
+        key: '***' if key in REDACTED else value
+        for (key, value) in data.items()
+        if key not in ENVELOPE
+    }
+
+
+def redact_body(content: bytes) -> str:
+    """
+    Return a response body with the values of :data:`REDACTED` keys masked
+    at any depth. Bodies that are not JSON are returned unchanged, with
+    bytes that are not UTF-8 (say, a proxy's Latin-1 error page) replaced.
+    """
+
+    text = content.decode('utf-8', errors='replace')
+
+    try:
+        document = json.loads(text)
+    except ValueError:
+        return text
+
+    return json.dumps(_mask(document), separators=(',', ':'))
+
+
+def _mask(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: '***' if key in REDACTED else _mask(item)
+            for (key, item) in value.items()
+        }
+
+    if isinstance(value, list):
+        return [_mask(item) for item in value]
+
+    return value
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+
+    return open(path, mode, encoding='utf-8')
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value.decode('ascii')
+
+    return value
+
+
+class RecordingTransport(transports.Transport):
+    """
+    Transport that records every request and response to a cassette while
+    passing requests through to another transport.
+
+    The cassette is a JSON Lines file (gzip-compressed if ``path`` ends in
+    ``.gz``) with one entry per request: action, redacted params, status,
+    redacted response body and elapsed seconds. Closing it closes the
+    wrapped transport if it owns it.
+
+    :param transport: Transport to send requests through
+    :param str path: Cassette file to append to
+    :param bool owns_transport: Whether closing the recorder also closes
+        ``transport``
+    """
+
+    def __init__(self, transport: transports.Transport, path: str, owns_transport: bool = True):
+        self.transport = transport
+        self.path = path
+        self.owns_transport = owns_transport
+
+        self._lock = threading.Lock()
+        self._fp = _open(path, 'a')
+
+    def post(self, url: str, data: Dict[str, Any]) -> transports.Response:
+        start = time.perf_counter()
+        response = self.transport.post(url, data)
+        elapsed = time.perf_counter() - start
+
+        entry = {
+            'action': data['action'],
+            'params': {key: _jsonable(value) for (key, value) in redact(data).items()},
+            'status': response.status_code,
+            'body': redact_body(response.content),
+            'elapsed': round(elapsed, 6),
+        }
+
+        with self._lock:
+            self._fp.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            self._fp.flush()
+
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            self._fp.close()
+
+        if self.owns_transport:
+            self.transport.close()
+
+
+class ReplayTransport(transports.Transport):
+    """
+    Transport serving responses from a cassette written by
+    :class:`RecordingTransport`.
+
+    Requests are matched on action and redacted params, in recorded order;
+    when no entry matches exactly, the next unused entry for the same action
+    is served.
+
+    :param str path: Cassette file to replay
+    :param float latency_scale: Multiplier applied to recorded latency.
+        ``1.0`` replays original timing, ``0`` disables sleeping.
+    :raises: :class:`pywhmcs.exceptions.ReplayMismatch` when a request has no
+        recorded response
+    """
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        self.path = path
+        self.latency_scale = latency_scale
+
+        self._lock = threading.Lock()
+        self._by_request: Dict[Tuple[str, Hashable], Deque[Dict[str, Any]]] = collections.defaultdict(collections.deque)
+        self._by_action: Dict[str, Deque[Dict[str, Any]]] = collections.defaultdict(collections.deque)
+
+        with _open(path, 'r') as fp:
+            for line in fp:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                entry['used'] = False
+                self._by_request[self._key(entry['action'], entry['params'])].append(entry)
+                self._by_action[entry['action']].append(entry)
+
+    @staticmethod
+    def _key(action: str, params: Dict[str, Any]) -> Tuple[str, Hashable]:
+        return (action, cache.freeze({key: str(_jsonable(value)) for (key, value) in params.items()}))
+
+    def _next(self, queue: Deque[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        while queue:
+            entry = queue.popleft()
+            if not entry['used']:
+                entry['used'] = True
+                return entry
+
+        return None
+
+    def post(self, url: str, data: Dict[str, Any]) -> transports.Response:
+        action = data['action']
+
+        with self._lock:
+            entry = (self._next(self._by_request[self._key(action, redact(data))])
+                     or self._next(self._by_action[action]))
+
+        if entry is None:
+            raise exceptions.ReplayMismatch(action=action)
+
+        if self.latency_scale:
+            time.sleep(entry['elapsed'] * self.latency_scale)
+
+        return transports.Response(
+            entry['status'],
+            entry['body'].encode('utf-8'),
+            {'Content-Type': 'application/json'}
+        )
+
+    @property
+    def remaining(self) -> List[Dict[str, Any]]:
+        """
+        Recorded entries that have not been served yet.
+        """
+
+        return [
+            entry for queue in self._by_action.values()
+            for entry in queue if not entry['used']
+        ]
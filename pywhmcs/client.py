@@ -1,47 +1,313 @@
-from typing import Any, Dict
-import base64
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Optional
+import concurrent.futures
+import contextlib
+import contextvars
 import hashlib
+import importlib
+import io
+import json
+import logging
+import threading
+import time
 
-import requests
-import phpserialize
-
-from pywhmcs import clients
+from pywhmcs import cache
+from pywhmcs import customfields
 from pywhmcs import exceptions
-from pywhmcs import general
-from pywhmcs import invoices
-from pywhmcs import orders
-from pywhmcs import products
-from pywhmcs import promotions
-from pywhmcs import tickets
+from pywhmcs import instrumentation
+from pywhmcs import scheduler as request_scheduler
+from pywhmcs import streaming
+from pywhmcs import transports
+
+LOGGER = logging.getLogger(__name__)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pywhmcs import breaker as circuit_breaker
+    from pywhmcs import clients
+    from pywhmcs import general
+    from pywhmcs import hedging
+    from pywhmcs import invoices
+    from pywhmcs import limiter as concurrency_limiter
+    from pywhmcs import orders
+    from pywhmcs import parsing
+    from pywhmcs import products
+    from pywhmcs import promotions
+    from pywhmcs import tickets
+
+
+class _Bridge:
+    """
+    Client attribute that imports and instantiates a bridge on first access.
+
+    Once created, the bridge is stored on the client instance and found there
+    without calling the descriptor again. Creation is serialized per client.
+    """
+
+    def __init__(self, module: str, cls: str):
+        self.module = module
+        self.cls = cls
+        self.name: Optional[str] = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        with instance._bridge_lock:  # pylint: disable=protected-access
+            bridge = instance.__dict__.get(self.name)
+            if bridge is None:
+                module = importlib.import_module(f'pywhmcs.{self.module}')
+                options = instance._bridge_options.get(self.name, {})  # pylint: disable=protected-access
+                bridge = getattr(module, self.cls)(instance, **options)
+                instance.__dict__[self.name] = bridge
+
+        return bridge
 
 
 class Client:
     # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, api_url: str, username: str, password: str):
+    clients: 'clients.ClientBridge' = _Bridge('clients', 'ClientBridge')
+    general: 'general.GeneralBridge' = _Bridge('general', 'GeneralBridge')
+    invoices: 'invoices.InvoiceBridge' = _Bridge('invoices', 'InvoiceBridge')
+    orders: 'orders.OrdersBridge' = _Bridge('orders', 'OrdersBridge')
+    products: 'products.ProductsBridge' = _Bridge('products', 'ProductsBridge')
+    promotions: 'promotions.PromotionsBridge' = _Bridge('promotions', 'PromotionsBridge')
+    tickets: 'tickets.TicketBridge' = _Bridge('tickets', 'TicketBridge')
+
+    def __init__(self,
+                 api_url: str,
+                 username: str,
+                 password: str,
+                 client_cache_ttl: Optional[float] = None,
+                 coalesce_reads: bool = False,
+                 transport: Optional[transports.Transport] = None,
+                 owns_transport: bool = True,
+                 hooks: Optional[Iterable[instrumentation.Hook]] = None,
+                 parser: Optional['parsing.ProcessParser'] = None,
+                 breaker: Optional['circuit_breaker.CircuitBreaker'] = None,
+                 limiter: Optional['concurrency_limiter.AdaptiveLimiter'] = None,
+                 scheduler: Optional[request_scheduler.PriorityScheduler] = None,
+                 hedge: Optional['hedging.HedgePolicy'] = None):
         self.api_url = api_url
         self.username = username
         self.password = password
+        self.coalesce_reads = coalesce_reads
+        self.hooks = list(hooks or [])
+        self.parser = parser
+        self.breaker = breaker
+        self.limiter = limiter
+        self.scheduler = scheduler
+        self.hedge = hedge
 
-        # Setup bridges
-        self.clients = clients.ClientBridge(self)
-        self.general = general.GeneralBridge(self)
-        self.invoices = invoices.InvoiceBridge(self)
-        self.orders = orders.OrdersBridge(self)
-        self.products = products.ProductsBridge(self)
-        self.promotions = promotions.PromotionsBridge(self)
-        self.tickets = tickets.TicketBridge(self)
+        self._transport = transport
+        self._owns_transport = owns_transport
+
+        self._flight = cache.SingleFlight()
+        self._hedge_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+
+        # Bridges are created on first access, see :class:`_Bridge`
+        self._bridge_lock = threading.RLock()
+        self._bridge_options = {
+            'clients': {'cache_ttl': client_cache_ttl},
+        }
+
+    @property
+    def transport(self) -> transports.Transport:
+        """
+        Transport requests are sent through. Defaults to a
+        :class:`~pywhmcs.transports.RequestsTransport`, created on first use.
+
+        :meth:`record` and :meth:`replay` close the transport they replace
+        unless the client was created with ``owns_transport=False`` (as
+        :class:`~pywhmcs.pool.ClientPool` tenants sharing one transport are).
+        A transport assigned to this property is owned by the client.
+        """
+
+        if self._transport is None:
+            self._transport = transports.RequestsTransport()
+
+        return self._transport
+
+    @transport.setter
+    def transport(self, value: transports.Transport) -> None:
+        self._transport = value
+        self._owns_transport = True
+
+    @contextlib.contextmanager
+    def priority(self, name: str) -> Iterator[None]:
+        """
+        Send requests made in this block (and in worker threads started by
+        bulk operations in it) with priority class ``name``, see
+        :class:`~pywhmcs.scheduler.PriorityScheduler`::
+
+            with whmcs.priority('batch'):
+                for invoice in whmcs.invoices.iter(status='Unpaid'):
+                    ...
+        """
+
+        token = request_scheduler.current_priority.set(name)
+        try:
+            yield
+        finally:
+            request_scheduler.current_priority.reset(token)
+
+    def add_hook(self, hook: instrumentation.Hook) -> None:
+        """
+        Register an instrumentation hook.
+
+        Hooks are called as ``hook(event, data)``. After every request a
+        ``request`` event is emitted with ``action``, ``status``,
+        ``elapsed``, ``bytes_sent``, ``bytes_received`` (on the wire) and
+        ``bytes_decoded``.
+
+        :param hook: Callable to register
+        """
+
+        self.hooks.append(hook)
+
+    def emit(self, event: str, **data) -> None:
+        """
+        Call every registered hook with ``event``. Hook errors are logged and
+        never propagate to the caller.
+        """
+
+        for hook in self.hooks:
+            try:
+                hook(event, data)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('Instrumentation hook %r failed', hook)
+
+    def record(self, path: str) -> None:
+        """
+        Record all traffic to a cassette at ``path`` while still sending
+        requests through the current transport.
+
+        See :class:`pywhmcs.cassette.RecordingTransport`.
+        """
+
+        from pywhmcs import cassette  # pylint: disable=import-outside-toplevel
+
+        self.transport = cassette.RecordingTransport(
+            self.transport,
+            path,
+            owns_transport=self._owns_transport
+        )
+
+    def replay(self, path: str, latency_scale: float = 1.0) -> None:
+        """
+        Serve all requests from a cassette at ``path`` instead of WHMCS. The
+        current transport is closed if the client owns it.
+
+        See :class:`pywhmcs.cassette.ReplayTransport`.
+        """
+
+        from pywhmcs import cassette  # pylint: disable=import-outside-toplevel
+
+        previous = self._transport
+        owned = self._owns_transport
+        self.transport = cassette.ReplayTransport(path, latency_scale=latency_scale)
+
+        if previous is not None and owned:
+            previous.close()
 
     def send_request(self, action: str, params=None) -> Dict[Any, Any]:
         """
         Send request to WHMCS API.
 
+        If ``coalesce_reads`` is enabled, identical read requests (``get*``
+        actions with the same params) made while one is already in flight
+        wait for and share its response, or its exception. Shared responses
+        must not be mutated.
+
+        If a :class:`~pywhmcs.hedging.HedgePolicy` is set as ``hedge``, a
+        slow read is sent a second time and the first response is returned.
+
         :param str action: Action to perform
         :param params: API parameters
         :return: Response JSON body
         :rtype: dict
         """
 
+        send = self._send_request
+        if self.hedge is not None and self.hedge.applies(action):
+            send = self._send_hedged
+
+        if self.coalesce_reads and action.startswith('get'):
+            key = (action, cache.freeze(params or {}))
+            return self._flight.do(key, send, action, params)
+
+        return send(action, params)
+
+    def _send_hedged(self, action: str, params=None) -> Dict[Any, Any]:
+        hedge = self.hedge
+        delay = hedge.delay(action)
+
+        def attempt(sent):
+            sent_at = []
+
+            def send(url, data):
+                sent_at.append(time.perf_counter())
+                sent.set()
+                return self.transport.post(url, data)
+
+            try:
+                response = self._send_request(action, params, send)
+            finally:
+                sent.set()
+            # Latency from when the request went out, not from when it queued
+            hedge.observe(action, time.perf_counter() - sent_at[0])
+            return response
+
+        if delay is None:
+            return attempt(threading.Event())
+
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                # A primary and a hedge for every request that may run at once
+                if self.limiter is not None:
+                    concurrency = self.limiter.max_limit
+                elif self.scheduler is not None:
+                    concurrency = self.scheduler.max_concurrency
+                else:
+                    concurrency = hedge.max_concurrency
+                self._hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=2 * concurrency,
+                    thread_name_prefix='whmcs-hedge'
+                )
+        executor = self._hedge_executor
+
+        sent = threading.Event()
+        primary = executor.submit(contextvars.copy_context().run, attempt, sent)
+        # Time spent waiting for a thread or a request slot is not latency
+        sent.wait()
+        try:
+            return primary.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+
+        if not hedge.spend():
+            return primary.result()
+
+        secondary = executor.submit(contextvars.copy_context().run, attempt, threading.Event())
+        if self.hooks:
+            self.emit('hedge', action=action, delay=delay)
+
+        # First response wins; a failure only wins if the other attempt fails too
+        (done, pending) = concurrent.futures.wait({primary, secondary}, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+
+        for future in pending:
+            if future.exception() is None:
+                return future.result()
+
+        return primary.result()
+
+    def _payload(self, action: str, params=None) -> Dict[str, Any]:
         payload = {
             'username': self.username,
             'password': hashlib.md5(self.password.encode()).hexdigest(),
@@ -49,20 +315,171 @@ class Client:
             'action': action,
         }
 
-        if 'customfields' in params:
-            payload['customfields'] = base64.b64encode(phpserialize.dumps(params.pop('customfields')))
+        payload.update(params or {})
 
-        payload.update(params)
+        if payload.get('customfields') is not None:
+            payload['customfields'] = customfields.encode(payload['customfields'])
 
-        response = requests.post(self.api_url, data=payload)
+        return payload
 
-        if response.status_code != 200:
-            raise exceptions.from_response(response, action)
+    def _send_request(self, action: str, params=None, send=None) -> Dict[Any, Any]:
+        response = self._fetch(action, params, send or self.transport.post)
 
         content = response.json()
+        self.raise_for_error(content, action, response)
+
+        return content
 
-        if (content.get('result') == 'error'
-                or content.get('status') == 'error'):
+    def fetch_raw(self, action: str, params=None) -> transports.Response:
+        """
+        Send request to WHMCS API and return the unparsed response.
+
+        Only the HTTP status is checked; pass the parsed body to
+        :meth:`raise_for_error` to check for WHMCS errors.
+
+        :param str action: Action to perform
+        :param params: API parameters
+        :return: Response
+        :rtype: :class:`pywhmcs.transports.Response`
+        """
+
+        return self._fetch(action, params, self.transport.post)
+
+    def _fetch(self,
+               action: str,
+               params,
+               send: Callable[[str, Dict[str, Any]], transports.Response]) -> transports.Response:
+        payload = self._payload(action, params)
+
+        self._acquire(action, params)
+
+        start = time.perf_counter()
+        try:
+            response = send(self.api_url, payload)
+        except exceptions.ReplayMismatch:
+            # Not sent anywhere, so not an outcome to learn from
+            self._release(action, None, None)
+            raise
+        except Exception:
+            self._release(action, True, time.perf_counter() - start)
+            raise
+
+        elapsed = time.perf_counter() - start
+        self._release(action, response.status_code >= 500, elapsed)
+
+        if self.hooks:
+            self.emit(
+                'request',
+                action=action,
+                status=response.status_code,
+                elapsed=elapsed,
+                bytes_sent=response.request_size,
+                bytes_received=response.wire_size,
+                bytes_decoded=len(response.content)
+            )
+
+        if response.status_code != 200:
             raise exceptions.from_response(response, action)
 
-        return content
+        return response
+
+    def _acquire(self, action: str, params=None) -> None:
+        if self.breaker is not None:
+            state = self.breaker.allow(action)
+            if state is not None:
+                self.emit('circuit', action=action, group=self.breaker.group(action), state=state)
+
+        if self.scheduler is not None:
+            priority = self.scheduler.priority(action, params)
+            start = time.perf_counter()
+            self.scheduler.acquire(priority)
+            if self.hooks:
+                self.emit('schedule', action=action, priority=priority, waited=time.perf_counter() - start)
+
+        if self.limiter is not None:
+            self.limiter.acquire()
+
+    def _release(self, action: str, failed: Optional[bool], elapsed: Optional[float]) -> None:
+        """
+        Free the slots taken by :meth:`_acquire`. A ``failed`` of ``None``
+        means the request had no outcome, so nothing is recorded.
+        """
+
+        if self.scheduler is not None:
+            self.scheduler.release()
+
+        if failed is None:
+            if self.limiter is not None:
+                self.limiter.release(None)
+            if self.breaker is not None:
+                self.breaker.cancel(action)
+            return
+
+        if self.limiter is not None:
+            limit = self.limiter.release(elapsed, failed, action)
+            if limit is not None:
+                self.emit('concurrency', action=action, limit=limit)
+
+        if self.breaker is not None:
+            state = self.breaker.record(action, failed, elapsed)
+            if state is not None:
+                self.emit('circuit', action=action, group=self.breaker.group(action), state=state)
+
+    @staticmethod
+    def raise_for_error(content: Dict[str, Any],
+                        action: str,
+                        response: Optional[transports.Response] = None) -> None:
+        """
+        Raise the matching :class:`~pywhmcs.exceptions.WHMCSException` if a
+        parsed response body reports an error.
+
+        :param dict content: Parsed response body (or its top-level values)
+        :param str action: Action the response is for
+        :param response: Response the body was parsed from
+        """
+
+        if content.get('result') == 'error' or content.get('status') == 'error':
+            raise exceptions.from_response(
+                response or transports.Response(200, json.dumps(content).encode('utf-8')),
+                action
+            )
+
+    def stream_request(self,
+                       action: str,
+                       params=None,
+                       path: str = '',
+                       meta: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """
+        Send request to WHMCS API and yield the records of a list response
+        as they are parsed.
+
+        Records are parsed incrementally from the response body when
+        ``ijson`` is installed; see :mod:`pywhmcs.streaming`. Errors reported
+        in the response body are raised once the body has been parsed.
+
+        The body is received in full before the first record is yielded, so
+        the request's slots are freed, and its latency measured, without
+        waiting for the caller to consume the records.
+
+        :param str action: Action to perform
+        :param params: API parameters
+        :param str path: Dotted path of the record list, e.g.
+            ``invoices.invoice``
+        :param dict meta: If given, filled with the response's top-level
+            values such as ``totalresults`` and ``numreturned``
+        :return: Records of the response
+        :rtype: Iterator[dict]
+        """
+
+        if meta is None:
+            meta = {}
+
+        response = self._fetch(
+            action,
+            params,
+            lambda url, data: self.transport.stream(url, data=data).read()
+        )
+
+        yield from streaming.iter_items(io.BytesIO(response.content), path, meta)
+
+        self.raise_for_error(meta, action)
@@ -1,8 +1,17 @@
 from __future__ import annotations
-from typing import Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Mapping, Optional, Tuple, Union
 import dataclasses
+import datetime
+import logging
+import threading
+import weakref
 
 from pywhmcs import base
+from pywhmcs import cache
+from pywhmcs import customfields
+from pywhmcs import schema
+
+LOGGER = logging.getLogger(__name__)
 
 
 @dataclasses.dataclass
@@ -59,11 +68,199 @@ class ClientResource(base.BaseResource):
     separate_invoices: bool
     status: str
     twofa_enabled: bool
-    custom_fields: List[Dict[str, str]]
+    custom_fields: customfields.CustomFields
+
+
+@dataclasses.dataclass
+class ClientSummary(base.BaseResource):
+    id: int
+    company_name: Optional[str]
+    date_created: Optional[datetime.date]
+    email: str
+    first_name: str
+    group_id: int
+    last_name: str
+    status: str
+
+    def hydrate(self) -> ClientResource:
+        return self.bridge.get(self.id)
+
+
+@dataclasses.dataclass
+class Service(base.BaseResource):
+    id: int
+    billing_cycle: str
+    client_id: int
+    date_next_due: Optional[datetime.date]
+    date_registered: Optional[datetime.date]
+    dedicated_ip: Optional[str]
+    domain: Optional[str]
+    first_payment_amount: float
+    group_name: str
+    name: str
+    order_id: int
+    payment_method: str
+    product_id: int
+    recurring_amount: float
+    server_hostname: Optional[str]
+    server_id: Optional[int]
+    status: str
+    suspension_reason: Optional[str]
+    username: Optional[str]
+
+
+#: Converts a ``GetClientsDetails`` response into :class:`ClientResource`
+#: field values. Module-level (and so picklable) so that responses can be
+#: parsed in worker processes, see :mod:`pywhmcs.parsing`.
+parse_client = schema.compile_parser('parse_client', {
+    'id': schema.Field('id', int),
+    'user_id': 'userid',
+    'uuid': 'uuid',
+    'email': 'email',
+    'first_name': 'firstname',
+    'last_name': 'lastname',
+    'full_name': 'fullname',
+    'company_name': 'companyname',
+    'address1': 'address1',
+    'address2': 'address2',
+    'city': 'city',
+    'state': schema.Field('state', schema.symbol),
+    'state_code': schema.Field('statecode', schema.symbol),
+    'full_state': 'fullstate',
+    'post_code': 'postcode',
+    'country': schema.Field('country', schema.symbol),
+    'country_code': schema.Field('countrycode', schema.symbol),
+    'country_name': schema.Field('countryname', schema.symbol),
+    'billing_cid': 'billingcid',
+    'currency': 'currency',
+    'currency_code': schema.Field('currency_code', schema.symbol),
+    'credit': 'credit',
+    'cc_last_four': 'cclastfour',
+    'cc_type': schema.Field('cctype', schema.symbol),
+    'disable_auto_cc': 'disableautocc',
+    'phone_cc': 'phonecc',
+    'tax_exempt': 'taxexempt',
+    'phone_number': 'phonenumber',
+    'phone_number_formatted': 'phonenumberformatted',
+    'email_opt_out': 'emailoptout',
+    'allow_single_sign_on': 'allowSingleSignOn',
+    'default_gateway': schema.Field('defaultgateway', schema.symbol),
+    'group_id': 'groupid',
+    'language': schema.Field('language', schema.symbol),
+    'last_login': 'lastlogin',
+    'late_fee_overide': 'latefeeoveride',
+    'notes': 'notes',
+    'override_due_notices': 'overideduenotices',
+    'override_auto_close': 'overrideautoclose',
+    'password': 'password',
+    'security_q_id': 'securityqid',
+    'security_q_ans': 'securityqans',
+    'separate_invoices': 'separateinvoices',
+    'status': schema.Field('status', schema.lower),
+    'twofa_enabled': 'twofaenabled',
+    'custom_fields': schema.Field('customfields', customfields.CustomFields),
+}, __name__)
+
+#: Fields accepted by :meth:`ClientBridge.update`, and the ``UpdateClient``
+#: parameters they are sent as
+UPDATE_PARAMS = {
+    'address1': 'address1',
+    'address2': 'address2',
+    'card_exp_date': 'expdate',
+    'card_num': 'cardnum',
+    'card_type': 'cardtype',
+    'city': 'city',
+    'company_name': 'companyname',
+    'country': 'country',
+    'credit': 'credit',
+    'custom_fields': 'customfields',
+    'email': 'email',
+    'first_name': 'firstname',
+    'last_name': 'lastname',
+    'notes': 'notes',
+    'password': 'password2',
+    'phone_number': 'phonenumber',
+    'post_code': 'postcode',
+    'state': 'state',
+    'status': 'status',
+}
+
+
+def check_update(fields: Mapping[str, Any]) -> None:
+    """
+    Raise ``TypeError`` if ``fields`` has a field not accepted by
+    :meth:`ClientBridge.update`.
+    """
+
+    unknown = sorted(set(fields) - UPDATE_PARAMS.keys())
+    if unknown:
+        raise TypeError(f'Unknown client fields: {", ".join(unknown)}')
+
+
+#: Converts a ``GetClients`` record into :class:`ClientSummary` field values
+parse_client_summary = schema.compile_parser('parse_client_summary', {
+    'id': schema.Field('id', int),
+    'company_name': schema.Field('companyname', default=None, empty_none=True),
+    'date_created': schema.Field('datecreated', schema.date, default=None),
+    'email': 'email',
+    'first_name': 'firstname',
+    'group_id': schema.Field('groupid', schema.integer, default=0),
+    'last_name': 'lastname',
+    'status': schema.Field('status', schema.lower),
+}, __name__)
+
+#: Converts a ``GetClientsProducts`` record into :class:`Service` field
+#: values. Custom fields, configurable options and usage figures are not kept.
+parse_service = schema.compile_parser('parse_service', {
+    'id': schema.Field('id', int),
+    'billing_cycle': schema.Field('billingcycle', schema.symbol),
+    'client_id': schema.Field('clientid', int),
+    'date_next_due': schema.Field('nextduedate', schema.date, default=None),
+    'date_registered': schema.Field('regdate', schema.date, default=None),
+    'dedicated_ip': schema.Field('dedicatedip', default=None, empty_none=True),
+    'domain': schema.Field('domain', default=None, empty_none=True),
+    'first_payment_amount': schema.Field('firstpaymentamount', schema.number, default=0.0),
+    'group_name': schema.Field('groupname', schema.symbol, default=''),
+    'name': 'name',
+    'order_id': schema.Field('orderid', int),
+    'payment_method': schema.Field('paymentmethod', schema.symbol, default=''),
+    'product_id': schema.Field('pid', int),
+    'recurring_amount': schema.Field('recurringamount', schema.number, default=0.0),
+    'server_hostname': schema.Field('serverhostname', default=None, empty_none=True),
+    'server_id': schema.Field('serverid', schema.integer, default=0, empty_none=True),
+    'status': schema.Field('status', schema.lower),
+    'suspension_reason': schema.Field('suspensionreason', default=None, empty_none=True),
+    'username': schema.Field('username', default=None, empty_none=True),
+}, __name__)
 
 
 class ClientBridge(base.BaseBridge):
 
+    def __init__(self, client, cache_ttl: Optional[float] = None, cache_size: int = 1000):
+        super().__init__(client)
+
+        # Clients are cached under both their ID and their email
+        self._cache = cache.TTLCache(cache_ttl, maxsize=2 * cache_size)
+        self._flight = cache.SingleFlight()
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+
+    @property
+    def cache_ttl(self) -> Optional[float]:
+        """
+        Seconds a client fetched by :meth:`get` is cached for, keyed by both
+        ID and email. ``None`` disables caching. At most ``cache_size``
+        clients are cached, the least recently fetched being dropped first.
+        Cached clients are shared between callers, see :meth:`get`.
+        """
+
+        return self._cache.ttl
+
+    @cache_ttl.setter
+    def cache_ttl(self, value: Optional[float]) -> None:
+        self._cache.ttl = value
+        self._cache.clear()
+
     def create(self,
                email: str,
                password: str,
@@ -89,7 +286,7 @@ class ClientBridge(base.BaseBridge):
                card_exp_date: Optional[str] = None,
                start_date: Optional[str] = None,
                issue_number: Optional[str] = None,
-               custom_fields: Optional[str] = None,
+               custom_fields: Optional[Union[Mapping[Any, Any], str]] = None,
                no_email: Optional[str] = 'true',
                skip_validation: Optional[str] = 'false') -> ClientResource:
         """
@@ -103,9 +300,9 @@ class ClientBridge(base.BaseBridge):
             ``language`` param must be full language name: "english", "french",
             etc.
         .. note::
-            ``custom_fields`` param must be a Base64 encoded, serialized
-            PHP-type array string format (save yourself a headache and just use
-            the ``phpserialize`` Python library
+            ``custom_fields`` param is a mapping of custom field ID to value,
+            or an already encoded string (see
+            :func:`pywhmcs.customfields.encode`)
         """
 
         params = {
@@ -146,79 +343,159 @@ class ClientBridge(base.BaseBridge):
 
         return self.get(email)
 
-    def get(self, resource: Union[str, int]) -> ClientResource:
+    def get(self, resource: Union[str, int], refresh: bool = False) -> ClientResource:
         """
         Get a :class:`ClientResource` from WHMCS.
 
+        If caching is enabled (see :attr:`cache_ttl`), cached clients are
+        returned without a request, and concurrent lookups of the same client
+        share a single request. Every caller then gets the same
+        :class:`ClientResource`, so treat it as read-only and change clients
+        with :meth:`update`, which drops them from the cache.
+
         :param resource: ID or email of client to get
         :param: str or int
+        :param bool refresh: Pass ``True`` to bypass the cache
         :return: Client
         :rtype: :class:`ClientResource`
         :raises: :class:`pywhmcs.exceptions.ClientNotFound`
         :raises: :class:`pywhmcs.exceptions.UnknownError
         """
 
-        try:
-            response = self.client.send_request(
-                action='getclientsdetails',
-                params={'clientid': int(resource)}
-            )
-        except ValueError:
-            response = self.client.send_request(
-                action='getclientsdetails',
-                params={'email': resource}
-            )
+        key = self._cache_key(resource)
+
+        if not refresh:
+            client = self._cache.get(key)
+            if client is not None:
+                return client
 
-        client = ClientResource(
-            self,
-            id=int(response['id']),
-            user_id=response['userid'],
-            uuid=response['uuid'],
-            email=response['email'],
-            first_name=response['firstname'],
-            last_name=response['lastname'],
-            full_name=response['fullname'],
-            company_name=response['companyname'],
-            address1=response['address1'],
-            address2=response['address2'],
-            city=response['city'],
-            state=response['state'],
-            state_code=response['statecode'],
-            full_state=response['fullstate'],
-            post_code=response['postcode'],
-            country=response['country'],
-            country_code=response['countrycode'],
-            country_name=response['countryname'],
-            billing_cid=response['billingcid'],
-            currency=response['currency'],
-            currency_code=response['currency_code'],
-            credit=response['credit'],
-            cc_last_four=response['cclastfour'],
-            cc_type=response['cctype'],
-            disable_auto_cc=response['disableautocc'],
-            phone_cc=response['phonecc'],
-            tax_exempt=response['taxexempt'],
-            phone_number=response['phonenumber'],
-            phone_number_formatted=response['phonenumberformatted'],
-            email_opt_out=response['emailoptout'],
-            allow_single_sign_on=response['allowSingleSignOn'],
-            default_gateway=response['defaultgateway'],
-            group_id=response['groupid'],
-            language=response['language'],
-            last_login=response['lastlogin'],
-            late_fee_overide=response['latefeeoveride'],
-            notes=response['notes'],
-            override_due_notices=response['overideduenotices'],
-            override_auto_close=response['overrideautoclose'],
-            password=response['password'],
-            security_q_id=response['securityqid'],
-            security_q_ans=response['securityqans'],
-            separate_invoices=response['separateinvoices'],
-            status=response['status'].lower(),
-            twofa_enabled=response['twofaenabled'],
-            custom_fields=response['customfields']
+        # Lookups made after an update never share a fetch started before it
+        generation = self._generation
+
+        return self._flight.do((generation, key), self._fetch, key, generation)
+
+    def invalidate(self, resource: Union[ClientResource, str, int, None] = None) -> None:
+        """
+        Drop a client from the lookup cache.
+
+        :param resource: Client (or its ID or email) to drop. Pass ``None``
+            to clear the whole cache.
+        """
+
+        with self._generation_lock:
+            self._generation += 1
+
+        if resource is None:
+            self._cache.clear()
+            return
+
+        if isinstance(resource, ClientResource):
+            keys = [('id', resource.id), ('email', resource.email.lower())]
+        else:
+            keys = [self._cache_key(resource)]
+
+        for key in keys:
+            client = self._cache.pop(key)
+            if client is not None:
+                self._cache.pop(('id', client.id))
+                self._cache.pop(('email', client.email.lower()))
+
+    def list(self, detailed=False, marker=None, limit=None, **filters) -> List[Union[ClientResource, ClientSummary]]:
+        """
+        List and filter clients via WHMCS API method ``GetClients``.
+
+        :param bool detailed: Pass ``True`` to fetch every
+            :class:`ClientResource` instead of returning summaries
+        :param int marker: Offset index for client list
+        :param int limit: Number of clients to return in list
+        :param filters: Filters accepted by :meth:`iter`
+        :return: Clients matching given criteria
+        :rtype: List[:class:`ClientSummary`]
+        """
+
+        return list(self.iter(detailed=detailed, marker=marker, limit=limit, **filters))
+
+    def iter(self,
+             search: Optional[str] = None,
+             status: Optional[str] = None,
+             order_by: Optional[str] = None,
+             sorting: Optional[str] = None,
+             page_size: int = 100,
+             marker: Optional[int] = None,
+             limit: Optional[int] = None,
+             detailed: bool = False,
+             workers: Optional[int] = None) -> Iterator[Union[ClientResource, ClientSummary]]:
+        """
+        Iterate over clients, fetching ``page_size`` clients per request.
+
+        :param str search: Email, name or company name to search for
+        :param str status: Status to filter by, e.g. ``Active`` or ``Closed``
+        :param str order_by: Field to order by, e.g. ``id`` or ``email``
+        :param str sorting: ``ASC`` or ``DESC``
+        :param int page_size: Number of clients to request per page
+        :param int marker: Offset index of the first client
+        :param int limit: Maximum number of clients to return
+        :param bool detailed: Pass ``True`` to fetch the full
+            :class:`ClientResource` for every summary
+        :param int workers: Number of clients to fetch concurrently when
+            ``detailed``, see :meth:`~pywhmcs.base.BaseBridge._hydrate`
+        :return: Clients matching given criteria
+        :rtype: Iterator[:class:`ClientSummary`]
+        """
+
+        params = {
+            key: value for (key, value)
+            in {
+                'search': search,
+                'status': status,
+                'orderby': order_by,
+                'sorting': sorting
+            }.items() if value is not None
+        }
+
+        summaries = self._iter_resources(
+            'getclients',
+            params,
+            'clients',
+            'client',
+            parse_client_summary,
+            ClientSummary,
+            page_size=page_size,
+            marker=marker,
+            limit=limit
+        )
+
+        if not detailed:
+            yield from summaries
+            return
+
+        yield from self._hydrate(
+            lambda summary: summary.hydrate(),
+            summaries,
+            workers=workers
         )
 
+    @staticmethod
+    def _cache_key(resource: Union[str, int]) -> Tuple[str, Hashable]:
+        if isinstance(resource, int) or str(resource).isdigit():
+            return ('id', int(resource))
+
+        return ('email', str(resource).lower())
+
+    def _fetch(self, key: Tuple[str, Hashable], generation: int) -> ClientResource:
+        (kind, value) = key
+        response = self.client.send_request(
+            action='getclientsdetails',
+            params={'clientid': value} if kind == 'id' else {'email': value}
+        )
+
+        client = ClientResource(self, **parse_client(response))
+
+        with self._generation_lock:
+            if generation == self._generation:
+                self._cache.set(('id', client.id), client)
+                self._cache.set(('email', client.email.lower()), client)
+
         return client
 
     def get_products(self,
@@ -245,44 +522,98 @@ class ClientBridge(base.BaseBridge):
 
         return matches
 
+    def iter_services(self,
+                      resource: Union[ClientResource, int, None] = None,
+                      product_id: Optional[int] = None,
+                      service_id: Optional[int] = None,
+                      domain: Optional[str] = None,
+                      page_size: int = 100,
+                      marker: Optional[int] = None,
+                      limit: Optional[int] = None,
+                      prefetch: bool = True) -> Iterator[Service]:
+        """
+        Iterate over services (client products), fetching ``page_size``
+        services per request.
+
+        Unlike :meth:`get_products`, every page is requested, and services
+        are returned as typed :class:`Service` records.
+
+        :param resource: Client (or its ID) to list services of. Pass
+            ``None`` to list the services of all clients.
+        :param int product_id: Product ID to filter by
+        :param int service_id: Service ID to filter by
+        :param str domain: Domain to filter by
+        :param int page_size: Number of services to request per page
+        :param int marker: Offset index of the first service
+        :param int limit: Maximum number of services to return
+        :param bool prefetch: Fetch the next page on a background thread
+            while the current page is consumed
+        :return: Services matching given criteria
+        :rtype: Iterator[:class:`Service`]
+        """
+
+        params = {
+            key: value for (key, value)
+            in {
+                'clientid': base.getid(resource),
+                'pid': product_id,
+                'serviceid': service_id,
+                'domain': domain
+            }.items() if value is not None
+        }
+
+        services = self._iter_resources(
+            'getclientsproducts',
+            params,
+            'products',
+            'product',
+            parse_service,
+            Service,
+            page_size=page_size,
+            marker=marker,
+            limit=limit
+        )
+
+        if prefetch:
+            services = base.prefetch(services, buffer=page_size)
+
+        yield from services
+
     def update(self, resource: Union[ClientResource, int], **kwargs) -> None:
         """
         Update WHMCS client account.
 
         :param resource: Instance or ID of client to update
+        :param kwargs: Fields to update, see :data:`UPDATE_PARAMS`
+        :raises TypeError: For an unknown field
         """
 
-        params = {
-            k: v for (k, v)
-            in {
-                'clientid': str(base.getid(resource)),
-                'address1': kwargs.get('address1'),
-                'address2': kwargs.get('address2'),
-                'cardnum': kwargs.get('card_num'),
-                'cardtype': kwargs.get('card_type'),
-                'city': kwargs.get('city'),
-                'companyname': kwargs.get('company_name'),
-                'country': kwargs.get('country'),
-                'credit': kwargs.get('credit'),
-                'customfields': kwargs.get('custom_fields'),
-                'email': kwargs.get('email'),
-                'expdate': kwargs.get('card_exp_date'),
-                'firstname': kwargs.get('first_name'),
-                'lastname': kwargs.get('last_name'),
-                'notes': kwargs.get('notes'),
-                'password2': kwargs.get('password'),
-                'phonenumber': kwargs.get('phone_number'),
-                'postcode': kwargs.get('post_code'),
-                'state': kwargs.get('state'),
-                'status': kwargs.get('status')
-            }.items() if v is not None
-        }
+        check_update(kwargs)
 
-        self.client.send_request(
-            action='updateclient',
-            params=params
+        params = {'clientid': str(base.getid(resource))}
+        params.update(
+            (UPDATE_PARAMS[k], v) for (k, v) in kwargs.items()
+            if v is not None
         )
 
+        try:
+            self.client.send_request(
+                action='updateclient',
+                params=params
+            )
+        finally:
+            self.invalidate(resource)
+
+    def buffer_updates(self, **options) -> UpdateBuffer:
+        """
+        Create an :class:`UpdateBuffer` that coalesces updates to the same
+        client into a single request.
+
+        :param options: Keyword arguments for :class:`UpdateBuffer`
+        """
+
+        return UpdateBuffer(self, **options)
+
     def delete(self, resource: Union[ClientResource, int]) -> None:
         """
         Delete WHMCS client account.
@@ -291,10 +622,13 @@ class ClientBridge(base.BaseBridge):
         """
         client_id = base.getid(resource)
 
-        self.client.send_request(
-            action='deleteclient',
-            params={'clientid': client_id}
-        )
+        try:
+            self.client.send_request(
+                action='deleteclient',
+                params={'clientid': client_id}
+            )
+        finally:
+            self.invalidate(resource)
 
     def close_client(self, resource: Union[ClientResource, int]) -> None:
         """
@@ -306,10 +640,13 @@ class ClientBridge(base.BaseBridge):
 
         client_id = base.getid(resource)
 
-        self.client.send_request(
-            action='closeclient',
-            params={'clientid': client_id}
-        )
+        try:
+            self.client.send_request(
+                action='closeclient',
+                params={'clientid': client_id}
+            )
+        finally:
+            self.invalidate(resource)
 
     def add_pay_method(self,
                        resource: Union[ClientResource, int],
@@ -364,3 +701,194 @@ class ClientBridge(base.BaseBridge):
                 'type': method_type,
             }
         )
+
+
+class UpdateBuffer:
+    """
+    Write-behind buffer for :meth:`ClientBridge.update`.
+
+    Updates are held per client ID and merged, later values winning, so
+    several updates to one client made between flushes are sent as a single
+    ``updateclient`` request. Custom field mappings are merged key by key.
+
+    Pending updates are flushed every ``interval`` seconds, as soon as
+    ``max_pending`` clients have updates waiting, on :meth:`flush`, and on
+    :meth:`close` (also run when the buffer is garbage collected, or at
+    interpreter exit)::
+
+        with whmcs.clients.buffer_updates(interval=5) as updates:
+            updates.update(1, address1='1 Main St')
+            updates.update(1, phone_number='+1.5555550100')
+
+    A failed update is not retried. It is reported to ``on_error`` as
+    ``on_error(client_id, changes, exception)``, and failures are returned
+    by :meth:`flush`.
+
+    :param bridge: Client bridge to send updates through
+    :param float interval: Seconds between background flushes. ``None``
+        disables background flushing.
+    :param int max_pending: Number of clients with pending updates that
+        triggers a flush
+    :param on_error: Callable invoked for each failed update
+    :param int workers: Number of updates to send at once when flushing,
+        see :meth:`~pywhmcs.base.BaseBridge._hydrate`
+    """
+
+    def __init__(self,
+                 bridge: ClientBridge,
+                 interval: Optional[float] = 1.0,
+                 max_pending: int = 100,
+                 on_error: Optional[Callable[[int, Dict[str, Any], Exception], None]] = None,
+                 workers: Optional[int] = None):
+        self.bridge = bridge
+        self.interval = interval
+        self.max_pending = max_pending
+
+        # The background thread and the finalizer only reference the pending
+        # updates, so an abandoned buffer is still collected (and flushed)
+        self._updates = _PendingUpdates(bridge, on_error, workers)
+        if interval is not None:
+            self._updates.start(interval)
+        self._finalizer = weakref.finalize(self, self._updates.close)
+
+    def __enter__(self) -> UpdateBuffer:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._updates.pending)
+
+    def update(self, resource: Union[ClientResource, int], **kwargs) -> None:
+        """
+        Queue an update. Takes the same arguments as
+        :meth:`ClientBridge.update`.
+
+        :raises TypeError: For an unknown field
+        """
+
+        check_update(kwargs)
+
+        if self._updates.add(int(base.getid(resource)), kwargs) >= self.max_pending:
+            if self._updates.thread is not None:
+                self._updates.wake.set()
+            else:
+                self.flush()
+
+    def flush(self) -> Dict[int, Exception]:
+        """
+        Send all pending updates now.
+
+        :return: Exceptions of failed updates, keyed by client ID
+        :rtype: dict
+        """
+
+        return self._updates.flush()
+
+    def close(self) -> Dict[int, Exception]:
+        """
+        Stop background flushing and flush pending updates.
+
+        :return: Exceptions of failed updates, keyed by client ID
+        :rtype: dict
+        """
+
+        return self._finalizer() or {}
+
+
+class _PendingUpdates:
+    """
+    State of an :class:`UpdateBuffer`, kept apart from it so the buffer can
+    be finalized.
+    """
+
+    def __init__(self,
+                 bridge: ClientBridge,
+                 on_error: Optional[Callable[[int, Dict[str, Any], Exception], None]],
+                 workers: Optional[int]):
+        self.bridge = bridge
+        self.on_error = on_error
+        self.workers = workers
+
+        self.pending: Dict[int, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.closed = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self, interval: float) -> None:
+        self.thread = threading.Thread(target=self._run, args=(interval,), name='whmcs-update-buffer', daemon=True)
+        self.thread.start()
+
+    def add(self, client_id: int, kwargs: Dict[str, Any]) -> int:
+        """
+        Merge an update into the pending ones.
+
+        :return: Number of clients with pending updates
+        """
+
+        with self.lock:
+            if self.closed:
+                raise RuntimeError('Update buffer is closed')
+
+            changes = self.pending.setdefault(client_id, {})
+            for (key, value) in kwargs.items():
+                current = changes.get(key)
+                if key == 'custom_fields' and isinstance(current, Mapping) and isinstance(value, Mapping):
+                    value = {**current, **value}
+                changes[key] = value
+
+            return len(self.pending)
+
+    def flush(self) -> Dict[int, Exception]:
+        with self.flush_lock:
+            with self.lock:
+                (pending, self.pending) = (self.pending, {})
+
+            if not pending:
+                return {}
+
+            self.bridge.client.emit('update_flush', clients=len(pending))
+
+            def send(item):
+                (client_id, changes) = item
+                try:
+                    self.bridge.update(client_id, **changes)
+                except Exception as exc:  # pylint: disable=broad-except
+                    return exc
+                return None
+
+            failures = {}
+            results = self.bridge._hydrate(send, pending.items(), self.workers)  # pylint: disable=protected-access
+            for ((client_id, changes), exc) in zip(pending.items(), results):
+                if exc is None:
+                    continue
+                failures[client_id] = exc
+                if self.on_error is not None:
+                    self.on_error(client_id, changes, exc)
+
+            return failures
+
+    def close(self) -> Dict[int, Exception]:
+        with self.lock:
+            self.closed = True
+
+        # The buffer may be collected on the background thread itself
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.wake.set()
+            self.thread.join()
+
+        return self.flush()
+
+    def _run(self, interval: float) -> None:
+        while not self.closed:
+            self.wake.wait(interval)
+            self.wake.clear()
+            if self.closed:
+                return
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('Background flush of client updates failed')
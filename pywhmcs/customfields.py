@@ -0,0 +1,102 @@
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Union
+import base64
+import collections
+import collections.abc
+import threading
+
+from pywhmcs import cache
+
+#: Maximum number of distinct custom field sets kept by :func:`encode`
+MEMO_SIZE = 1024
+
+_memo: 'collections.OrderedDict[Hashable, str]' = collections.OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def encode(fields: Union[Mapping[Any, Any], List[Any], str, bytes]) -> str:
+    """
+    Encode custom fields the way the WHMCS API expects them: a base64
+    encoded, PHP serialized array.
+
+    Encodings are memoized, so repeatedly sending the same field set only
+    serializes it once. Strings and bytes are assumed to be encoded already
+    and are passed through. ``fields`` is never modified.
+
+    :param fields: Custom field values keyed by field ID, or already encoded
+    :return: Encoded custom fields
+    :rtype: str
+    """
+
+    if isinstance(fields, bytes):
+        return fields.decode('ascii')
+
+    if isinstance(fields, str):
+        return fields
+
+    key = (isinstance(fields, collections.abc.Mapping), cache.freeze(fields))
+
+    with _memo_lock:
+        encoded = _memo.get(key)
+        if encoded is not None:
+            _memo.move_to_end(key)
+            return encoded
+
+    import phpserialize  # pylint: disable=import-outside-toplevel
+
+    if not isinstance(fields, collections.abc.Mapping):
+        fields = dict(enumerate(fields))
+
+    encoded = base64.b64encode(phpserialize.dumps(dict(fields))).decode('ascii')
+
+    with _memo_lock:
+        _memo[key] = encoded
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+    return encoded
+
+
+class CustomFields(list):
+    """
+    Custom fields of a WHMCS response.
+
+    This is the list of ``{'id': ..., 'value': ...}`` entries WHMCS returns,
+    as ``custom_fields`` has always been, with lookups by field ID through
+    :meth:`get` and :attr:`by_id`. The lookup table is built on first use,
+    so treat the list as read-only. WHMCS returns values as strings without
+    their field type, so they are not converted.
+
+    Accepts the shapes WHMCS returns custom fields in: a list of entries,
+    the same list wrapped in ``{'customfield': [...]}``, or an empty string.
+    The undecoded value is available as :attr:`raw`.
+    """
+
+    def __init__(self, raw: Any = None):
+        entries = raw or []
+        if isinstance(entries, collections.abc.Mapping):
+            entries = entries.get('customfield', [])
+        if isinstance(entries, collections.abc.Mapping):
+            entries = [entries]
+
+        super().__init__(entries)
+
+        self.raw = raw
+        self._by_id: Optional[Dict[int, str]] = None
+
+    @property
+    def by_id(self) -> Dict[int, str]:
+        """
+        Custom field values keyed by field ID.
+        """
+
+        if self._by_id is None:
+            self._by_id = {int(field['id']): field['value'] for field in self}
+
+        return self._by_id
+
+    def get(self, field_id: Union[int, str], default: Optional[str] = None) -> Optional[str]:
+        """
+        Value of the custom field with ID ``field_id``.
+        """
+
+        return self.by_id.get(int(field_id), default)
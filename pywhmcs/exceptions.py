@@ -114,6 +114,36 @@ class ClientIDNotFound(WHMCSException):
     message = 'Client ID Not Found'
 
 
+class PromotionNotFound(WHMCSException, ResourceNotFound):
+    """Raised when no promotion matches the requested code"""
+    message = 'Promotion not found'
+
+
+class PromotionInvalid(WHMCSException):
+    """Raised when a promotion cannot be applied"""
+    message = 'Promotion is not valid'
+
+
+class ReplayMismatch(WHMCSException):
+    """Raised when a replayed cassette has no response for a request"""
+    message = 'No recorded response for request'
+
+
+class IncompleteListing(WHMCSException):
+    """Raised when a paginated listing returns fewer records than it reports"""
+    message = 'Listing returned fewer records than its total'
+
+
+class CircuitOpen(WHMCSException):
+    """Raised instead of sending a request while the circuit breaker is open"""
+    message = 'WHMCS requests are failing, circuit breaker is open'
+
+    def __init__(self, message=None, action=None, response=None, group=None, retry_after=None):
+        super().__init__(message, action=action, response=response)
+        self.group = group
+        self.retry_after = retry_after
+
+
 _error_classes = WHMCSException.__subclasses__()
 _code_map = tuple((c.whmcs_message, c) for c in _error_classes if c.whmcs_message)
 
@@ -124,7 +154,14 @@ def from_response(response, action):
     based on a response.
     """
 
-    content = response.json()
+    try:
+        content = response.json()
+    except ValueError:
+        content = None
+
+    if not isinstance(content, dict) or not content.get('message'):
+        status = getattr(response, 'status_code', None)
+        return UnknownError(f'Unexpected response (HTTP {status})', action=action, response=response)
 
     whmcs_message = content['message'].lower()
 
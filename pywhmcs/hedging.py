@@ -0,0 +1,109 @@
+from typing import Deque, Dict, Iterable, Optional
+import collections
+import threading
+
+
+class HedgePolicy:
+    """
+    When to send a duplicate ("hedged") request for a slow read.
+
+    If a read has not completed after the ``percentile`` latency observed
+    for its action, :class:`~pywhmcs.client.Client` sends the same request
+    again and returns whichever response arrives first. Hedging waits until
+    ``min_samples`` latencies have been observed for an action.
+
+    Extra load is capped by a token bucket: every request earns ``budget``
+    tokens (up to ``burst``) and every hedge spends one, so at most about
+    ``budget`` (e.g. 5%) extra requests are sent over time.
+
+    Only idempotent reads should be hedged. By default these are ``get*``
+    actions; pass ``actions`` to choose them explicitly.
+
+    :param float percentile: Latency percentile after which to hedge
+    :param float budget: Maximum extra requests, as a fraction of requests
+    :param float burst: Maximum hedges that can be sent back to back
+    :param int min_samples: Latencies observed for an action before it is
+        hedged
+    :param int window: Number of recent latencies kept per action
+    :param actions: Actions to hedge (defaults to ``get*`` actions)
+    :param int max_concurrency: Reads sent at once, used to size the thread
+        pool hedged reads run on if the client has no limiter or scheduler
+    """
+
+    def __init__(self,
+                 percentile: float = 95.0,
+                 budget: float = 0.05,
+                 burst: float = 10.0,
+                 min_samples: int = 20,
+                 window: int = 1000,
+                 actions: Optional[Iterable[str]] = None,
+                 max_concurrency: int = 32):
+        self.percentile = percentile
+        self.budget = budget
+        self.burst = burst
+        self.min_samples = min_samples
+        self.window = window
+        self.actions = None if actions is None else frozenset(action.lower() for action in actions)
+        self.max_concurrency = max_concurrency
+
+        self.requests = 0
+        self.hedges = 0
+
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def applies(self, action: str) -> bool:
+        action = action.lower()
+
+        if self.actions is None:
+            return action.startswith('get')
+
+        return action in self.actions
+
+    def observe(self, action: str, elapsed: float) -> None:
+        """
+        Record the latency of a completed request.
+        """
+
+        with self._lock:
+            latencies = self._latencies.get(action)
+            if latencies is None:
+                latencies = self._latencies[action] = collections.deque(maxlen=self.window)
+            latencies.append(elapsed)
+
+    def delay(self, action: str) -> Optional[float]:
+        """
+        Seconds to wait for a response to ``action`` before hedging, or
+        ``None`` if it should not be hedged. Counts the request towards the
+        budget.
+        """
+
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+            latencies = self._latencies.get(action)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+
+            ordered = sorted(latencies)
+            index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+
+            return ordered[index]
+
+    def spend(self) -> bool:
+        """
+        Take a hedge from the budget.
+
+        :return: Whether the budget allows another hedge
+        """
+
+        with self._lock:
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+            self.hedges += 1
+
+            return True
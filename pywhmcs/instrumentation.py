@@ -0,0 +1,60 @@
+from typing import Any, Callable, Dict, List
+import collections
+import threading
+
+#: Hook signature: ``hook(event, data)``
+Hook = Callable[[str, Dict[str, Any]], None]
+
+
+class WireStats:
+    """
+    Hook that totals requests and bytes on the wire per action.
+
+    Register it with :meth:`pywhmcs.client.Client.add_hook`::
+
+        stats = WireStats()
+        whmcs.add_hook(stats)
+        ...
+        print(stats.report())
+    """
+
+    FIELDS = ('requests', 'bytes_sent', 'bytes_received', 'bytes_decoded', 'elapsed')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.actions: Dict[str, Dict[str, float]] = collections.defaultdict(
+            lambda: dict.fromkeys(self.FIELDS, 0)
+        )
+
+    def __call__(self, event: str, data: Dict[str, Any]) -> None:
+        if event != 'request':
+            return
+
+        with self._lock:
+            totals = self.actions[data['action']]
+            totals['requests'] += 1
+            totals['bytes_sent'] += data.get('bytes_sent') or 0
+            totals['bytes_received'] += data.get('bytes_received') or 0
+            totals['bytes_decoded'] += data.get('bytes_decoded') or 0
+            totals['elapsed'] += data.get('elapsed') or 0
+
+    def report(self) -> str:
+        """
+        Format the totals as a table, largest responses first.
+        """
+
+        lines: List[str] = [
+            f'{"action":<24} {"requests":>9} {"sent":>12} {"received":>12} {"decoded":>12} {"ratio":>6}'
+        ]
+
+        with self._lock:
+            rows = sorted(self.actions.items(), key=lambda item: -item[1]['bytes_received'])
+
+            for (action, totals) in rows:
+                ratio = totals['bytes_received'] / totals['bytes_decoded'] if totals['bytes_decoded'] else 1.0
+                lines.append(
+                    f'{action:<24} {totals["requests"]:>9} {totals["bytes_sent"]:>12} '
+                    f'{totals["bytes_received"]:>12} {totals["bytes_decoded"]:>12} {ratio:>6.2f}'
+                )
+
+        return '\n'.join(lines)
@@ -1,8 +1,9 @@
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 import dataclasses
 import datetime
 
 from pywhmcs import base
+from pywhmcs import schema
 
 
 @dataclasses.dataclass
@@ -12,9 +13,9 @@ class Invoice(base.BaseResource):
     cc_gateway: bool
     client_id: int
     credit: float
-    date: str
-    date_due: str
-    date_paid: str
+    date: datetime.date
+    date_due: datetime.date
+    date_paid: Optional[datetime.date]
     invoice_num: str
     items: List[Any]
     notes: str
@@ -32,6 +33,33 @@ class Invoice(base.BaseResource):
         self.bridge.capture_payment(self, cvv)
 
 
+#: Converts a ``GetInvoices`` record or ``GetInvoice`` response into
+#: :class:`Invoice` field values. Module-level (and so picklable) so that
+#: records can be parsed in worker processes, see :mod:`pywhmcs.parsing`.
+parse_invoice = schema.compile_parser('parse_invoice', {
+    'balance': schema.Field('balance', float, default=0.0),
+    'cc_gateway': schema.Field('ccgateway', default=None),
+    'client_id': schema.Field('userid', int),
+    'credit': schema.Field('credit', float),
+    'date': schema.Field('date', schema.date),
+    'date_due': schema.Field('duedate', schema.date),
+    'date_paid': schema.Field('datepaid', schema.date, default=None),
+    'id': schema.Field('id', int, aliases=('invoiceid',)),
+    'invoice_num': 'invoicenum',
+    'items': schema.Field('items.item', default=None),
+    'notes': 'notes',
+    'payment_method': schema.Field('paymentmethod', schema.symbol),
+    'status': schema.Field('status', schema.lower),
+    'subtotal': schema.Field('subtotal', float),
+    'tax2': schema.Field('tax2', float),
+    'tax': schema.Field('tax', float),
+    'taxrate2': schema.Field('taxrate2', float),
+    'taxrate': schema.Field('taxrate', float),
+    'total': schema.Field('total', float),
+    'transactions': schema.Field('transactions', default=[]),
+}, __name__)
+
+
 class InvoiceBridge(base.BaseBridge):
 
     def update(self, resource: Union[Invoice, int], **kwargs) -> None:
@@ -94,41 +122,9 @@ class InvoiceBridge(base.BaseBridge):
             params={'invoiceid': int(resource)}
         )
 
-        try:
-            date_paid = datetime.datetime.strptime(
-                response['datepaid'],
-                '%Y-%m-%d %H:%M:%S'
-            ).date(),
-        except ValueError:
-            date_paid = None
-
-        invoice = Invoice(
-            self,
-            balance=float(response.get('balance', 0.0)),
-            cc_gateway=response.get('ccgateway'),
-            client_id=int(response['userid']),
-            credit=float(response['credit']),
-            date=datetime.datetime.strptime(response['date'], '%Y-%m-%d').date(),
-            date_due=datetime.datetime.strptime(response['duedate'], '%Y-%m-%d').date(),
-            date_paid=date_paid,
-            id=int(response['invoiceid']),
-            invoice_num=response['invoicenum'],
-            items=response['items']['item'] if response.get('items') else None,
-            notes=response['notes'],
-            payment_method=response['paymentmethod'],
-            status=response['status'].lower(),
-            subtotal=float(response['subtotal']),
-            tax2=float(response['tax2']),
-            tax=float(response['tax']),
-            taxrate2=float(response['taxrate2']),
-            taxrate=float(response['taxrate']),
-            total=float(response['total']),
-            transactions=response.get('transactions', []),
-        )
-
-        return invoice
+        return Invoice(self, **parse_invoice(response))
 
-    def list(self, detailed=True, marker=None, limit=None, **filters) -> List[Union[Invoice, str]]:
+    def list(self, detailed=False, marker=None, limit=None, **filters) -> List[Union[Invoice, str]]:
         """
         List and filter invoices.
 
@@ -150,44 +146,54 @@ class InvoiceBridge(base.BaseBridge):
             }.items() if value is not None
         }
 
-        response = self.client.send_request('getinvoices', params)
-
-        matches = []
-        for whmcs_invoice in response['invoices']['invoice']:
-            try:
-                date_paid = datetime.datetime.strptime(
-                    whmcs_invoice['datepaid'],
-                    '%Y-%m-%d %H:%M:%S'
-                ).date(),
-            except ValueError:
-                date_paid = None
-
-            invoice = Invoice(
-                self,
-                balance=float(whmcs_invoice.get('balance', 0.0)),
-                cc_gateway=whmcs_invoice.get('ccgateway'),
-                client_id=int(whmcs_invoice['userid']),
-                credit=float(whmcs_invoice['credit']),
-                date=datetime.datetime.strptime(whmcs_invoice['date'], '%Y-%m-%d').date(),
-                date_due=datetime.datetime.strptime(whmcs_invoice['duedate'], '%Y-%m-%d').date(),
-                date_paid=date_paid,
-                id=int(whmcs_invoice['id']),
-                invoice_num=whmcs_invoice['invoicenum'],
-                items=whmcs_invoice['items']['item'] if whmcs_invoice.get('items') else None,
-                notes=whmcs_invoice['notes'],
-                payment_method=whmcs_invoice['paymentmethod'],
-                status=whmcs_invoice['status'].lower(),
-                subtotal=float(whmcs_invoice['subtotal']),
-                tax2=float(whmcs_invoice['tax2']),
-                tax=float(whmcs_invoice['tax']),
-                taxrate2=float(whmcs_invoice['taxrate2']),
-                taxrate=float(whmcs_invoice['taxrate']),
-                total=float(whmcs_invoice['total']),
-                transactions=whmcs_invoice.get('transactions', []),
-            )
-            matches.append(invoice)
-
-        return matches
+        records = self.client.stream_request('getinvoices', params, path='invoices.invoice')
+
+        return [self._from_record(record) for record in records]
+
+    def iter(self,
+             client_id: Optional[int] = None,
+             status: Optional[str] = None,
+             page_size: int = 100,
+             marker: Optional[int] = None,
+             limit: Optional[int] = None) -> Iterator[Invoice]:
+        """
+        Iterate over invoices, fetching ``page_size`` invoices per request.
+
+        Invoices are built as each page's response is parsed, so memory use
+        does not grow with the number of invoices. Pages are parsed on worker
+        processes if the client has a :class:`~pywhmcs.parsing.ProcessParser`.
+
+        :param int client_id: Client ID to filter by
+        :param str status: Status to filter by
+        :param int page_size: Number of invoices to request per page
+        :param int marker: Offset index of the first invoice
+        :param int limit: Maximum number of invoices to return
+        :return: Invoices matching given criteria
+        :rtype: Iterator[:class:`Invoice`]
+        """
+
+        params = {
+            key: value for (key, value)
+            in {
+                'userid': client_id,
+                'status': status
+            }.items() if value is not None
+        }
+
+        yield from self._iter_resources(
+            'getinvoices',
+            params,
+            'invoices',
+            'invoice',
+            parse_invoice,
+            Invoice,
+            page_size=page_size,
+            marker=marker,
+            limit=limit
+        )
+
+    def _from_record(self, whmcs_invoice: Dict[str, Any]) -> Invoice:
+        return Invoice(self, **parse_invoice(whmcs_invoice))
 
     def create(self,
                client_id: Union[int, str],
@@ -0,0 +1,124 @@
+from typing import Dict, Optional
+import threading
+import time
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for WHMCS requests that adapts to server capacity
+    (additive increase, multiplicative decrease).
+
+    Every request sent by a :class:`~pywhmcs.client.Client` given this
+    limiter as ``limiter`` waits for a slot first. While responses arrive
+    within ``tolerance`` times the baseline latency of their action, the
+    limit grows by about one slot per ``limit`` successful requests. A slower
+    response, an HTTP 5xx status or a transport error (timeout, connection
+    error) multiplies the limit by ``backoff``, at most once per baseline
+    latency so a burst of failures from one overload is only counted once.
+
+    Baselines are kept per action, so a slow but healthy action (e.g. a
+    large ``getinvoices`` page) is not judged against a fast one.
+
+    Bulk operations that take ``workers`` (such as detailed listings) use
+    ``max_limit`` threads by default when a limiter is set, leaving the
+    limiter to decide how many requests actually run. Changes to the limit
+    are emitted to instrumentation hooks as ``concurrency`` events.
+
+    :param int initial: Starting limit
+    :param int min_limit: Lowest limit
+    :param int max_limit: Highest limit
+    :param float backoff: Factor the limit is multiplied by on overload
+    :param float tolerance: Latency, as a multiple of the baseline, above
+        which a response counts as a sign of overload
+    :param float smoothing: Weight of each new sample in an action's
+        baseline latency, which otherwise tracks the lowest latency seen
+    """
+
+    def __init__(self,
+                 initial: int = 4,
+                 min_limit: int = 1,
+                 max_limit: int = 64,
+                 backoff: float = 0.5,
+                 tolerance: float = 2.0,
+                 smoothing: float = 0.05):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+
+        self.baselines: Dict[Optional[str], float] = {}
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a free slot.
+
+        :param float timeout: Seconds to wait. ``None`` waits indefinitely.
+        :return: Whether a slot was acquired
+        """
+
+        with self._condition:
+            acquired = self._condition.wait_for(lambda: self._in_flight < int(self._limit), timeout)
+            if acquired:
+                self._in_flight += 1
+            return acquired
+
+    def release(self,
+                elapsed: Optional[float],
+                failed: bool = False,
+                action: Optional[str] = None) -> Optional[int]:
+        """
+        Free a slot and adjust the limit from the request's outcome.
+
+        :param float elapsed: Seconds the request took, or ``None`` to free
+            the slot without adjusting the limit, e.g. for a request that
+            never reached the server
+        :param bool failed: Whether the request failed because of the server
+            or network
+        :param str action: Action of the request, whose baseline ``elapsed``
+            is compared against
+        :return: The new limit if it changed
+        """
+
+        with self._condition:
+            self._in_flight -= 1
+            before = int(self._limit)
+
+            if elapsed is None and not failed:
+                self._condition.notify_all()
+                return None
+
+            baseline = self.baselines.get(action)
+            if not failed and elapsed is not None:
+                if baseline is None or elapsed < baseline:
+                    baseline = elapsed
+                else:
+                    baseline += self.smoothing * (elapsed - baseline)
+                self.baselines[action] = baseline
+
+                failed = elapsed > baseline * self.tolerance
+
+            now = time.monotonic()
+            if failed:
+                if now - self._last_decrease >= (baseline or 0.0):
+                    self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                    self._last_decrease = now
+            else:
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+
+            self._condition.notify_all()
+
+            after = int(self._limit)
+            return after if after != before else None
@@ -1,10 +1,11 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 import dataclasses
 import datetime
 
 from pywhmcs import base
 from pywhmcs import exceptions
+from pywhmcs import schema
 
 
 @dataclasses.dataclass
@@ -56,6 +57,40 @@ class Order(base.BaseResource):
         self.bridge.fraud_check(self)
 
 
+#: Converts a ``GetOrders`` record into :class:`Order` field values.
+#: Module-level (and so picklable) so that records can be parsed in worker
+#: processes, see :mod:`pywhmcs.parsing`.
+parse_order = schema.compile_parser('parse_order', {
+    'id': schema.Field('id', int),
+    'amount': schema.Field('amount', float),
+    'client_id': schema.Field('userid', int),
+    'contact_id': schema.Field('contactid', int, empty_none=True),
+    'currency_prefix': schema.Field('currencyprefix', schema.symbol),
+    'currency_suffix': schema.Field('currencysuffix', schema.symbol),
+    'date': schema.Field('date', schema.timestamp),
+    'fraud_data': schema.Field('frauddata', empty_none=True),
+    'fraud_module': schema.Field('fraudmodule', empty_none=True),
+    'fraud_output': schema.Field('fraudoutput', empty_none=True),
+    'invoice_id': schema.Field('invoiceid', int),
+    'ip_address': 'ipaddress',
+    'line_items': 'lineitems',
+    'name': 'name',
+    'nameservers': schema.Field('nameservers', empty_none=True),
+    'notes': schema.Field('notes', empty_none=True),
+    'order_data': 'orderdata',
+    'order_num': schema.Field('ordernum', int),
+    'payment_method': schema.Field('paymentmethod', schema.symbol),
+    'payment_method_name': schema.Field('paymentmethodname', schema.symbol),
+    'payment_status': schema.Field('paymentstatus', schema.symbol),
+    'promo_code': schema.Field('promocode', empty_none=True),
+    'promo_type': schema.Field('promotype', schema.symbol, empty_none=True),
+    'promo_value': schema.Field('promovalue', empty_none=True),
+    'renewals': schema.Field('renewals', empty_none=True),
+    'status': schema.Field('status', schema.lower),
+    'transfer_secret': schema.Field('transfersecret', empty_none=True),
+}, __name__)
+
+
 class OrdersBridge(base.BaseBridge):
 
     def create(self,
@@ -134,40 +169,7 @@ class OrdersBridge(base.BaseBridge):
         if not response['numreturned']:
             raise exceptions.OrderNotFound
 
-        whmcs_order = response['orders']['order'][0]
-
-        order = Order(
-            self,
-            id=int(whmcs_order['id']),
-            amount=float(whmcs_order['amount']),
-            client_id=int(whmcs_order['userid']),
-            contact_id=int(whmcs_order['contactid']) or None,
-            currency_prefix=whmcs_order['currencyprefix'],
-            currency_suffix=whmcs_order['currencysuffix'],
-            date=datetime.datetime.strptime(whmcs_order['date'], '%Y-%m-%d %H:%M:%S'),
-            fraud_data=whmcs_order['frauddata'] or None,
-            fraud_module=whmcs_order['fraudmodule'] or None,
-            fraud_output=whmcs_order['fraudoutput'] or None,
-            invoice_id=int(whmcs_order['invoiceid']),
-            ip_address=whmcs_order['ipaddress'],
-            line_items=whmcs_order['lineitems'],
-            name=whmcs_order['name'],
-            nameservers=whmcs_order['nameservers'] or None,
-            notes=whmcs_order['notes'] or None,
-            order_data=whmcs_order['orderdata'],
-            order_num=int(whmcs_order['ordernum']),
-            payment_method=whmcs_order['paymentmethod'],
-            payment_method_name=whmcs_order['paymentmethodname'],
-            payment_status=whmcs_order['paymentstatus'],
-            promo_code=whmcs_order['promocode'] or None,
-            promo_type=whmcs_order['promotype'] or None,
-            promo_value=whmcs_order['promovalue'] or None,
-            renewals=whmcs_order['renewals'] or None,
-            status=whmcs_order['status'].lower(),
-            transfer_secret=whmcs_order['transfersecret'] or None,
-        )
-
-        return order
+        return self._from_record(response['orders']['order'][0])
 
     def accept(self, resource: Union[int, Order]) -> None:
         """
@@ -222,8 +224,65 @@ class OrdersBridge(base.BaseBridge):
 
         self.client.send_request('cancelorder', params=params)
 
-    def list(self, detailed=True, marker=None, limit=None, **filters) -> List[Union[Order, str]]:
-        raise NotImplementedError
+    def list(self, detailed=False, marker=None, limit=None, **filters) -> List[Union[Order, str]]:
+        """
+        List and filter orders via WHMCS API method ``GetOrders``.
+
+        :param int marker: Offset index for order list
+        :param int limit: Number of orders to return in list
+        :param filters: Filters accepted by :meth:`iter`
+        :return: Orders matching given criteria
+        :rtype: List[:class:`Order`]
+        """
+
+        return list(self.iter(marker=marker, limit=limit, **filters))
+
+    def iter(self,
+             client_id: Optional[int] = None,
+             status: Optional[str] = None,
+             requestor_id: Optional[int] = None,
+             page_size: int = 100,
+             marker: Optional[int] = None,
+             limit: Optional[int] = None) -> Iterator[Order]:
+        """
+        Iterate over orders, fetching ``page_size`` orders per request.
+
+        Pages are parsed on worker processes if the client has a
+        :class:`~pywhmcs.parsing.ProcessParser`.
+
+        :param int client_id: Client ID to filter by
+        :param str status: Status to filter by
+        :param int requestor_id: Requestor ID to filter by
+        :param int page_size: Number of orders to request per page
+        :param int marker: Offset index of the first order
+        :param int limit: Maximum number of orders to return
+        :return: Orders matching given criteria
+        :rtype: Iterator[:class:`Order`]
+        """
+
+        params = {
+            key: value for (key, value)
+            in {
+                'userid': client_id,
+                'status': status,
+                'requestor_id': requestor_id
+            }.items() if value is not None
+        }
+
+        yield from self._iter_resources(
+            'getorders',
+            params,
+            'orders',
+            'order',
+            parse_order,
+            Order,
+            page_size=page_size,
+            marker=marker,
+            limit=limit
+        )
+
+    def _from_record(self, whmcs_order: Dict[str, Any]) -> Order:
+        return Order(self, **parse_order(whmcs_order))
 
     def pending(self):
         raise NotImplementedError
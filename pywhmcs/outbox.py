@@ -0,0 +1,398 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import concurrent.futures
+import contextlib
+import contextvars
+import json
+import sqlite3
+import threading
+import time
+
+from pywhmcs import customfields
+from pywhmcs import exceptions
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pywhmcs import client as whmcs_client
+
+#: Recorded, not sent yet
+PENDING = 'pending'
+#: Being sent
+SENDING = 'sending'
+#: Sent, WHMCS reported success
+SENT = 'sent'
+#: Sent, WHMCS reported an error
+FAILED = 'failed'
+#: May or may not have reached WHMCS (process died, timeout, HTTP 5xx)
+UNKNOWN = 'unknown'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    action TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    response TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, id);
+'''
+
+
+class Entry:
+    """
+    A request recorded in an :class:`Outbox`.
+    """
+
+    def __init__(self, row: Tuple[Any, ...]):
+        (self.id, self.action, params, self.status, self.attempts,
+         self.created, self.updated, response, self.error) = row
+        self.params: Dict[str, Any] = json.loads(params)
+        self.response: Optional[Dict[str, Any]] = json.loads(response) if response else None
+
+    def __repr__(self) -> str:
+        return f'<Entry {self.id} {self.action} {self.status}>'
+
+
+class Outbox:
+    """
+    Durable record of mutating requests, kept in a SQLite database.
+
+    Requests are written (and committed) before they are sent, and their
+    outcome is written after, so a process that dies mid-batch leaves a
+    record of what was and was not sent::
+
+        outbox = Outbox(whmcs, 'outbox.db')
+        outbox.start()
+        for invoice_id in invoice_ids:
+            outbox.enqueue('capturepayment', {'invoiceid': invoice_id})
+        outbox.close()
+
+    Entries are drained by a background thread in batches of ``batch_size``,
+    sent ``workers`` at a time. An entry ends up ``sent``, ``failed`` (WHMCS
+    returned an error), or ``unknown`` when the request may have reached WHMCS
+    without a response being recorded: a timeout, an HTTP 5xx, or a process
+    that died while sending. Entries refused by the circuit breaker are
+    retried. ``pending`` entries left by a previous process are sent when
+    draining starts; ``unknown`` entries are never resent automatically,
+    since calls such as ``capturepayment`` are not idempotent. Check them in
+    WHMCS and pass them to :meth:`retry` if needed.
+
+    The database holds request parameters, which may include secrets such as
+    card numbers; store it accordingly.
+
+    :param client: Client to send requests with
+    :param str path: SQLite database path
+    :param int batch_size: Number of entries claimed per batch
+    :param int workers: Number of requests sent at once
+    :param float poll_interval: Seconds between checks for new entries
+    """
+
+    def __init__(self,
+                 client: 'whmcs_client.Client',
+                 path: str,
+                 batch_size: int = 100,
+                 workers: int = 4,
+                 poll_interval: float = 0.5):
+        self.client = client
+        self.path = path
+        self.batch_size = batch_size
+        self.workers = workers
+        self.poll_interval = poll_interval
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=FULL')
+        self._db.executescript(SCHEMA)
+        self._lock = threading.RLock()
+
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Entries a previous process was sending when it stopped
+        self._execute(
+            'UPDATE outbox SET status = ?, updated = ? WHERE status = ?',
+            (UNKNOWN, time.time(), SENDING)
+        )
+
+    def __enter__(self) -> 'Outbox':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # The connection autocommits each statement otherwise, and with it
+        # each row of an executemany(); callers hold the lock
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._db
+            self._db.execute('COMMIT')
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+
+    def _execute(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._db.execute(sql, tuple(params))
+
+    def enqueue(self, action: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Record a request to be sent by the background drain.
+
+        :return: Entry ID
+        """
+
+        return self.enqueue_many([(action, params)])[0]
+
+    def enqueue_many(self, requests: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> List[int]:
+        """
+        Record several ``(action, params)`` requests in one transaction.
+
+        :return: Entry IDs
+        """
+
+        now = time.time()
+        ids = []
+
+        with self._lock:
+            with self._transaction() as db:
+                for (action, params) in requests:
+                    cursor = db.execute(
+                        'INSERT INTO outbox (action, params, status, created, updated) VALUES (?, ?, ?, ?, ?)',
+                        (action, self._dump(params), PENDING, now, now)
+                    )
+                    ids.append(cursor.lastrowid)
+
+            self._idle.clear()
+
+        self._wake.set()
+
+        return ids
+
+    def send(self, action: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Record a request, send it now, and record its outcome.
+
+        :return: Response JSON body
+        """
+
+        now = time.time()
+        cursor = self._execute(
+            'INSERT INTO outbox (action, params, status, attempts, created, updated) VALUES (?, ?, ?, 1, ?, ?)',
+            (action, self._dump(params), SENDING, now, now)
+        )
+        entry_id = cursor.lastrowid
+
+        (status, response, error) = self._send(action, json.loads(self._dump(params)))
+        if status == PENDING:
+            # Refused by the circuit breaker; leave resending to the caller
+            status = FAILED
+        self._finish([(entry_id, status, response, error)])
+
+        if isinstance(error, BaseException):
+            raise error
+
+        return response
+
+    def entries(self, status: Optional[str] = None, limit: Optional[int] = None) -> List[Entry]:
+        """
+        Recorded entries, oldest first.
+
+        :param str status: Status to filter by
+        :param int limit: Maximum number of entries to return
+        """
+
+        sql = 'SELECT * FROM outbox'
+        params: List[Any] = []
+        if status is not None:
+            sql += ' WHERE status = ?'
+            params.append(status)
+        sql += ' ORDER BY id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        return [Entry(row) for row in self._execute(sql, params).fetchall()]
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Number of entries per status.
+        """
+
+        return dict(self._execute('SELECT status, COUNT(*) FROM outbox GROUP BY status').fetchall())
+
+    def retry(self, entry_ids: Iterable[int]) -> None:
+        """
+        Queue ``failed`` or ``unknown`` entries to be sent again.
+        """
+
+        with self._lock:
+            with self._transaction() as db:
+                db.executemany(
+                    'UPDATE outbox SET status = ?, updated = ? WHERE id = ? AND status IN (?, ?)',
+                    [(PENDING, time.time(), entry_id, FAILED, UNKNOWN) for entry_id in entry_ids]
+                )
+            self._idle.clear()
+
+        self._wake.set()
+
+    def purge(self, before: Optional[float] = None) -> int:
+        """
+        Delete ``sent`` entries, optionally only those sent before a UNIX
+        timestamp.
+
+        :return: Number of entries deleted
+        """
+
+        cursor = self._execute(
+            'DELETE FROM outbox WHERE status = ? AND updated < ?',
+            (SENT, time.time() if before is None else before)
+        )
+
+        return cursor.rowcount
+
+    def start(self) -> None:
+        """
+        Start draining entries on a background thread, starting with any
+        ``pending`` entries left by a previous process.
+        """
+
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._run,),
+            name='whmcs-outbox',
+            daemon=True
+        )
+        self._thread.start()
+
+    def drain(self) -> int:
+        """
+        Send pending entries until there are none left.
+
+        :return: Number of entries processed
+        """
+
+        processed = 0
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                batch = self._claim()
+                if not batch:
+                    return processed
+
+                futures = [
+                    executor.submit(contextvars.copy_context().run, self._send, entry.action, entry.params)
+                    for entry in batch
+                ]
+                outcomes = [
+                    (entry.id,) + future.result()
+                    for (entry, future) in zip(batch, futures)
+                ]
+                self._finish(outcomes)
+
+                processed += len(batch)
+
+                if self.client.hooks:
+                    self.client.emit('outbox', processed=len(batch), counts=self.counts())
+
+                # Refused by the circuit breaker; try again on the next poll
+                if any(status == PENDING for (_, status, _, _) in outcomes):
+                    return processed
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the background drain to send all pending entries.
+
+        :return: Whether the outbox drained within ``timeout``
+        """
+
+        return self._idle.wait(timeout)
+
+    def close(self) -> None:
+        """
+        Send remaining pending entries, stop the background drain and close
+        the database.
+        """
+
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+        self.drain()
+
+        with self._lock:
+            self._db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.drain()
+            with self._lock:
+                if not self._execute('SELECT 1 FROM outbox WHERE status = ? LIMIT 1', (PENDING,)).fetchone():
+                    self._idle.set()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _claim(self) -> List[Entry]:
+        with self._lock, self._transaction() as db:
+            rows = db.execute(
+                'SELECT * FROM outbox WHERE status = ? ORDER BY id LIMIT ?',
+                (PENDING, self.batch_size)
+            ).fetchall()
+            db.executemany(
+                'UPDATE outbox SET status = ?, attempts = attempts + 1, updated = ? WHERE id = ?',
+                [(SENDING, time.time(), row[0]) for row in rows]
+            )
+
+        return [Entry(row) for row in rows]
+
+    def _send(self, action: str, params: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]], Any]:
+        try:
+            return (SENT, self.client.send_request(action, params), None)
+        except exceptions.CircuitOpen as exc:
+            return (PENDING, None, exc)
+        except exceptions.WHMCSException as exc:
+            response = exc.response
+            if response is not None and getattr(response, 'status_code', 200) < 500:
+                return (FAILED, None, exc)
+            return (UNKNOWN, None, exc)
+        except Exception as exc:  # pylint: disable=broad-except
+            return (UNKNOWN, None, exc)
+
+    def _finish(self, outcomes: List[Tuple[int, str, Optional[Dict[str, Any]], Any]]) -> None:
+        now = time.time()
+
+        with self._lock, self._transaction() as db:
+            db.executemany(
+                'UPDATE outbox SET status = ?, updated = ?, response = ?, error = ? WHERE id = ?',
+                [
+                    (
+                        status,
+                        now,
+                        json.dumps(response) if response is not None else None,
+                        str(error) if error is not None else None,
+                        entry_id,
+                    )
+                    for (entry_id, status, response, error) in outcomes
+                ]
+            )
+
+    @staticmethod
+    def _dump(params: Optional[Dict[str, Any]]) -> str:
+        params = dict(params or {})
+
+        # Encode custom fields now so they survive the JSON round trip
+        if params.get('customfields') is not None:
+            params['customfields'] = customfields.encode(params['customfields'])
+
+        return json.dumps(params, default=str)
@@ -0,0 +1,99 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import concurrent.futures
+import json
+
+from pywhmcs import schema
+
+#: Converts a raw WHMCS record into resource field values
+RecordParser = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def parse_page(body: bytes,
+               path: str,
+               parse: RecordParser,
+               names: Sequence[str]) -> Tuple[Dict[str, Any], List[Tuple[Any, ...]]]:
+    """
+    Parse a raw list response body into rows of resource field values.
+
+    Runs in worker processes. Rows are plain tuples ordered like ``names``,
+    which pickle much more compactly than dicts or resources.
+
+    :param bytes body: Raw response body
+    :param str path: Dotted path of the record list, e.g. ``invoices.invoice``
+    :param parse: Module-level function converting a record to field values,
+        e.g. :func:`pywhmcs.invoices.parse_invoice`
+    :param names: Field names, in resource constructor order
+    :return: Top-level scalar values of the response and the parsed rows
+    """
+
+    document = json.loads(body)
+
+    if not isinstance(document, dict):
+        return ({}, [])
+
+    meta = {
+        key: value for (key, value) in document.items()
+        if not isinstance(value, (dict, list))
+    }
+
+    records: Any = document
+    for key in path.split('.'):
+        records = records.get(key) if isinstance(records, dict) else None
+
+    rows = []
+    for record in records if isinstance(records, list) else []:
+        fields = parse(record)
+        rows.append(tuple(fields[name] for name in names))
+
+    return (meta, rows)
+
+
+class ProcessParser:
+    """
+    Parse list responses on a pool of worker processes.
+
+    Converting records into resources (``strptime``, ``float`` conversion,
+    dataclass field values) is CPU-bound and serialized by the GIL. Pass a
+    ``ProcessParser`` to :class:`pywhmcs.client.Client` to hand raw page
+    bodies to worker processes instead, while the calling thread keeps
+    fetching the next pages::
+
+        whmcs = Client(url, username, password, parser=ProcessParser())
+        for invoice in whmcs.invoices.iter(page_size=5000):
+            ...
+
+    :param int max_workers: Number of worker processes (defaults to the CPU
+        count)
+    :param int max_pending: Maximum number of pages parsed or waiting to be
+        parsed at once (defaults to twice the number of workers)
+    :param mp_context: :mod:`multiprocessing` context for the pool
+
+    Workers attach the timezone set with :func:`pywhmcs.schema.set_timezone`
+    when the parser is created.
+    """
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None,
+                 mp_context=None):
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=schema.set_timezone,
+            initargs=(schema.get_timezone(),)
+        )
+        self.max_pending = max_pending or 2 * self.executor._max_workers  # pylint: disable=protected-access
+
+    def submit(self,
+               body: bytes,
+               path: str,
+               parse: RecordParser,
+               names: Sequence[str]) -> concurrent.futures.Future:
+        """
+        Schedule :func:`parse_page` on a worker process.
+        """
+
+        return self.executor.submit(parse_page, body, path, parse, tuple(names))
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,326 @@
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import collections
+import concurrent.futures
+import contextvars
+import itertools
+import queue
+import threading
+
+from pywhmcs import client as whmcs_client
+from pywhmcs import transports
+
+
+class ClientPool:
+    """
+    Manage :class:`~pywhmcs.client.Client` instances for many WHMCS
+    installations ("tenants").
+
+    Tenants share one transport (and so one set of connection pools) and one
+    thread pool. Work is dispatched round-robin across tenants, with at most
+    ``per_tenant`` calls running for any one tenant, so a tenant with a
+    large backlog cannot starve the others.
+
+    :param transport: Transport shared by all tenants. Defaults to a
+        :class:`~pywhmcs.transports.RequestsTransport` sized for
+        ``max_workers``.
+    :param int max_workers: Size of the shared thread pool
+    :param int per_tenant: Default maximum concurrent calls per tenant
+    :param client_options: Default keyword arguments for every
+        :class:`~pywhmcs.client.Client`
+    """
+
+    def __init__(self,
+                 transport: Optional[transports.Transport] = None,
+                 max_workers: int = 16,
+                 per_tenant: int = 4,
+                 **client_options):
+        self.transport = transport or transports.RequestsTransport(pool_maxsize=max_workers)
+        self.max_workers = max_workers
+        self.per_tenant = per_tenant
+        self.client_options = client_options
+
+        self._clients: Dict[str, whmcs_client.Client] = {}
+        self._limits: Dict[str, int] = {}
+        self._pending: Dict[str, Deque[Tuple[concurrent.futures.Future, Callable, tuple, contextvars.Context]]] = {}
+        self._running: Dict[str, int] = {}
+        self._order: List[str] = []
+        self._next = 0
+        self._active = 0
+
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='whmcs-pool'
+        )
+
+    def __getitem__(self, name: str) -> whmcs_client.Client:
+        return self._clients[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._clients
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._clients))
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def add(self,
+            name: str,
+            api_url: str,
+            username: str,
+            password: str,
+            max_concurrency: Optional[int] = None,
+            **client_options) -> whmcs_client.Client:
+        """
+        Register a tenant.
+
+        :param str name: Name to refer to the tenant by
+        :param str api_url: Tenant's WHMCS API URL
+        :param str username: Tenant's API username
+        :param str password: Tenant's API password
+        :param int max_concurrency: Maximum concurrent calls for this tenant
+            (defaults to the pool's ``per_tenant``)
+        :param client_options: Keyword arguments for this tenant's
+            :class:`~pywhmcs.client.Client`
+        :return: Tenant's client
+        :rtype: :class:`~pywhmcs.client.Client`
+        """
+
+        options = dict(self.client_options, **client_options)
+        if 'transport' not in options:
+            # Replaying or recording one tenant must not close the others'
+            options.update(transport=self.transport, owns_transport=False)
+
+        client = whmcs_client.Client(api_url, username, password, **options)
+
+        with self._lock:
+            if name in self._clients:
+                raise ValueError(f'Tenant {name!r} already exists')
+
+            self._clients[name] = client
+            self._limits[name] = max_concurrency or self.per_tenant
+            self._pending[name] = collections.deque()
+            # A removed tenant's calls may still be running
+            self._running.setdefault(name, 0)
+            self._order.append(name)
+
+        return client
+
+    def remove(self, name: str) -> None:
+        """
+        Unregister a tenant. Calls already running are not interrupted, and
+        count towards the tenant's limit if it is added again; queued calls
+        are cancelled.
+        """
+
+        with self._lock:
+            del self._clients[name]
+            del self._limits[name]
+            self._order.remove(name)
+            pending = self._pending.pop(name)
+            if not self._running[name]:
+                del self._running[name]
+
+        for (future, _, _, _) in pending:
+            future.cancel()
+
+    def submit(self, name: str, func: Callable[..., Any], *args) -> concurrent.futures.Future:
+        """
+        Schedule ``func(client, *args)`` for a tenant.
+
+        :param str name: Tenant to run the call for
+        :param func: Callable taking the tenant's client first
+        :return: Future of the call's result
+        :rtype: :class:`concurrent.futures.Future`
+        """
+
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        with self._lock:
+            self._pending[name].append((future, func, args, contextvars.copy_context()))
+
+        self._dispatch()
+
+        return future
+
+    def map(self,
+            func: Callable[[whmcs_client.Client], Any],
+            names: Optional[Iterable[str]] = None,
+            return_exceptions: bool = False) -> Iterator[Tuple[str, Any]]:
+        """
+        Run ``func(client)`` for every tenant concurrently, yielding
+        ``(name, result)`` pairs as they complete.
+
+        :param func: Callable taking a tenant's client
+        :param names: Tenants to run for (defaults to all)
+        :param bool return_exceptions: Yield ``(name, exception)`` for failed
+            tenants instead of raising
+        """
+
+        futures = {
+            self.submit(name, func): name
+            for name in (list(self) if names is None else names)
+        }
+
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                name = futures[future]
+                try:
+                    yield (name, future.result())
+                except Exception as exc:  # pylint: disable=broad-except
+                    if not return_exceptions:
+                        raise
+                    yield (name, exc)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def stream(self,
+               func: Callable[[whmcs_client.Client], Iterable[Any]],
+               names: Optional[Iterable[str]] = None,
+               return_exceptions: bool = False,
+               buffer: int = 1000,
+               chunk: int = 100) -> Iterator[Tuple[str, Any]]:
+        """
+        Run ``func(client)`` for every tenant concurrently and merge the
+        iterables it returns, yielding ``(name, item)`` pairs as items arrive::
+
+            for (tenant, invoice) in pool.stream(lambda c: c.invoices.iter(status='Unpaid')):
+                ...
+
+        :param func: Callable taking a tenant's client and returning an
+            iterable
+        :param names: Tenants to run for (defaults to all)
+        :param bool return_exceptions: Yield ``(name, exception)`` for failed
+            tenants instead of raising
+        :param int buffer: Maximum number of items buffered ahead of the
+            consumer
+        :param int chunk: Number of items taken from a tenant's iterable
+            before its worker is handed to the next tenant, so every tenant
+            makes progress even with more tenants than workers
+        """
+
+        items: queue.Queue = queue.Queue(maxsize=buffer)
+        stop = threading.Event()
+        done = object()
+
+        def put(entry):
+            while not stop.is_set():
+                try:
+                    items.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def finish(name, iterator):
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+            put((name, False, done))
+
+        def produce(client, name, iterator=None):
+            finished = True
+            try:
+                if iterator is None:
+                    iterator = iter(func(client))
+
+                count = 0
+                for item in itertools.islice(iterator, chunk):
+                    if not put((name, False, item)):
+                        return
+                    count += 1
+
+                if count == chunk and not stop.is_set():
+                    # Queue the rest behind the other tenants' calls
+                    try:
+                        schedule(name, iterator)
+                        finished = False
+                    except KeyError:
+                        # The tenant was removed, which cancels its queued calls
+                        pass
+            except Exception as exc:  # pylint: disable=broad-except
+                put((name, True, exc))
+            finally:
+                if finished:
+                    finish(name, iterator)
+
+        def schedule(name, iterator=None):
+            future = self.submit(name, produce, name, iterator)
+            # Cancelled, e.g. by remove(): the tenant is done
+            future.add_done_callback(lambda future: future.cancelled() and finish(name, iterator))
+            futures.append(future)
+
+        futures: List[concurrent.futures.Future] = []
+        remaining = 0
+        for name in (list(self) if names is None else names):
+            schedule(name)
+            remaining += 1
+
+        try:
+            while remaining:
+                (name, failed, item) = items.get()
+                if item is done:
+                    remaining -= 1
+                elif not failed:
+                    yield (name, item)
+                elif return_exceptions:
+                    yield (name, item)
+                else:
+                    raise item
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+
+    def close(self) -> None:
+        """
+        Shut down the thread pool and the shared transport.
+        """
+
+        self._executor.shutdown(wait=True)
+        self.transport.close()
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            while self._active < self.max_workers and self._order:
+                name = self._pick()
+                if name is None:
+                    return
+
+                (future, func, args, context) = self._pending[name].popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                self._running[name] += 1
+                self._active += 1
+                self._executor.submit(context.run, self._run, name, self._clients[name], future, func, args)
+
+    def _pick(self) -> Optional[str]:
+        for offset in range(len(self._order)):
+            name = self._order[(self._next + offset) % len(self._order)]
+            if self._pending[name] and self._running[name] < self._limits[name]:
+                self._next = (self._next + offset + 1) % len(self._order)
+                return name
+
+        return None
+
+    def _run(self,
+             name: str,
+             client: whmcs_client.Client,
+             future: concurrent.futures.Future,
+             func: Callable,
+             args: tuple) -> None:
+        try:
+            future.set_result(func(client, *args))
+        except BaseException as exc:  # pylint: disable=broad-except
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._running[name] -= 1
+                self._active -= 1
+                if not self._running[name] and name not in self._clients:
+                    del self._running[name]
+
+            self._dispatch()
@@ -2,6 +2,7 @@ from typing import Any, Dict, List, Optional, Union
 import dataclasses
 
 from pywhmcs import base
+from pywhmcs import schema
 
 
 @dataclasses.dataclass
@@ -18,6 +19,21 @@ class Product(base.BaseResource):
     type: str
 
 
+#: Converts a ``GetProducts`` record into :class:`Product` field values
+parse_product = schema.compile_parser('parse_product', {
+    'id': schema.Field('pid', int),
+    'configoptions': 'configoptions.configoption',
+    'customfields': 'customfields.customfield',
+    'description': schema.Field('description', empty_none=True),
+    'group_id': schema.Field('gid', int),
+    'module': schema.Field('module', schema.symbol),
+    'name': 'name',
+    'paytype': schema.Field('paytype', schema.symbol),
+    'pricing': 'pricing',
+    'type': schema.Field('type', schema.symbol),
+}, __name__)
+
+
 class ProductsBridge(base.BaseBridge):
 
     def get(self, resource: Union[str, int]) -> Product:
@@ -37,23 +53,9 @@ class ProductsBridge(base.BaseBridge):
 
         whmcs_product = response['products']['product'][0]
 
-        product = Product(
-            self,
-            id=int(whmcs_product['pid']),
-            configoptions=whmcs_product['configoptions']['configoption'],
-            customfields=whmcs_product['customfields']['customfield'],
-            description=whmcs_product['description'] or None,
-            group_id=int(whmcs_product['gid']),
-            module=whmcs_product['module'],
-            name=whmcs_product['name'],
-            paytype=whmcs_product['paytype'],
-            pricing=whmcs_product['pricing'],
-            type=whmcs_product['type']
-        )
+        return Product(self, **parse_product(whmcs_product))
 
-        return product
-
-    def list(self, detailed=True, marker=None, limit=None, **kwargs) -> List[Product]:
+    def list(self, detailed=False, marker=None, limit=None, **kwargs) -> List[Product]:
         """
         List and filter products.
 
@@ -73,23 +75,6 @@ class ProductsBridge(base.BaseBridge):
             }.items() if value is not None
         }
 
-        response = self.client.send_request('getproducts', params)
-
-        matches = []
-        for whmcs_product in response['products']['product']:
-            product = Product(
-                self,
-                id=int(whmcs_product['pid']),
-                configoptions=whmcs_product['configoptions']['configoption'],
-                customfields=whmcs_product['customfields']['customfield'],
-                description=whmcs_product['description'] or None,
-                group_id=int(whmcs_product['gid']),
-                module=whmcs_product['module'],
-                name=whmcs_product['name'],
-                paytype=whmcs_product['paytype'],
-                pricing=whmcs_product['pricing'],
-                type=whmcs_product['type']
-            )
-            matches.append(product)
-
-        return matches
+        records = self.client.stream_request('getproducts', params, path='products.product')
+
+        return [Product(self, **parse_product(whmcs_product)) for whmcs_product in records]
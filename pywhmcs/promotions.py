@@ -1,8 +1,12 @@
-from typing import List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 import dataclasses
 import datetime
+import threading
+import time
 
 from pywhmcs import base
+from pywhmcs import exceptions
+from pywhmcs import schema
 
 
 @dataclasses.dataclass
@@ -12,8 +16,8 @@ class Promotion(base.BaseResource):
     applies_to: List[str]
     apply_once: bool
     cycles: Optional[str]
-    date_expiration: datetime.datetime
-    date_start: datetime.datetime
+    date_expiration: Optional[datetime.date]
+    date_start: Optional[datetime.date]
     existing_client: bool
     lifetime_promo: bool
     max_uses: int
@@ -22,7 +26,7 @@ class Promotion(base.BaseResource):
     once_per_client: bool
     recur_for: int
     recurring: bool
-    requires: List[int]
+    requires: List[str]
     requires_existing: bool
     type: str
     upgrade_config: str
@@ -31,6 +35,33 @@ class Promotion(base.BaseResource):
     value: float
 
 
+#: Converts a ``GetPromotions`` record into :class:`Promotion` field values
+parse_promotion = schema.compile_parser('parse_promotion', {
+    'id': schema.Field('id', int),
+    'code': 'code',
+    'applies_to': schema.Field('appliesto', schema.split),
+    'apply_once': schema.Field('applyonce', schema.flag),
+    'cycles': schema.Field('cycles', schema.symbol),
+    'date_expiration': schema.Field('expirationdate', schema.date, default=None),
+    'date_start': schema.Field('startdate', schema.date, default=None),
+    'existing_client': schema.Field('existingclient', schema.flag),
+    'lifetime_promo': schema.Field('lifetimepromo', schema.flag),
+    'max_uses': schema.Field('maxuses', int),
+    'new_signups': schema.Field('newsignups', schema.flag),
+    'notes': 'notes',
+    'once_per_client': schema.Field('onceperclient', schema.flag),
+    'recur_for': schema.Field('recurfor', int),
+    'recurring': schema.Field('recurring', schema.flag),
+    'requires': schema.Field('requires', schema.split),
+    'requires_existing': schema.Field('requiresexisting', schema.flag),
+    'type': schema.Field('type', schema.symbol),
+    'upgrade_config': 'upgradeconfig',
+    'upgrades': schema.Field('upgrades', schema.flag),
+    'uses': schema.Field('uses', int),
+    'value': schema.Field('value', float),
+}, __name__)
+
+
 class PromotionsBridge(base.BaseBridge):
 
     def get(self, resource: str) -> Promotion:
@@ -40,6 +71,7 @@ class PromotionsBridge(base.BaseBridge):
         :param int resource: Promotion code to retrieve
         :return: Promotion
         :rtype: :class:`Promotion`
+        :raises: :class:`pywhmcs.exceptions.PromotionNotFound`
         """
 
         response = self.client.send_request(
@@ -47,73 +79,296 @@ class PromotionsBridge(base.BaseBridge):
             params={'code': resource}
         )
 
-        whmcs_promotion = response['promotions']['promotion'][0]
+        if not response.get('numreturned') or not response.get('promotions'):
+            raise exceptions.PromotionNotFound
 
-        promotion = Promotion(
-            self,
-            id=int(whmcs_promotion['id']),
-            code=whmcs_promotion['code'],
-            applies_to=whmcs_promotion['appliesto'].split(','),
-            apply_once=bool(whmcs_promotion['applyonce']),
-            cycles=whmcs_promotion['cycles'],
-            date_expiration=None,
-            date_start=None,
-            existing_client=bool(whmcs_promotion['existingclient']),
-            lifetime_promo=bool(whmcs_promotion['lifetimepromo']),
-            max_uses=int(whmcs_promotion['maxuses']),
-            new_signups=bool(whmcs_promotion['newsignups']),
-            notes=whmcs_promotion['notes'],
-            once_per_client=bool(whmcs_promotion['onceperclient']),
-            recur_for=int(whmcs_promotion['recurfor']),
-            recurring=bool(whmcs_promotion['recurring']),
-            requires=whmcs_promotion['requires'].split(','),
-            requires_existing=bool(whmcs_promotion['requiresexisting']),
-            type=whmcs_promotion['type'],
-            upgrade_config=whmcs_promotion['upgradeconfig'],
-            upgrades=bool(whmcs_promotion['upgrades']),
-            uses=int(whmcs_promotion['uses']),
-            value=float(whmcs_promotion['value']),
-        )
+        whmcs_promotion = response['promotions']['promotion'][0]
 
-        return promotion
+        return Promotion(self, **parse_promotion(whmcs_promotion))
 
-    def list(self, detailed=True, marker=None, limit=None, **filters) -> List[Union[Promotion, str]]:
+    def list(self, detailed=False, marker=None, limit=None, **filters) -> List[Union[Promotion, str]]:
         """
         List promotions.
 
-        :return: List ofromotion
+        ``GetPromotions`` does not paginate, so ``marker`` and ``limit`` are
+        applied to the returned promotions.
+
+        :param int marker: Offset index for promotion list
+        :param int limit: Number of promotions to return in list
+        :param str code: Promotion code to filter by
+        :return: List of promotions
         :rtype: List[:class:`Promotion`]
         """
 
-        response = self.client.send_request('getpromotions', params=dict())
-
-        matches = []
-        for whmcs_promotion in response['promotions']['promotion']:
-            promotion = Promotion(
-                self,
-                id=int(whmcs_promotion['id']),
-                code=whmcs_promotion['code'],
-                applies_to=whmcs_promotion['appliesto'].split(','),
-                apply_once=bool(whmcs_promotion['applyonce']),
-                cycles=whmcs_promotion['cycles'],
-                date_expiration=None,
-                date_start=None,
-                existing_client=bool(whmcs_promotion['existingclient']),
-                lifetime_promo=bool(whmcs_promotion['lifetimepromo']),
-                max_uses=int(whmcs_promotion['maxuses']),
-                new_signups=bool(whmcs_promotion['newsignups']),
-                notes=whmcs_promotion['notes'],
-                once_per_client=bool(whmcs_promotion['onceperclient']),
-                recur_for=int(whmcs_promotion['recurfor']),
-                recurring=bool(whmcs_promotion['recurring']),
-                requires=whmcs_promotion['requires'].split(','),
-                requires_existing=bool(whmcs_promotion['requiresexisting']),
-                type=whmcs_promotion['type'],
-                upgrade_config=whmcs_promotion['upgradeconfig'],
-                upgrades=bool(whmcs_promotion['upgrades']),
-                uses=int(whmcs_promotion['uses']),
-                value=float(whmcs_promotion['value']),
-            )
-            matches.append(promotion)
-
-        return matches
+        params = {
+            key: value for (key, value)
+            in {
+                'code': filters.get('code')
+            }.items() if value is not None
+        }
+
+        response = self.client.send_request('getpromotions', params=params)
+
+        if not response.get('numreturned') or not response.get('promotions'):
+            return []
+
+        whmcs_promotions = response['promotions']['promotion']
+
+        start = marker or 0
+        end = start + limit if limit is not None else None
+
+        return [
+            Promotion(self, **parse_promotion(whmcs_promotion))
+            for whmcs_promotion in whmcs_promotions[start:end]
+        ]
+
+    def index(self, max_age: Optional[float] = None) -> 'PromotionIndex':
+        """
+        Build an in-memory :class:`PromotionIndex` of all promotions.
+
+        :param float max_age: Seconds after which the index refreshes itself
+            on the next lookup. ``None`` disables automatic refreshing.
+        :return: Populated promotion index
+        :rtype: :class:`PromotionIndex`
+        """
+
+        index = PromotionIndex(self, max_age=max_age)
+        index.refresh()
+
+        return index
+
+
+class PromotionIndex:
+    """
+    In-memory store of promotions indexed by code, by the products they apply
+    to and by the products they require.
+
+    Promo codes can be validated against the index without a round trip to
+    WHMCS. Call :meth:`refresh` (or pass ``max_age``) to pick up changes made
+    on the server. WHMCS cannot list only the promotions changed since a
+    given time, so a refresh fetches the whole list, but only promotions
+    whose records changed are parsed and re-indexed. Lookups are safe while
+    another thread refreshes. Once ``max_age`` has passed, one lookup
+    refreshes the index while concurrent lookups keep using the current
+    entries.
+    """
+
+    def __init__(self, bridge: PromotionsBridge, max_age: Optional[float] = None):
+        self.bridge = bridge
+        self.max_age = max_age
+        self.refreshed_at: Optional[float] = None
+
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._by_id: Dict[int, Promotion] = {}
+        self._by_code: Dict[str, Promotion] = {}
+        self._by_product: Dict[str, Dict[int, Promotion]] = {}
+        self._by_requires: Dict[str, Dict[int, Promotion]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, code: str) -> bool:
+        return self.get(code) is not None
+
+    def refresh(self) -> None:
+        """
+        Re-fetch promotions and update the index entries that changed.
+        """
+
+        with self._refresh_lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        response = self.bridge.client.send_request('getpromotions', params={})
+        if response.get('numreturned') and response.get('promotions'):
+            records = {int(record['id']): record for record in response['promotions']['promotion']}
+        else:
+            records = {}
+
+        with self._lock:
+            for promotion_id in set(self._by_id) - set(records):
+                self._remove(self._by_id[promotion_id])
+
+            for (promotion_id, record) in records.items():
+                if self._records.get(promotion_id) == record:
+                    continue
+                current = self._by_id.get(promotion_id)
+                if current is not None:
+                    self._remove(current)
+                self._add(Promotion(self.bridge, **parse_promotion(record)))
+                self._records[promotion_id] = record
+
+            self.refreshed_at = time.monotonic()
+
+    def refresh_code(self, code: str) -> Optional[Promotion]:
+        """
+        Re-fetch a single promotion by code and update its index entry.
+
+        :param str code: Promotion code to refresh
+        :return: Refreshed promotion, or ``None`` if it no longer exists
+        :rtype: :class:`Promotion`
+        """
+
+        try:
+            promotion = self.bridge.get(code)
+        except exceptions.PromotionNotFound:
+            promotion = None
+
+        with self._lock:
+            current = self._by_code.get(code.lower())
+            if current is not None:
+                self._remove(current)
+            if promotion is not None:
+                self._add(promotion)
+                # Compared against the record on the next full refresh
+                self._records.pop(promotion.id, None)
+
+        return promotion
+
+    def get(self, code: str) -> Optional[Promotion]:
+        """
+        Look up a promotion by code (case-insensitive).
+
+        :param str code: Promotion code
+        :return: Promotion, or ``None`` if not indexed
+        :rtype: :class:`Promotion`
+        """
+
+        self._refresh_if_stale()
+
+        with self._lock:
+            return self._by_code.get(code.lower())
+
+    def applying_to(self, product_id: Union[int, str]) -> List[Promotion]:
+        """
+        Promotions whose ``applies_to`` contains the given product.
+        """
+
+        self._refresh_if_stale()
+
+        with self._lock:
+            return list(self._by_product.get(str(product_id), {}).values())
+
+    def requiring(self, product_id: Union[int, str]) -> List[Promotion]:
+        """
+        Promotions whose ``requires`` contains the given product.
+        """
+
+        self._refresh_if_stale()
+
+        with self._lock:
+            return list(self._by_requires.get(str(product_id), {}).values())
+
+    def validate(self,
+                 code: str,
+                 product_id: Optional[Union[int, str]] = None,
+                 cart_product_ids: Optional[Iterable[Union[int, str]]] = None,
+                 new_signup: bool = False,
+                 client_has_used: bool = False,
+                 today: Optional[datetime.date] = None) -> Promotion:
+        """
+        Validate a promo code locally.
+
+        :param str code: Promotion code to validate
+        :param product_id: Product the code is being applied to
+        :param cart_product_ids: Products in the cart, checked against the
+            promotion's ``requires``
+        :param bool new_signup: Pass ``True`` if the order is a new signup
+        :param bool client_has_used: Pass ``True`` if the client has already
+            used this promotion
+        :param today: Date to check expiry against (defaults to today)
+        :return: Matching promotion
+        :rtype: :class:`Promotion`
+        :raises: :class:`pywhmcs.exceptions.PromotionNotFound`
+        :raises: :class:`pywhmcs.exceptions.PromotionInvalid`
+        """
+
+        promotion = self.get(code)
+
+        if promotion is None:
+            raise exceptions.PromotionNotFound
+
+        today = today or datetime.date.today()
+
+        if promotion.date_start and today < promotion.date_start:
+            raise exceptions.PromotionInvalid('Promotion has not started')
+
+        if promotion.date_expiration and today > promotion.date_expiration:
+            raise exceptions.PromotionInvalid('Promotion has expired')
+
+        if promotion.max_uses and promotion.uses >= promotion.max_uses:
+            raise exceptions.PromotionInvalid('Promotion has reached its maximum uses')
+
+        if promotion.once_per_client and client_has_used:
+            raise exceptions.PromotionInvalid('Promotion may only be used once per client')
+
+        if promotion.new_signups and not new_signup:
+            raise exceptions.PromotionInvalid('Promotion is only valid for new signups')
+
+        if (product_id is not None and promotion.applies_to
+                and str(product_id) not in promotion.applies_to):
+            raise exceptions.PromotionInvalid('Promotion does not apply to product')
+
+        if promotion.requires:
+            cart = {str(item) for item in cart_product_ids or ()}
+            if not cart.intersection(promotion.requires):
+                raise exceptions.PromotionInvalid('Promotion requires another product')
+
+        return promotion
+
+    def is_valid(self, code: str, **kwargs) -> bool:
+        """
+        Return whether :meth:`validate` accepts the promo code.
+        """
+
+        try:
+            self.validate(code, **kwargs)
+        except (exceptions.PromotionNotFound, exceptions.PromotionInvalid):
+            return False
+
+        return True
+
+    def _stale(self) -> bool:
+        return (self.refreshed_at is None
+                or time.monotonic() - self.refreshed_at >= self.max_age)
+
+    def _refresh_if_stale(self) -> None:
+        if self.max_age is None or not self._stale():
+            return
+
+        if self.refreshed_at is None:
+            self._refresh_lock.acquire()
+        elif not self._refresh_lock.acquire(blocking=False):
+            # Another lookup is refreshing; use the current entries meanwhile
+            return
+
+        try:
+            if self._stale():
+                self._refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def _add(self, promotion: Promotion) -> None:
+        self._by_id[promotion.id] = promotion
+        self._by_code[promotion.code.lower()] = promotion
+
+        for product_id in promotion.applies_to:
+            self._by_product.setdefault(product_id, {})[promotion.id] = promotion
+
+        for product_id in promotion.requires:
+            self._by_requires.setdefault(product_id, {})[promotion.id] = promotion
+
+    def _remove(self, promotion: Promotion) -> None:
+        self._records.pop(promotion.id, None)
+        self._by_id.pop(promotion.id, None)
+        self._by_code.pop(promotion.code.lower(), None)
+
+        for (index, keys) in ((self._by_product, promotion.applies_to),
+                              (self._by_requires, promotion.requires)):
+            for key in keys:
+                entries = index.get(key, {})
+                entries.pop(promotion.id, None)
+                if not entries:
+                    index.pop(key, None)
@@ -0,0 +1,165 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+import contextvars
+import heapq
+import itertools
+import threading
+
+from pywhmcs import limiter as concurrency_limiter
+
+INTERACTIVE = 'interactive'
+DEFAULT = 'default'
+BATCH = 'batch'
+
+#: Default share of request slots per priority class
+WEIGHTS = {INTERACTIVE: 8, DEFAULT: 4, BATCH: 1}
+
+#: Actions made on behalf of a waiting user
+INTERACTIVE_ACTIONS = frozenset({
+    'createssotoken',
+    'getclientsdetails',
+    'validatelogin',
+})
+
+#: Actions typically run by background jobs
+BATCH_ACTIONS = frozenset({
+    'capturepayment',
+    'geninvoices',
+    'modulechangepackage',
+    'modulecreate',
+    'modulesuspend',
+    'moduleterminate',
+    'moduleunsuspend',
+})
+
+#: Priority set with :meth:`pywhmcs.client.Client.priority`
+current_priority: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    'whmcs_priority',
+    default=None
+)
+
+
+def classify(action: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Default priority of a request: ``interactive`` for
+    :data:`INTERACTIVE_ACTIONS`, ``batch`` for :data:`BATCH_ACTIONS` and
+    for pages after the first of paginated listings, ``default`` otherwise.
+    """
+
+    action = action.lower()
+
+    if action in INTERACTIVE_ACTIONS:
+        return INTERACTIVE
+
+    if action in BATCH_ACTIONS or (params and params.get('limitstart')):
+        return BATCH
+
+    return DEFAULT
+
+
+class PriorityScheduler:
+    """
+    Share request slots between priority classes with weighted fair queuing.
+
+    At most ``max_concurrency`` requests (or, with a ``limiter``, its current
+    limit) run at once. When requests wait, slots are handed out in order
+    of each request's virtual finish time, so under contention a class with
+    weight 8 gets eight slots for every one given to a class with weight 1,
+    and a class with nothing queued gives its share to the others. Batch
+    work therefore runs at full speed when the portal is idle, and queues
+    behind interactive calls when it is not.
+
+    A request's class is the one set with
+    :meth:`pywhmcs.client.Client.priority`, or else ``classify(action,
+    params)``.
+
+    :param int max_concurrency: Requests run at once without a ``limiter``
+    :param dict weights: Weight of each priority class, see :data:`WEIGHTS`
+    :param limiter: Adaptive limiter setting the number of requests run at
+        once. Pass the client's limiter so queued requests are ordered here
+        rather than in the limiter.
+    :param classify: Callable returning the class of ``(action, params)``
+    """
+
+    def __init__(self,
+                 max_concurrency: int = 8,
+                 weights: Optional[Mapping[str, float]] = None,
+                 limiter: Optional[concurrency_limiter.AdaptiveLimiter] = None,
+                 classify: Callable[[str, Optional[Mapping[str, Any]]], str] = classify):  # pylint: disable=redefined-outer-name
+        self.max_concurrency = max_concurrency
+        self.weights = dict(WEIGHTS if weights is None else weights)
+        self.limiter = limiter
+        self.classify = classify
+
+        self._in_flight = 0
+        self._virtual_time = 0.0
+        self._finish: Dict[str, float] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    @property
+    def capacity(self) -> int:
+        return self.limiter.limit if self.limiter is not None else self.max_concurrency
+
+    @property
+    def queued(self) -> Dict[str, int]:
+        """
+        Number of waiting requests per priority class.
+        """
+
+        with self._condition:
+            counts: Dict[str, int] = {}
+            for (_, _, priority) in self._queue:
+                counts[priority] = counts.get(priority, 0) + 1
+            return counts
+
+    def priority(self, action: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        return current_priority.get() or self.classify(action, params)
+
+    def acquire(self, priority: str) -> None:
+        """
+        Wait for a request slot.
+
+        :param str priority: Priority class of the request
+        """
+
+        if priority not in self.weights:
+            raise ValueError(f'Unknown priority class {priority!r}')
+
+        with self._condition:
+            if not self._queue and self._in_flight < self.capacity:
+                self._in_flight += 1
+                return
+
+            finish = max(self._virtual_time, self._finish.get(priority, 0.0)) + 1 / self.weights[priority]
+            self._finish[priority] = finish
+
+            entry = (finish, next(self._sequence), priority)
+            heapq.heappush(self._queue, entry)
+
+            try:
+                self._condition.wait_for(
+                    lambda: self._queue[0] is entry and self._in_flight < self.capacity
+                )
+            except BaseException:
+                # Interrupted, e.g. by KeyboardInterrupt: leave the line
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._condition.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            self._virtual_time = finish
+            self._in_flight += 1
+
+            # The next request in line may fit as well
+            self._condition.notify_all()
+
+    def release(self) -> None:
+        """
+        Free a request slot.
+        """
+
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
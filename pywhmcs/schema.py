@@ -0,0 +1,284 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import datetime as _datetime
+import functools
+import itertools
+import sys
+
+#: Marks a :class:`Field` whose key must be present
+REQUIRED = object()
+
+
+def lower(value: str) -> str:
+    """
+    Lower-case and intern an enum-like value, e.g. ``Unpaid``.
+    """
+
+    return sys.intern(value.lower())
+
+
+def symbol(value: Any) -> Any:
+    """
+    Intern an enum-like value, e.g. a payment method or country code.
+    Values other than strings are returned unchanged.
+
+    Fields such as ``status`` and ``payment_method`` take a handful of
+    values across any number of records. Interning them keeps one copy of
+    each value in memory and makes comparing them an identity check.
+    """
+
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def integer(value: Any) -> int:
+    """
+    Convert to int, treating empty values as ``0``.
+    """
+
+    return int(value or 0)
+
+
+def number(value: Any) -> float:
+    """
+    Convert to float, treating empty values as ``0.0``.
+    """
+
+    return float(value or 0.0)
+
+
+def flag(value: Any) -> bool:
+    """
+    Convert a WHMCS ``0``/``1`` flag to a bool.
+    """
+
+    return bool(int(value))
+
+
+def split(value: Optional[str]) -> List[str]:
+    """
+    Convert a comma separated list to a list, dropping empty items.
+    """
+
+    return [item for item in (value or '').split(',') if item]
+
+
+#: Number of distinct dates and timestamps kept by :func:`date` and
+#: :func:`timestamp`. Values repeat heavily within a page (invoices issued on
+#: the same day, tickets opened by the same cron run), so parsing each once
+#: saves most of the work.
+CACHE_SIZE = 4096
+
+_timezone: Optional[_datetime.tzinfo] = None
+
+
+def set_timezone(timezone: Optional[_datetime.tzinfo]) -> None:
+    """
+    Attach ``timezone`` to timestamps parsed from now on.
+
+    WHMCS returns timestamps in the server's local time without an offset,
+    so by default they are parsed as naive datetimes. Pass the WHMCS
+    server's timezone (e.g. ``zoneinfo.ZoneInfo('Europe/London')``) to get
+    aware datetimes instead, or ``None`` to go back to naive ones. This is a
+    process-wide setting; set it before creating a
+    :class:`~pywhmcs.parsing.ProcessParser` so its workers use it too.
+    """
+
+    global _timezone  # pylint: disable=global-statement
+    _timezone = timezone
+
+
+def get_timezone() -> Optional[_datetime.tzinfo]:
+    return _timezone
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_date(value: str) -> _datetime.date:
+    return _datetime.date.fromisoformat(value[:10])
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_timestamp(value: str, timezone: Optional[_datetime.tzinfo]) -> _datetime.datetime:
+    parsed = _datetime.datetime.fromisoformat(value)
+
+    return parsed if timezone is None else parsed.replace(tzinfo=timezone)
+
+
+def date(value: Optional[str]) -> Optional[_datetime.date]:
+    """
+    Convert a ``YYYY-MM-DD`` date (or the date part of a ``YYYY-MM-DD
+    HH:MM:SS`` timestamp) to a date. Empty values and WHMCS's
+    ``0000-00-00`` placeholder become ``None``.
+    """
+
+    if not value or value.startswith('0000-00-00'):
+        return None
+
+    return _parse_date(value)
+
+
+def timestamp(value: Optional[str]) -> Optional[_datetime.datetime]:
+    """
+    Convert a ``YYYY-MM-DD HH:MM:SS`` timestamp to a datetime, in the
+    timezone set with :func:`set_timezone` if any. Empty values and WHMCS's
+    ``0000-00-00 00:00:00`` placeholder become ``None``.
+    """
+
+    if not value or value.startswith('0000-00-00'):
+        return None
+
+    return _parse_timestamp(value, _timezone)
+
+
+# Converters simple enough to be inlined into generated parsers
+_INLINE = {
+    int: 'int({})',
+    float: 'float({})',
+    str: 'str({})',
+    lower: '_intern({}.lower())',
+    integer: 'int({} or 0)',
+    number: 'float({} or 0.0)',
+    flag: 'bool(int({}))',
+}
+
+# Converters whose results are interned
+_INTERNED = (lower, symbol)
+
+# Defaults that can be written into generated parsers as literals; mutable
+# ones are then created afresh for every record
+_LITERALS = (type(None), bool, int, float, str)
+
+
+class Field:
+    """
+    Declares how one resource field is read from a WHMCS record.
+
+    :param str key: Record key. Use dots for nested keys, e.g.
+        ``items.item``; a missing or empty level counts as a missing key.
+    :param convert: Callable applied to the value, e.g. ``int`` or
+        :func:`date`. It is applied to ``default`` too, so the default must
+        be something it accepts.
+    :param default: Value used when ``key`` is missing. Without one, a
+        missing key raises :class:`KeyError`.
+    :param bool empty_none: Replace falsy (converted) values with ``None``
+    :param aliases: Other keys the value may be found under, tried in turn
+        if ``key`` is missing, e.g. ``invoiceid`` in ``GetInvoice``
+        responses
+    """
+
+    def __init__(self,
+                 key: str,
+                 convert: Optional[Callable[[Any], Any]] = None,
+                 default: Any = REQUIRED,
+                 empty_none: bool = False,
+                 aliases: Sequence[str] = ()):
+        self.key = key
+        self.convert = convert
+        self.default = default
+        self.empty_none = empty_none
+        self.aliases = tuple(aliases)
+
+
+def _dig(record: Mapping[str, Any], keys: Tuple[str, ...], default: Any) -> Any:
+    value: Any = record
+    for key in keys:
+        if not value or not isinstance(value, Mapping) or key not in value:
+            if default is REQUIRED:
+                raise KeyError('.'.join(keys))
+            return default
+        value = value[key]
+
+    return value
+
+
+def compile_parser(name: str,
+                   fields: Mapping[str, Union[Field, str]],
+                   module: Optional[str] = None) -> Callable[[Mapping[str, Any]], Dict[str, Any]]:
+    """
+    Generate a function converting a WHMCS record into resource field values.
+
+    The function is generated from ``fields`` once, as straight-line code
+    with simple conversions (``int``, ``float``, :func:`flag`,
+    :func:`lower`...) inlined, so parsing a record costs about as much as
+    hand-written code. Pass the defining module's ``__name__`` as ``module``
+    and assign the result to a module-level variable called ``name`` so the
+    parser can be pickled, e.g. for :class:`~pywhmcs.parsing.ProcessParser`::
+
+        parse_product = compile_parser('parse_product', {
+            'id': Field('pid', int),
+            'name': 'name',
+        }, __name__)
+
+    :param str name: Function name
+    :param fields: Resource field names mapped to a :class:`Field`, or to a
+        record key to copy the value of unchanged
+    :param str module: Module the function is attributed to
+    :return: Parser
+    """
+
+    namespace: Dict[str, Any] = {'_dig': _dig, '_intern': sys.intern}
+    counter = itertools.count()
+    lines = []
+    interned = []
+
+    def constant(value: Any) -> str:
+        if type(value) in _LITERALS or value in ([], {}):  # pylint: disable=unidiomatic-typecheck
+            return repr(value)
+
+        symbol = f'_k{next(counter)}'
+        namespace[symbol] = value
+        return symbol
+
+    for (field_name, field) in fields.items():
+        if isinstance(field, str):
+            field = Field(field)
+
+        if '.' in field.key:
+            keys = tuple(field.key.split('.'))
+            value = f'_dig(record, {keys!r}, {constant(field.default)})'
+        elif field.default is REQUIRED:
+            keys = (field.key,) + field.aliases
+            value = f'record[{keys[-1]!r}]'
+            for key in reversed(keys[:-1]):
+                value = f'(record[{key!r}] if {key!r} in record else {value})'
+        else:
+            value = constant(field.default)
+            for key in reversed((field.key,) + field.aliases):
+                value = f'record.get({key!r}, {value})'
+
+        if field.convert in _INTERNED:
+            interned.append(field_name)
+
+        if field.convert is not None:
+            template = _INLINE.get(field.convert)
+            if template is None:
+                template = constant(field.convert) + '({})'
+            value = template.format(value)
+
+        if field.empty_none:
+            value = f'({value} or None)'
+
+        lines.append(f'        {field_name!r}: {value},')
+
+    source = '\n'.join([f'def {name}(record):', '    return {', *lines, '    }'])
+    exec(compile(source, f'<{name}>', 'exec'), namespace)  # pylint: disable=exec-used
+
+    parser = namespace[name]
+    parser.__module__ = module or __name__
+    parser.__qualname__ = name
+    parser.__source__ = source
+    parser.__interned__ = frozenset(interned)
+
+    return parser
+
+
+def intern_row(row: Sequence[Any], indexes: Sequence[int]) -> Tuple[Any, ...]:
+    """
+    Intern the strings at ``indexes`` of a row of field values, e.g. after
+    it was unpickled from a worker process.
+    """
+
+    values = list(row)
+    for index in indexes:
+        if isinstance(values[index], str):
+            values[index] = sys.intern(values[index])
+
+    return tuple(values)
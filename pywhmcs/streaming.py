@@ -0,0 +1,78 @@
+from typing import IO, Any, Dict, Iterator, Optional
+import json
+
+SCALARS = frozenset({'string', 'number', 'boolean', 'null'})
+
+
+def iter_items(fp: IO[bytes],
+               path: str,
+               meta: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Yield the items of the array at ``path`` in a JSON document.
+
+    With ijson installed (``pip install python-whmcs[streaming]``) items are
+    yielded as the document is read, so neither the body nor the full parsed
+    document is held in memory. Without it the document is parsed in one go.
+
+    :param fp: Binary file object to read the document from
+    :param str path: Dotted path of the array, e.g. ``invoices.invoice``
+    :param dict meta: If given, filled with the document's other top-level
+        values (``result``, ``message``, ``totalresults``...)
+    """
+
+    if meta is None:
+        meta = {}
+
+    try:
+        import ijson  # pylint: disable=import-outside-toplevel
+        from ijson.common import ObjectBuilder  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        yield from _iter_loaded(json.load(fp), path, meta)
+        return
+
+    prefix = path + '.item'
+    top = path.split('.')[0]
+    builder = None
+    # Top-level value other than the array being built into ``meta``
+    meta_key = None
+    meta_builder = None
+
+    for (current, event, value) in ijson.parse(fp, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if current == prefix and event in ('end_map', 'end_array'):
+                yield builder.value
+                builder = None
+        elif current == prefix:
+            if event in ('start_map', 'start_array'):
+                builder = ObjectBuilder()
+                builder.event(event, value)
+            else:
+                yield value
+        elif meta_builder is not None:
+            meta_builder.event(event, value)
+            if current == meta_key and event in ('end_map', 'end_array'):
+                meta[meta_key] = meta_builder.value
+                meta_builder = None
+        elif current and '.' not in current and current != top:
+            if event in SCALARS:
+                meta[current] = value
+            elif event in ('start_map', 'start_array'):
+                meta_key = current
+                meta_builder = ObjectBuilder()
+                meta_builder.event(event, value)
+
+
+def _iter_loaded(document: Any, path: str, meta: Dict[str, Any]) -> Iterator[Any]:
+    if not isinstance(document, dict):
+        return
+
+    top = path.split('.')[0]
+    meta.update({key: value for (key, value) in document.items() if key != top})
+
+    node = document
+    for key in path.split('.'):
+        node = node.get(key) if isinstance(node, dict) else None
+
+    if isinstance(node, list):
+        yield from node
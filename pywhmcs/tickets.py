@@ -1,10 +1,12 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
 
+import collections.abc
 import dataclasses
 import datetime
 import string
 
 from pywhmcs import base
+from pywhmcs import schema
 
 
 @dataclasses.dataclass
@@ -15,7 +17,7 @@ class Ticket(base.BaseResource):
     client_id: int
     contact_id: Optional[int]
     date: datetime.datetime
-    date_last_reply: datetime.datetime
+    date_last_reply: Optional[datetime.datetime]
     dept_id: int
     dept_name: str
     email: str
@@ -24,12 +26,131 @@ class Ticket(base.BaseResource):
     notes: List[str]
     number: int
     priority: str
-    replies: List[Dict[str, str]]
+    replies: Sequence[Dict[str, str]]
     service_id: Optional[str]
     status: str
     subject: str
 
 
+@dataclasses.dataclass
+class TicketSummary(base.BaseResource):
+    id: int
+    admin: Optional[str]
+    cc_email: Optional[str]
+    client_id: int
+    date: datetime.datetime
+    date_last_reply: Optional[datetime.datetime]
+    dept_id: int
+    email: str
+    flag: Optional[int]
+    name: str
+    number: int
+    priority: str
+    service_id: Optional[str]
+    status: str
+    subject: str
+
+    def hydrate(self, replies: bool = True) -> Ticket:
+        return self.bridge.get(self.id, replies=replies)
+
+
+def _notes(value: Any) -> List[str]:
+    return value or []
+
+
+#: Converts a ``GetTicket`` response into :class:`Ticket` field values, other
+#: than ``replies``
+parse_ticket = schema.compile_parser('parse_ticket', {
+    'id': schema.Field('ticketid', int),
+    'admin': schema.Field('admin', empty_none=True),
+    'cc_email': schema.Field('cc', empty_none=True),
+    'client_id': schema.Field('userid', int),
+    'contact_id': schema.Field('contactid', int, empty_none=True),
+    'date': schema.Field('date', schema.timestamp),
+    'date_last_reply': schema.Field('lastreply', schema.timestamp, default=None),
+    'dept_id': schema.Field('deptid', int),
+    'dept_name': schema.Field('deptname', schema.symbol),
+    'email': 'email',
+    'flag': schema.Field('flag', int, empty_none=True),
+    'name': 'name',
+    'notes': schema.Field('notes', _notes),
+    'number': schema.Field('tid', int),
+    'priority': schema.Field('priority', schema.lower),
+    'service_id': schema.Field('service', empty_none=True),
+    'status': schema.Field('status', schema.lower),
+    'subject': 'subject',
+}, __name__)
+
+#: Converts a ``GetTickets`` record into :class:`TicketSummary` field values
+parse_ticket_summary = schema.compile_parser('parse_ticket_summary', {
+    'id': schema.Field('id', int),
+    'admin': schema.Field('admin', default=None, empty_none=True),
+    'cc_email': schema.Field('cc', default=None, empty_none=True),
+    'client_id': schema.Field('userid', int),
+    'date': schema.Field('date', schema.timestamp),
+    'date_last_reply': schema.Field('lastreply', schema.timestamp, default=None),
+    'dept_id': schema.Field('deptid', int),
+    'email': 'email',
+    'flag': schema.Field('flag', schema.integer, default=0, empty_none=True),
+    'name': 'name',
+    'number': schema.Field('tid', int),
+    'priority': schema.Field('priority', schema.lower),
+    'service_id': schema.Field('service', default=None, empty_none=True),
+    'status': schema.Field('status', schema.lower),
+    'subject': 'subject',
+}, __name__)
+
+
+class LazyReplies(collections.abc.Sequence):
+    """
+    Replies of a ticket fetched with ``replies=False``.
+
+    The number of replies is known up front. Iterating streams the replies
+    from WHMCS without keeping them; indexing loads and keeps them all.
+    """
+
+    def __init__(self, bridge: 'TicketBridge', ticket_id: int, count: Optional[int] = None):
+        self.bridge = bridge
+        self.ticket_id = ticket_id
+        self.count = count
+        self._replies: Optional[List[Dict[str, str]]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._replies is not None
+
+    def _load(self) -> List[Dict[str, str]]:
+        if self._replies is None:
+            self._replies = list(self.bridge.iter_replies(self.ticket_id))
+            self.count = len(self._replies)
+
+        return self._replies
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        if self._replies is not None:
+            return iter(self._replies)
+
+        return self.bridge.iter_replies(self.ticket_id)
+
+    def __getitem__(self, index):
+        return self._load()[index]
+
+    def __len__(self) -> int:
+        if self.count is None:
+            return len(self._load())
+
+        return self.count
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        if self._replies is None:
+            return f'<LazyReplies ticket_id={self.ticket_id} (not loaded)>'
+
+        return repr(self._replies)
+
+
 class TicketBridge(base.BaseBridge):
 
     def create(self,
@@ -113,54 +234,136 @@ class TicketBridge(base.BaseBridge):
 
         return ticket
 
-    def get(self, resource: int):
+    def get(self, resource: int, replies: bool = True):
         """
         Get a ticket.
 
         :param int resource: ID of ticket to retrieve
+        :param bool replies: Pass ``False`` to skip building the reply list;
+            ``ticket.replies`` is then streamed from WHMCS when iterated
         :return: Ticket
         :rtype: :class:`Ticket`
         """
 
-        response = self.client.send_request(
-            'getticket',
-            params={'ticketid': resource}
-        )
+        params = {'ticketid': resource}
 
-        if response['replies']:
-            replies = [reply for reply in response['replies']['reply']]
+        if replies:
+            response = self.client.send_request('getticket', params=params)
+            replies = response['replies']['reply'] if response['replies'] else []
         else:
-            replies = []
+            # ``GetTicket`` cannot leave the replies out, so stream the body
+            # and count them without keeping them
+            response = {}
+            count = sum(1 for _ in self.client.stream_request(
+                'getticket',
+                params=params,
+                path='replies.reply',
+                meta=response
+            ))
+            replies = LazyReplies(self, int(response['ticketid']), count)
 
-        if response['notes']:
-            notes = response['notes']
-        else:
-            notes = []
-
-        ticket = Ticket(
-            self,
-            id=int(response['ticketid']),
-            admin=response['admin'] or None,
-            cc_email=response['cc'] or None,
-            client_id=int(response['userid']),
-            contact_id=int(response['contactid']) or None,
-            date=datetime.datetime.strptime(response['date'], '%Y-%m-%d %H:%M:%S'),
-            date_last_reply=datetime.datetime.strptime(response['date'], '%Y-%m-%d %H:%M:%S'),
-            dept_id=int(response['deptid']),
-            dept_name=response['deptname'],
-            email=response['email'],
-            flag=int(response['flag']) or None,
-            name=response['name'],
-            notes=notes,
-            number=int(response['tid']),
-            priority=response['priority'].lower(),
-            replies=replies,
-            service_id=response['service'] or None,
-            status=response['status'].lower(),
-            subject=response['subject']
+        return Ticket(self, replies=replies, **parse_ticket(response))
+
+    def list(self, detailed=False, marker=None, limit=None, **filters) -> List[Union[Ticket, TicketSummary]]:
+        """
+        List and filter tickets via WHMCS API method ``GetTickets``.
+
+        :param bool detailed: Pass ``True`` to fetch every :class:`Ticket`
+            instead of returning summaries
+        :param int marker: Offset index for ticket list
+        :param int limit: Number of tickets to return in list
+        :param filters: Filters accepted by :meth:`iter`
+        :return: Tickets matching given criteria
+        :rtype: List[:class:`TicketSummary`]
+        """
+
+        return list(self.iter(detailed=detailed, marker=marker, limit=limit, **filters))
+
+    def iter(self,
+             dept_id: Optional[int] = None,
+             client_id: Optional[int] = None,
+             email: Optional[str] = None,
+             status: Optional[str] = None,
+             subject: Optional[str] = None,
+             page_size: int = 100,
+             marker: Optional[int] = None,
+             limit: Optional[int] = None,
+             detailed: bool = False,
+             replies: bool = True,
+             workers: Optional[int] = None) -> Iterator[Union[Ticket, TicketSummary]]:
+        """
+        Iterate over tickets, fetching ``page_size`` tickets per request.
+
+        :param int dept_id: Department ID to filter by
+        :param int client_id: Client ID to filter by
+        :param str email: Email address to filter by
+        :param str status: Status to filter by, e.g. ``Open`` or
+            ``Awaiting Reply``
+        :param str subject: Subject to filter by
+        :param int page_size: Number of tickets to request per page
+        :param int marker: Offset index of the first ticket
+        :param int limit: Maximum number of tickets to return
+        :param bool detailed: Pass ``True`` to fetch the full :class:`Ticket`
+            for every summary
+        :param bool replies: Passed to :meth:`get` when ``detailed``
+        :param int workers: Number of tickets to fetch concurrently when
+            ``detailed``, see :meth:`~pywhmcs.base.BaseBridge._hydrate`
+        :return: Tickets matching given criteria
+        :rtype: Iterator[:class:`TicketSummary`]
+        """
+
+        params = {
+            key: value for (key, value)
+            in {
+                'deptid': dept_id,
+                'clientid': client_id,
+                'email': email,
+                'status': status,
+                'subject': subject
+            }.items() if value is not None
+        }
+
+        records = self._paginate(
+            'gettickets',
+            params,
+            'tickets',
+            'ticket',
+            page_size=page_size,
+            marker=marker,
+            limit=limit
         )
+        summaries = (self._summary(record) for record in records)
 
-        return ticket
+        if not detailed:
+            yield from summaries
+            return
+
+        yield from self._hydrate(
+            lambda summary: summary.hydrate(replies=replies),
+            summaries,
+            workers=workers
+        )
+
+    def _summary(self, whmcs_ticket: Dict[str, Any]) -> TicketSummary:
+        return TicketSummary(self, **parse_ticket_summary(whmcs_ticket))
+
+    def iter_replies(self, resource: Union[int, Ticket]) -> Iterator[Dict[str, str]]:
+        """
+        Iterate over the replies of a ticket.
+
+        Replies are parsed from the response as it arrives, so only the
+        replies still held by the caller are kept in memory.
+
+        :param resource: Ticket (or its ID) to get replies of
+        :return: Replies of the ticket, oldest first
+        :rtype: Iterator[dict]
+        """
+
+        yield from self.client.stream_request(
+            'getticket',
+            params={'ticketid': base.getid(resource)},
+            path='replies.reply'
+        )
 
     def delete(self, resource: Union[int, Ticket]) -> None:
         """
@@ -0,0 +1,461 @@
+from typing import IO, Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+import gzip
+import io
+import json
+import threading
+import time
+import urllib.parse
+import zlib
+
+
+class Response:
+    """
+    Transport-neutral HTTP response handed back to :class:`pywhmcs.client.Client`.
+
+    ``content`` is the decoded (decompressed) body. ``wire_size`` is the
+    number of body bytes received on the wire and ``request_size`` the
+    number of body bytes sent, where the transport knows them.
+    """
+
+    def __init__(self,
+                 status_code: int,
+                 content: bytes,
+                 headers: Optional[Mapping[str, str]] = None,
+                 wire_size: Optional[int] = None,
+                 request_size: Optional[int] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = dict(headers or {})
+        self.wire_size = len(content) if wire_size is None else wire_size
+        self.request_size = request_size
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self) -> Any:
+        # Parsing bytes directly skips requests' charset detection and the
+        # intermediate str copy of the body
+        return json.loads(self.content)
+
+
+class ChunkReader(io.RawIOBase):
+    """
+    File object over an iterator of (possibly gzip or deflate compressed)
+    byte chunks, counting the compressed bytes in :attr:`wire_size` and the
+    decompressed bytes in :attr:`decoded_size`.
+
+    ``read(n)`` returns as soon as any data is available rather than
+    waiting for ``n`` bytes, so parsers see data as it arrives.
+    """
+
+    def __init__(self, chunks: Iterator[bytes], content_encoding: Optional[str] = None):
+        super().__init__()
+        self.wire_size = 0
+        self.decoded_size = 0
+        self._chunks = self._decode(chunks, (content_encoding or '').lower())
+        self._buffer = b''
+
+    def _decode(self, chunks: Iterator[bytes], content_encoding: str) -> Iterator[bytes]:
+        if content_encoding in ('gzip', 'x-gzip'):
+            decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif content_encoding == 'deflate':
+            decoder = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        else:
+            decoder = None
+
+        for chunk in chunks:
+            self.wire_size += len(chunk)
+            if decoder is not None:
+                chunk = decoder.decompress(chunk)
+            if chunk:
+                self.decoded_size += len(chunk)
+                yield chunk
+
+        if decoder is not None:
+            tail = decoder.flush()
+            if tail:
+                self.decoded_size += len(tail)
+                yield tail
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._buffer + b''.join(self._chunks)
+            self._buffer = b''
+            return data
+
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return b''
+
+        (data, self._buffer) = (self._buffer[:size], self._buffer[size:])
+
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+
+        return len(data)
+
+
+class StreamingResponse:
+    """
+    Response whose body is read incrementally from :attr:`fp`.
+
+    :attr:`wire_size` reports the bytes received so far.
+    """
+
+    def __init__(self,
+                 status_code: int,
+                 fp: IO[bytes],
+                 headers: Optional[Mapping[str, str]] = None,
+                 request_size: Optional[int] = None,
+                 tell: Optional[Callable[[], int]] = None,
+                 release: Optional[Callable[[], None]] = None):
+        self.status_code = status_code
+        self.fp = fp
+        self.headers = dict(headers or {})
+        self.request_size = request_size
+
+        self._tell = tell
+        self._release = release
+
+    @property
+    def wire_size(self) -> Optional[int]:
+        return self._tell() if self._tell else None
+
+    def read(self) -> Response:
+        """
+        Read the remaining body into a :class:`Response`.
+        """
+
+        content = self.fp.read()
+        self.close()
+
+        return Response(
+            self.status_code,
+            content,
+            self.headers,
+            wire_size=self.wire_size,
+            request_size=self.request_size
+        )
+
+    def close(self) -> None:
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+
+class Transport:
+    """
+    Base class for the HTTP layer :class:`pywhmcs.client.Client` sends
+    requests through.
+
+    :param int compress_over: Gzip request bodies larger than this many
+        bytes (``Content-Encoding: gzip``). Only enable this if the WHMCS web
+        server decompresses request bodies. ``None`` disables compression.
+    """
+
+    compress_over: Optional[int] = None
+
+    #: Maximum number of bytes read from the network at a time when streaming
+    chunk_size: int = 8192
+
+    def encode_body(self, data: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Form-encode ``data`` once, compressing it if it is large enough.
+
+        Fields are encoded as ``requests`` encodes them: ``None`` values are
+        left out and list values are sent as repeated fields.
+
+        :return: Request body and headers to send with it
+        """
+
+        body = urllib.parse.urlencode(
+            [(key, value) for (key, value) in data.items() if value is not None],
+            doseq=True
+        ).encode('ascii')
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+        if self.compress_over is not None and len(body) > self.compress_over:
+            body = gzip.compress(body, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+
+        return (body, headers)
+
+    def post(self, url: str, data: Dict[str, Any]) -> Response:
+        """
+        POST form-encoded ``data`` to ``url``.
+
+        :param str url: WHMCS API URL
+        :param dict data: Form fields, including ``action``
+        :return: Response
+        :rtype: :class:`Response`
+        """
+
+        raise NotImplementedError
+
+    def stream(self, url: str, data: Dict[str, Any]) -> StreamingResponse:
+        """
+        POST form-encoded ``data`` to ``url`` and return before the body is
+        read. Transports that cannot stream read the whole body first.
+
+        :param str url: WHMCS API URL
+        :param dict data: Form fields, including ``action``
+        :return: Response with a readable body
+        :rtype: :class:`StreamingResponse`
+        """
+
+        response = self.post(url, data)
+
+        return StreamingResponse(
+            response.status_code,
+            io.BytesIO(response.content),
+            response.headers,
+            request_size=response.request_size,
+            tell=lambda: response.wire_size
+        )
+
+    def close(self) -> None:
+        """Release any pooled connections."""
+
+
+class RequestsTransport(Transport):
+    """
+    Transport backed by a pooled :class:`requests.Session`. This is the
+    default.
+
+    :param float timeout: Request timeout in seconds
+    :param int pool_maxsize: Maximum connections kept per host
+    """
+
+    def __init__(self,
+                 timeout: Optional[float] = None,
+                 pool_maxsize: int = 10,
+                 compress_over: Optional[int] = None):
+        import requests  # pylint: disable=import-outside-toplevel
+
+        self.timeout = timeout
+        self.compress_over = compress_over
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def post(self, url: str, data: Dict[str, Any]) -> Response:
+        (body, headers) = self.encode_body(data)
+
+        response = self.session.post(url, data=body, headers=headers, timeout=self.timeout)
+        content = response.content
+
+        return Response(
+            response.status_code,
+            content,
+            response.headers,
+            wire_size=response.raw.tell() or len(content),
+            request_size=len(body)
+        )
+
+    def stream(self, url: str, data: Dict[str, Any]) -> StreamingResponse:
+        (body, headers) = self.encode_body(data)
+
+        response = self.session.post(url, data=body, headers=headers, timeout=self.timeout, stream=True)
+
+        reader = ChunkReader(
+            response.raw.stream(self.chunk_size, decode_content=False),
+            response.headers.get('Content-Encoding')
+        )
+
+        return StreamingResponse(
+            response.status_code,
+            reader,
+            response.headers,
+            request_size=len(body),
+            tell=lambda: reader.wire_size,
+            release=response.close
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport backed by a :class:`urllib3.PoolManager`, skipping the
+    overhead of ``requests``.
+
+    :param float timeout: Request timeout in seconds
+    :param int maxsize: Maximum connections kept per host
+    """
+
+    def __init__(self,
+                 timeout: Optional[float] = None,
+                 maxsize: int = 10,
+                 compress_over: Optional[int] = None):
+        import urllib3  # pylint: disable=import-outside-toplevel
+
+        self.timeout = timeout
+        self.compress_over = compress_over
+        self.pool = urllib3.PoolManager(
+            maxsize=maxsize,
+            headers={'Accept-Encoding': 'gzip, deflate'}
+        )
+
+    def post(self, url: str, data: Dict[str, Any]) -> Response:
+        (body, headers) = self.encode_body(data)
+        headers['Accept-Encoding'] = 'gzip, deflate'
+
+        response = self.pool.request(
+            'POST',
+            url,
+            body=body,
+            headers=headers,
+            timeout=self.timeout
+        )
+        content = response.data
+
+        return Response(
+            response.status,
+            content,
+            response.headers,
+            wire_size=response.tell() or len(content),
+            request_size=len(body)
+        )
+
+    def stream(self, url: str, data: Dict[str, Any]) -> StreamingResponse:
+        (body, headers) = self.encode_body(data)
+        headers['Accept-Encoding'] = 'gzip, deflate'
+
+        response = self.pool.request(
+            'POST',
+            url,
+            body=body,
+            headers=headers,
+            timeout=self.timeout,
+            preload_content=False
+        )
+
+        reader = ChunkReader(
+            response.stream(self.chunk_size, decode_content=False),
+            response.headers.get('Content-Encoding')
+        )
+
+        return StreamingResponse(
+            response.status,
+            reader,
+            response.headers,
+            request_size=len(body),
+            tell=lambda: reader.wire_size,
+            release=response.release_conn
+        )
+
+    def close(self) -> None:
+        self.pool.clear()
+
+
+class HTTPXTransport(Transport):
+    """
+    Transport backed by :class:`httpx.Client`, with optional HTTP/2.
+
+    Requires ``httpx`` (and ``h2`` for HTTP/2): ``pip install httpx[http2]``.
+
+    :param bool http2: Negotiate HTTP/2 where the server supports it
+    :param float timeout: Request timeout in seconds
+    """
+
+    def __init__(self,
+                 http2: bool = True,
+                 timeout: Optional[float] = None,
+                 compress_over: Optional[int] = None):
+        import httpx  # pylint: disable=import-outside-toplevel
+
+        self.compress_over = compress_over
+        self.client = httpx.Client(http2=http2, timeout=timeout)
+
+    def post(self, url: str, data: Dict[str, Any]) -> Response:
+        (body, headers) = self.encode_body(data)
+
+        response = self.client.post(url, content=body, headers=headers)
+
+        return Response(
+            response.status_code,
+            response.content,
+            response.headers,
+            wire_size=response.num_bytes_downloaded,
+            request_size=len(body)
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+
+FakeReply = Union[Dict[str, Any], Response, Callable[[Dict[str, Any]], Union[Dict[str, Any], Response]]]
+
+
+class FakeTransport(Transport):
+    """
+    In-memory transport serving canned WHMCS responses by action, for tests
+    and load tests without a network.
+
+    ``responses`` maps an action to a response body, a :class:`Response`, a
+    callable taking the request form data, or a list of those served in turn
+    (the last one repeats). Actions without a response get WHMCS's
+    "Command Not Found" error.
+
+    :param dict responses: Responses keyed by action
+    :param float latency: Seconds to sleep before each response
+    """
+
+    def __init__(self,
+                 responses: Optional[Dict[str, Union[FakeReply, List[FakeReply]]]] = None,
+                 latency: float = 0.0):
+        self.responses: Dict[str, Union[FakeReply, List[FakeReply]]] = dict(responses or {})
+        self.latency = latency
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+
+        self._lock = threading.Lock()
+
+    def add(self, action: str, reply: FakeReply) -> None:
+        """
+        Queue a response for ``action``.
+        """
+
+        with self._lock:
+            current = self.responses.get(action)
+            if current is None:
+                self.responses[action] = [reply]
+            elif isinstance(current, list):
+                current.append(reply)
+            else:
+                self.responses[action] = [current, reply]
+
+    def post(self, url: str, data: Dict[str, Any]) -> Response:
+        action = data['action']
+
+        with self._lock:
+            self.requests.append((action, dict(data)))
+
+            reply = self.responses.get(action)
+            if isinstance(reply, list):
+                reply = reply.pop(0) if len(reply) > 1 else reply[0]
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if reply is None:
+            reply = {'result': 'error', 'message': 'Command Not Found'}
+        elif callable(reply):
+            reply = reply(data)
+
+        if isinstance(reply, Response):
+            return reply
+
+        return Response(200, json.dumps(reply).encode('utf-8'), {'Content-Type': 'application/json'})
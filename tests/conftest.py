@@ -8,6 +8,7 @@ import pytest
 
 from pywhmcs import client
 from pywhmcs import clients
+from pywhmcs import transports
 
 
 @pytest.fixture(scope='session')
@@ -32,6 +33,18 @@ def whmcs_client(config):
     )
 
 
+@pytest.fixture
+def fake_client():
+    transport = transports.FakeTransport()
+
+    return client.Client(
+        'https://whmcs.example.com/includes/api.php',
+        username='api',
+        password='secret',
+        transport=transport
+    )
+
+
 @pytest.fixture(scope='class')
 def client_stub(whmcs_client):
     stub = {
@@ -0,0 +1,77 @@
+import pytest
+
+from pywhmcs import aggregation
+from pywhmcs import client
+from pywhmcs import transports
+
+
+def get_invoices(data):
+    start = int(data['limitstart'])
+    stop = min(start + int(data['limitnum']), 30)
+
+    return {
+        'result': 'success',
+        'totalresults': 30,
+        'startnumber': start,
+        'numreturned': stop - start,
+        'invoices': {'invoice': [
+            {
+                'id': str(i),
+                'userid': str(i % 3 + 1),
+                'invoicenum': '',
+                'date': f'2020-0{i % 2 + 1}-10',
+                'duedate': '2020-03-01',
+                'datepaid': '0000-00-00 00:00:00',
+                'subtotal': '10.00',
+                'credit': '0.00',
+                'tax': '1.50',
+                'tax2': '0.00',
+                'taxrate': '15.00',
+                'taxrate2': '0.00',
+                'total': '11.50',
+                'balance': '11.50',
+                'status': 'Unpaid',
+                'paymentmethod': 'paypal' if i % 2 else 'banktransfer',
+                'notes': '',
+            }
+            for i in range(start + 1, stop + 1)
+        ]},
+    }
+
+
+@pytest.fixture
+def whmcs():
+    return client.Client(
+        'https://whmcs.example.com/includes/api.php',
+        username='api',
+        password='secret',
+        transport=transports.FakeTransport({'getinvoices': get_invoices})
+    )
+
+
+class TestAggregation:
+
+    @pytest.mark.parametrize('workers', [None, 3])
+    def test_aggregate(self, whmcs, workers):
+        results = aggregation.aggregate(
+            whmcs.invoices,
+            'client_id',
+            ('balance', 'tax'),
+            page_size=7,
+            workers=workers
+        )
+
+        assert sorted(results) == [1, 2, 3]
+        assert results[1].count == 10
+        assert results[1]['balance'] == pytest.approx(115.0)
+        assert results[1]['tax'] == pytest.approx(15.0)
+
+    def test_tax_by_month(self, whmcs):
+        results = aggregation.tax_by_month(whmcs.invoices)
+
+        assert {key.month: totals.count for (key, totals) in results.items()} == {1: 15, 2: 15}
+        assert whmcs.transport.requests[0][1]['status'] == 'Paid'
+
+    def test_unknown_field(self, whmcs):
+        with pytest.raises(ValueError):
+            aggregation.aggregate(whmcs.invoices, 'client_id', ('notes',))
@@ -0,0 +1,33 @@
+import pytest
+
+from pywhmcs import breaker
+from pywhmcs import exceptions
+from pywhmcs import transports
+
+
+class TestCircuitBreaker:
+
+    def test_opens_and_probes(self, fake_client):
+        events = []
+        fake_client.breaker = breaker.CircuitBreaker(failure_threshold=2, reset_timeout=0)
+        fake_client.add_hook(lambda event, data: events.append((event, data)))
+        fake_client.transport.add('getinvoices', transports.Response(503, b'<html>Service Unavailable</html>'))
+
+        for _ in range(2):
+            with pytest.raises(exceptions.UnknownError):
+                fake_client.send_request('getinvoices', {})
+
+        assert fake_client.breaker.state('getinvoices') == breaker.OPEN
+        assert fake_client.breaker.state('write') == breaker.CLOSED
+
+        fake_client.breaker.reset_timeout = 60
+        with pytest.raises(exceptions.CircuitOpen):
+            fake_client.send_request('getinvoices', {})
+        assert len(fake_client.transport.requests) == 2
+
+        fake_client.breaker.reset_timeout = 0
+        fake_client.transport.responses['getinvoices'] = {'result': 'success'}
+        fake_client.send_request('getinvoices', {})
+
+        states = [data['state'] for (event, data) in events if event == 'circuit']
+        assert states == [breaker.OPEN, breaker.HALF_OPEN, breaker.CLOSED]
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+from pywhmcs import breaker
+from pywhmcs import exceptions
+from pywhmcs import limiter
+from pywhmcs import transports
+
+
+@pytest.fixture
+def cassette_client(fake_client):
+    fake_client.transport.responses.update({
+        'getinvoice': {'result': 'success', 'invoiceid': 1},
+        'updateclient': {'result': 'success', 'clientid': 2},
+        'getclientsdetails': {
+            'result': 'success',
+            'id': 2,
+            'password': '$2y$10$hash',
+            'securityqans': 'Fluffy',
+            'cclastfour': '1111',
+            'customfields': [{'id': 1, 'value': 'kept'}],
+        },
+    })
+
+    return fake_client
+
+
+class TestCassette:
+
+    @pytest.mark.parametrize('name', ['traffic.jsonl', 'traffic.jsonl.gz'])
+    def test_record_and_replay(self, tmpdir, cassette_client, name):
+        path = str(tmpdir.join(name))
+
+        cassette_client.record(path)
+        cassette_client.send_request('getinvoice', {'invoiceid': 1})
+        cassette_client.send_request('updateclient', {'clientid': 2, 'password2': 'hunter2'})
+        cassette_client.transport.close()
+
+        cassette_client.replay(path, latency_scale=0)
+
+        assert cassette_client.send_request('getinvoice', {'invoiceid': 1})['invoiceid'] == 1
+        assert cassette_client.send_request('updateclient', {'clientid': 2, 'password2': 'hunter2'})['clientid'] == 2
+
+        with pytest.raises(exceptions.ReplayMismatch):
+            cassette_client.send_request('getinvoice', {'invoiceid': 1})
+
+    def test_secrets_redacted(self, tmpdir, cassette_client):
+        path = str(tmpdir.join('traffic.jsonl'))
+
+        cassette_client.record(path)
+        cassette_client.send_request('updateclient', {'clientid': 2, 'password2': 'hunter2'})
+        cassette_client.transport.close()
+
+        content = tmpdir.join('traffic.jsonl').read()
+        entry = json.loads(content)
+
+        assert 'hunter2' not in content
+        assert 'username' not in entry['params']
+        assert entry['params']['password2'] == '***'
+
+    def test_response_redacted(self, tmpdir, cassette_client):
+        path = str(tmpdir.join('traffic.jsonl'))
+
+        cassette_client.record(path)
+        cassette_client.send_request('getclientsdetails', {'clientid': 2})
+        cassette_client.replay(path, latency_scale=0)
+
+        content = tmpdir.join('traffic.jsonl').read()
+        replayed = cassette_client.send_request('getclientsdetails', {'clientid': 2})
+
+        for secret in ('$2y$10$hash', 'Fluffy', '1111'):
+            assert secret not in content
+        assert replayed['cclastfour'] == '***'
+        assert replayed['customfields'] == [{'id': 1, 'value': 'kept'}]
+
+    def test_non_utf8_body(self, tmpdir, cassette_client):
+        path = str(tmpdir.join('traffic.jsonl'))
+        cassette_client.transport.add('getinvoices', transports.Response(502, 'Passerelle défaillante'.encode('latin-1')))
+
+        cassette_client.record(path)
+        with pytest.raises(exceptions.UnknownError):
+            cassette_client.send_request('getinvoices', {})
+        cassette_client.transport.close()
+
+        entry = json.loads(tmpdir.join('traffic.jsonl').read())
+
+        assert entry['status'] == 502
+        assert entry['body'] == 'Passerelle d\ufffdfaillante'
+
+    def test_replay_closes_transport(self, tmpdir, cassette_client):
+        closed = []
+        cassette_client.transport.close = lambda: closed.append(True)
+        path = str(tmpdir.join('traffic.jsonl'))
+        tmpdir.join('traffic.jsonl').write('')
+
+        cassette_client.replay(path, latency_scale=0)
+
+        assert closed == [True]
+
+    def test_mismatch_not_a_failure(self, tmpdir, cassette_client):
+        path = str(tmpdir.join('traffic.jsonl'))
+        tmpdir.join('traffic.jsonl').write('')
+        cassette_client.replay(path, latency_scale=0)
+        cassette_client.breaker = breaker.CircuitBreaker(failure_threshold=1)
+        cassette_client.limiter = limiter.AdaptiveLimiter(initial=4)
+
+        for _ in range(3):
+            with pytest.raises(exceptions.ReplayMismatch):
+                cassette_client.send_request('getinvoice', {'invoiceid': 1})
+
+        assert cassette_client.breaker.state('getinvoice') == breaker.CLOSED
+        assert cassette_client.limiter.limit == 4
+        assert cassette_client.limiter.in_flight == 0
@@ -1,8 +1,37 @@
+import gc
+import threading
+import time
+import weakref
+
 import phonenumbers
 import pytest
 
+from pywhmcs import cache
+from pywhmcs import clients
+from pywhmcs import customfields
 from pywhmcs import exceptions
 
+CLIENT_KEYS = (
+    'userid', 'uuid', 'firstname', 'lastname', 'fullname', 'companyname', 'address1', 'address2',
+    'city', 'state', 'statecode', 'fullstate', 'postcode', 'country', 'countrycode', 'countryname',
+    'billingcid', 'currency', 'currency_code', 'credit', 'cclastfour', 'cctype', 'disableautocc',
+    'phonecc', 'taxexempt', 'phonenumber', 'phonenumberformatted', 'emailoptout', 'allowSingleSignOn',
+    'defaultgateway', 'groupid', 'language', 'lastlogin', 'latefeeoveride', 'overideduenotices',
+    'overrideautoclose', 'password', 'securityqid', 'securityqans', 'separateinvoices', 'twofaenabled',
+)
+
+
+def client_details(client_id, notes=''):
+    return {
+        **{key: '' for key in CLIENT_KEYS},
+        'result': 'success',
+        'id': str(client_id),
+        'email': f'client{client_id}@example.com',
+        'notes': notes,
+        'status': 'Active',
+        'customfields': [],
+    }
+
 
 class TestClientCreate:
 
@@ -52,6 +81,25 @@ class TestClients:
         assert client.id == client_account.id
         assert client.email == client_account.email
 
+    def test_iter(self, whmcs_client, client_account):
+        summaries = list(whmcs_client.clients.iter(search=client_account.email, page_size=1))
+
+        assert [summary.id for summary in summaries] == [client_account.id]
+        assert summaries[0].hydrate().email == client_account.email
+
+    def test_buffer_updates(self, whmcs_client, client_account):
+        with whmcs_client.clients.buffer_updates(interval=None) as updates:
+            updates.update(client_account, address1='1 Buffered St')
+            updates.update(client_account, notes='buffered')
+
+            assert len(updates) == 1
+            assert updates.flush() == {}
+
+        client = whmcs_client.clients.get(client_account.id, refresh=True)
+
+        assert client.address1 == '1 Buffered St'
+        assert client.notes == 'buffered'
+
     def test_update_phone_number(self, whmcs_client, client_account, faker):
         phone_number = phonenumbers.parse('+15135491234', 'US')
 
@@ -95,3 +143,138 @@ class TestClients:
         )
 
         assert order.id in [int(product['orderid']) for product in matches]
+
+    def test_iter_services(self, whmcs_client, client_account, product, order):
+        services = whmcs_client.clients.iter_services(
+            client_account,
+            product_id=product.id,
+            page_size=1
+        )
+
+        assert order.id in [service.order_id for service in services]
+
+
+class TestClientCache:
+
+    def test_get_cached(self, fake_client):
+        fake_client.clients.cache_ttl = 60
+        fake_client.transport.add('getclientsdetails', lambda data: client_details(1))
+        fake_client.transport.add('updateclient', {'result': 'success', 'clientid': '1'})
+
+        client = fake_client.clients.get(1)
+
+        assert fake_client.clients.get('Client1@example.com') is client
+        assert len(fake_client.transport.requests) == 1
+
+        fake_client.clients.update(client, notes='updated')
+
+        assert fake_client.clients.get(1) is not client
+
+    def test_bounded(self, fake_client):
+        fake_client.transport.add('getclientsdetails', lambda data: client_details(data['clientid']))
+        bridge = clients.ClientBridge(fake_client, cache_ttl=60, cache_size=2)
+
+        for client_id in range(1, 6):
+            bridge.get(client_id)
+
+        assert len(bridge._cache) == 4  # pylint: disable=protected-access
+
+    def test_expired_dropped_on_set(self):
+        ttl_cache = cache.TTLCache(ttl=0.05, maxsize=None)
+        ttl_cache.set('old', 1)
+        ttl_cache.set('older', 2)
+        time.sleep(0.1)
+        ttl_cache.set('new', 3)
+
+        assert len(ttl_cache) == 1
+
+    def test_update_during_fetch(self, fake_client):
+        fake_client.clients.cache_ttl = 60
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def details(data):
+            calls.append(data)
+            if len(calls) == 1:
+                started.set()
+                release.wait(5)
+                return client_details(1, notes='before')
+            return client_details(1, notes='after')
+
+        fake_client.transport.add('getclientsdetails', details)
+        fake_client.transport.add('updateclient', {'result': 'success', 'clientid': '1'})
+
+        stale = []
+        thread = threading.Thread(target=lambda: stale.append(fake_client.clients.get(1)))
+        thread.start()
+        started.wait(5)
+
+        fake_client.clients.update(1, notes='after')
+        fresh = fake_client.clients.get(1)
+
+        release.set()
+        thread.join()
+
+        assert stale[0].notes == 'before'
+        assert fresh.notes == 'after'
+        assert fake_client.clients.get(1) is fresh
+
+
+class TestUpdateBuffer:
+
+    def test_coalesced(self, fake_client):
+        fake_client.transport.add('updateclient', {'result': 'success'})
+
+        with fake_client.clients.buffer_updates(interval=None) as updates:
+            updates.update(1, address1='1 Main St', custom_fields={1: 'a'})
+            updates.update(2, notes='other')
+            updates.update(1, notes='second', custom_fields={2: 'b'})
+
+            assert len(updates) == 2
+            assert updates.flush() == {}
+            assert len(updates) == 0
+
+        sent = {
+            data['clientid']: data for (action, data) in fake_client.transport.requests
+            if action == 'updateclient'
+        }
+
+        assert sorted(sent) == ['1', '2']
+        assert sent['1']['address1'] == '1 Main St'
+        assert sent['1']['notes'] == 'second'
+        assert sent['1']['customfields'] == customfields.encode({1: 'a', 2: 'b'})
+
+    def test_flush_order(self, fake_client):
+        fake_client.transport.add('updateclient', {'result': 'success'})
+
+        with fake_client.clients.buffer_updates(interval=None, max_pending=3, workers=1) as updates:
+            for client_id in (3, 1, 2):
+                updates.update(client_id, notes=f'client {client_id}')
+            updates.update(4, notes='client 4')
+
+        sent = [data['clientid'] for (action, data) in fake_client.transport.requests if action == 'updateclient']
+
+        assert sent == ['3', '1', '2', '4']
+
+    def test_unknown_field(self, fake_client):
+        with pytest.raises(TypeError):
+            fake_client.clients.update(1, adress1='1 Main St')
+
+        with fake_client.clients.buffer_updates(interval=None) as updates:
+            with pytest.raises(TypeError):
+                updates.update(1, adress1='1 Main St')
+
+        assert not fake_client.transport.requests
+
+    def test_flushed_when_collected(self, fake_client):
+        fake_client.transport.add('updateclient', {'result': 'success'})
+
+        updates = fake_client.clients.buffer_updates(interval=60)
+        updates.update(1, notes='collected')
+        collected = weakref.ref(updates)
+        del updates
+        gc.collect()
+
+        assert collected() is None
+        assert [action for (action, _) in fake_client.transport.requests] == ['updateclient']
@@ -1,6 +1,40 @@
+import threading
+
 import pytest
 
 from pywhmcs import client
+from pywhmcs import exceptions
+from pywhmcs import transports
+
+
+def coalescing_client(reply):
+    return client.Client(
+        'https://whmcs.example.com/includes/api.php',
+        username='api',
+        password='secret',
+        coalesce_reads=True,
+        transport=transports.FakeTransport({'getproducts': reply}, latency=0.2)
+    )
+
+
+def call_concurrently(func, count=5):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as exc:  # pylint: disable=broad-except
+            results[index] = exc
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
 
 
 class TestClient:
@@ -11,3 +45,53 @@ class TestClient:
             username=config['whmcs']['username'],
             password=config['whmcs']['password']
         )
+
+    def test_coalesce_reads(self, config):
+        c = client.Client(
+            config['whmcs']['api_url'],
+            username=config['whmcs']['username'],
+            password=config['whmcs']['password'],
+            coalesce_reads=True
+        )
+
+        product_id = config.getint('whmcs', 'product_id')
+
+        assert c.products.get(product_id).id == product_id
+
+
+class TestBridges:
+
+    def test_lazy_per_client(self, fake_client):
+        other = coalescing_client({'result': 'success'})
+        created = threading.Event()
+
+        with fake_client._bridge_lock:  # pylint: disable=protected-access
+            thread = threading.Thread(target=lambda: other.invoices and created.set())
+            thread.start()
+            thread.join(5)
+
+        assert created.is_set()
+        assert fake_client.invoices is fake_client.invoices
+        assert fake_client.invoices is not other.invoices
+
+
+class TestCoalescing:
+
+    def test_shared_response(self):
+        c = coalescing_client({'result': 'success', 'totalresults': 1})
+
+        results = call_concurrently(lambda: c.send_request('getproducts', {'pid': 1}))
+
+        assert len(c.transport.requests) == 1
+        assert all(result is results[0] for result in results)
+        assert results[0]['totalresults'] == 1
+
+    def test_shared_error(self):
+        c = coalescing_client({'result': 'error', 'message': 'Command Not Found'})
+
+        results = call_concurrently(lambda: c.send_request('getproducts', {'pid': 1}))
+
+        assert len(c.transport.requests) == 1
+        assert all(isinstance(result, exceptions.CommandNotFound) for result in results)
+        assert len({id(result) for result in results}) == len(results)
+        assert all(result.action == 'getproducts' for result in results)
@@ -0,0 +1,34 @@
+import pickle
+
+from pywhmcs import customfields
+
+
+class TestCustomFields:
+
+    def test_encode_memoized(self, monkeypatch):
+        import phpserialize  # pylint: disable=import-outside-toplevel
+        calls = []
+        dumps = phpserialize.dumps
+        monkeypatch.setattr(phpserialize, 'dumps', lambda value: calls.append(value) or dumps(value))
+        monkeypatch.setattr(customfields, '_memo', type(customfields._memo)())  # pylint: disable=protected-access
+
+        fields = {1: 'a', '2': 'b'}
+        first = customfields.encode(fields)
+        second = customfields.encode({'2': 'b', 1: 'a'})
+
+        assert first == second
+        assert len(calls) == 1
+        assert fields == {1: 'a', '2': 'b'}
+        assert customfields.encode(['a', 'b']) != customfields.encode({'1': 'a', '2': 'b'})
+        assert customfields.encode(first) == first
+
+    def test_decode(self):
+        fields = customfields.CustomFields({'customfield': [{'id': '3', 'value': 'x'}, {'id': 4, 'value': ''}]})
+
+        assert fields == [{'id': '3', 'value': 'x'}, {'id': 4, 'value': ''}]
+        assert fields.get(3) == 'x'
+        assert fields.get('4') == ''
+        assert fields.get(5, 'missing') == 'missing'
+        assert fields.by_id == {3: 'x', 4: ''}
+        assert customfields.CustomFields('') == []
+        assert pickle.loads(pickle.dumps(fields)).get(3) == 'x'
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+from pywhmcs import exceptions
+from pywhmcs import hedging
+
+
+class TestHedging:
+
+    def test_hedges_slow_read(self, fake_client):
+        events = []
+        calls = []
+        fake_client.hedge = hedging.HedgePolicy(min_samples=5, budget=1.0)
+        fake_client.add_hook(lambda event, data: events.append(event))
+
+        def reply(data):
+            calls.append(data['clientid'])
+            if len(calls) == 6:
+                time.sleep(0.5)
+                return {'result': 'success', 'attempt': 'primary'}
+            return {'result': 'success', 'attempt': len(calls)}
+
+        fake_client.transport.add('getclientsdetails', reply)
+
+        for _ in range(5):
+            fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+        response = fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+        assert response['attempt'] == 7
+        assert events.count('hedge') == 1
+        assert fake_client.hedge.hedges == 1
+
+    def test_budget_exhausted(self, fake_client):
+        calls = []
+        fake_client.hedge = hedging.HedgePolicy(min_samples=5, budget=0.0)
+
+        def reply(data):
+            calls.append(data['clientid'])
+            if len(calls) == 6:
+                time.sleep(0.2)
+                return {'result': 'success', 'attempt': 'primary'}
+            return {'result': 'success', 'attempt': len(calls)}
+
+        fake_client.transport.add('getclientsdetails', reply)
+
+        for _ in range(5):
+            fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+        response = fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+        assert response['attempt'] == 'primary'
+        assert len(calls) == 6
+        assert fake_client.hedge.hedges == 0
+
+    def test_failed_winner_falls_back(self, fake_client):
+        calls = []
+        fake_client.hedge = hedging.HedgePolicy(min_samples=5, budget=1.0)
+
+        def reply(data):
+            calls.append(data['clientid'])
+            if len(calls) == 6:
+                time.sleep(0.5)
+                return {'result': 'success', 'attempt': 'primary'}
+            if len(calls) == 7:
+                return {'result': 'error', 'message': 'Client Not Found'}
+            return {'result': 'success', 'attempt': len(calls)}
+
+        fake_client.transport.add('getclientsdetails', reply)
+
+        for _ in range(5):
+            fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+        response = fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+        assert response['attempt'] == 'primary'
+        assert len(calls) == 7
+        assert fake_client.hedge.hedges == 1
+
+    def test_both_failed(self, fake_client):
+        calls = []
+        fake_client.hedge = hedging.HedgePolicy(min_samples=5, budget=1.0)
+
+        def reply(data):
+            calls.append(data['clientid'])
+            if len(calls) == 6:
+                time.sleep(0.5)
+            if len(calls) >= 6:
+                return {'result': 'error', 'message': 'Client Not Found'}
+            return {'result': 'success'}
+
+        fake_client.transport.add('getclientsdetails', reply)
+
+        for _ in range(5):
+            fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+        with pytest.raises(exceptions.ClientNotFound):
+            fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+    def test_concurrent_reads(self, fake_client):
+        fake_client.hedge = hedging.HedgePolicy(min_samples=5, budget=1.0)
+        fake_client.transport.latency = 0.05
+        fake_client.transport.add('getclientsdetails', {'result': 'success'})
+
+        for _ in range(5):
+            fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+        threads = [
+            threading.Thread(target=fake_client.send_request, args=('getclientsdetails', {'clientid': 1}))
+            for _ in range(64)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Waiting for a pool thread is not mistaken for a slow server
+        assert time.perf_counter() - start < 0.3
+        assert fake_client.hedge.hedges < 16
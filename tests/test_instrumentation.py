@@ -0,0 +1,28 @@
+import gzip
+
+from pywhmcs import instrumentation
+from pywhmcs import transports
+
+
+class TestInstrumentation:
+
+    def test_wire_stats(self, fake_client):
+        stats = instrumentation.WireStats()
+        fake_client.add_hook(stats)
+        fake_client.transport.add('getinvoices', {'result': 'success', 'numreturned': 0})
+
+        fake_client.send_request('getinvoices', {})
+        fake_client.send_request('getinvoices', {})
+
+        assert stats.actions['getinvoices']['requests'] == 2
+        assert stats.actions['getinvoices']['bytes_received'] > 0
+        assert 'getinvoices' in stats.report()
+
+    def test_compressed_body(self):
+        transport = transports.Transport()
+        transport.compress_over = 10
+
+        (body, headers) = transport.encode_body({'action': 'updateinvoice', 'notes': 'x' * 1000, 'skip': None})
+
+        assert headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(body) == b'action=updateinvoice&notes=' + b'x' * 1000
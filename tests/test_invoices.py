@@ -34,6 +34,10 @@ class TestInvoices:
         matches = whmcs_client.invoices.list(client_id=client_account.id)
         assert invoice.id in [invoice.id for invoice in matches]
 
+    def test_iter(self, config, whmcs_client, client_account, invoice):
+        matches = whmcs_client.invoices.iter(client_id=client_account.id, page_size=1)
+        assert invoice.id in [invoice.id for invoice in matches]
+
     def test_update(self, config, whmcs_client, invoice):
         date = (datetime.datetime.today() + datetime.timedelta(days=1)).date()
         whmcs_client.invoices.update(invoice.id, date=date)
@@ -0,0 +1,43 @@
+from pywhmcs import limiter
+
+
+class TestAdaptiveLimiter:
+
+    def test_increase_and_backoff(self):
+        adaptive = limiter.AdaptiveLimiter(initial=2, max_limit=4)
+
+        for _ in range(20):
+            assert adaptive.acquire(timeout=1)
+            adaptive.release(0.01)
+
+        assert adaptive.limit == 4
+
+        assert adaptive.acquire(timeout=1)
+        assert adaptive.release(0.01, failed=True) == 2
+        assert adaptive.in_flight == 0
+
+    def test_limits_requests(self, fake_client):
+        events = []
+        fake_client.limiter = limiter.AdaptiveLimiter(initial=1)
+        fake_client.add_hook(lambda event, data: events.append((event, data)))
+        fake_client.transport.add('getinvoices', {'result': 'success'})
+
+        for _ in range(3):
+            fake_client.send_request('getinvoices', {})
+
+        assert fake_client.limiter.in_flight == 0
+        assert ('concurrency', {'action': 'getinvoices', 'limit': 2}) in events
+
+    def test_baseline_per_action(self):
+        adaptive = limiter.AdaptiveLimiter(initial=16, max_limit=16)
+
+        for _ in range(50):
+            for (action, elapsed) in (('getclientsdetails', 0.02), ('getinvoices', 0.3)):
+                assert adaptive.acquire(timeout=1)
+                adaptive.release(elapsed, action=action)
+
+        assert adaptive.limit == 16
+        assert adaptive.baselines == {'getclientsdetails': 0.02, 'getinvoices': 0.3}
+
+        assert adaptive.acquire(timeout=1)
+        assert adaptive.release(0.9, action='getinvoices') == 8
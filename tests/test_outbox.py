@@ -0,0 +1,55 @@
+import pytest
+
+from pywhmcs import outbox
+
+
+@pytest.fixture
+def capture_client(fake_client):
+    fake_client.transport.responses['capturepayment'] = lambda data: (
+        {'result': 'success'} if int(data['invoiceid']) % 2
+        else {'result': 'error', 'message': 'Payment Attempt Failed'}
+    )
+
+    return fake_client
+
+
+class TestOutbox:
+
+    def test_drain(self, capture_client, tmp_path):
+        with outbox.Outbox(capture_client, str(tmp_path / 'outbox.db'), batch_size=3) as box:
+            box.enqueue_many([('capturepayment', {'invoiceid': i}) for i in range(1, 11)])
+            box.start()
+
+            assert box.wait(timeout=5)
+            assert box.counts() == {outbox.SENT: 5, outbox.FAILED: 5}
+            assert box.entries(outbox.FAILED)[0].error == 'Payment attempt failed'
+
+    def test_recover(self, capture_client, tmp_path):
+        path = str(tmp_path / 'outbox.db')
+
+        box = outbox.Outbox(capture_client, path)
+        (first, second) = box.enqueue_many([('capturepayment', {'invoiceid': 1}), ('capturepayment', {'invoiceid': 3})])
+        box._execute('UPDATE outbox SET status = ? WHERE id = ?', (outbox.SENDING, first))  # pylint: disable=protected-access
+        box._db.close()  # pylint: disable=protected-access
+
+        with outbox.Outbox(capture_client, path) as box:
+            assert box.counts() == {outbox.UNKNOWN: 1, outbox.PENDING: 1}
+
+            box.drain()
+
+            assert [entry.id for entry in box.entries(outbox.SENT)] == [second]
+            assert len(capture_client.transport.requests) == 1
+
+    def test_batch_in_transaction(self, capture_client, tmp_path):
+        with outbox.Outbox(capture_client, str(tmp_path / 'outbox.db'), batch_size=5) as box:
+            box.enqueue_many([('capturepayment', {'invoiceid': i}) for i in range(1, 6)])
+            updates = []
+            box._db.set_trace_callback(  # pylint: disable=protected-access
+                lambda statement: statement.startswith('UPDATE') and updates.append(box._db.in_transaction)  # pylint: disable=protected-access
+            )
+
+            box.drain()
+            box.retry([entry.id for entry in box.entries(outbox.FAILED)])
+
+            assert len(updates) == 12
+            assert all(updates)
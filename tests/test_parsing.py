@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from pywhmcs import client
+from pywhmcs import exceptions
+from pywhmcs import invoices
+from pywhmcs import parsing
+from pywhmcs import transports
+
+
+def invoice_record(invoice_id):
+    return {
+        'id': str(invoice_id),
+        'userid': '1',
+        'invoicenum': '',
+        'date': '2020-01-01',
+        'duedate': '2020-01-15',
+        'datepaid': '0000-00-00 00:00:00',
+        'subtotal': '10.00',
+        'credit': '0.00',
+        'tax': '0.00',
+        'tax2': '0.00',
+        'taxrate': '0.00',
+        'taxrate2': '0.00',
+        'total': '10.00',
+        'status': 'Unpaid',
+        'paymentmethod': 'paypal',
+        'notes': '',
+    }
+
+
+def get_invoices(data, cap=None, total=25):
+    start = int(data['limitstart'])
+    stop = min(start + min(int(data['limitnum']), cap or total), total)
+
+    return {
+        'result': 'success',
+        'totalresults': total,
+        'startnumber': start,
+        'numreturned': stop - start,
+        'invoices': {'invoice': [invoice_record(i) for i in range(start + 1, stop + 1)]},
+    }
+
+
+def invoices_client(reply, parser=None):
+    return client.Client(
+        'https://whmcs.example.com/includes/api.php',
+        username='api',
+        password='secret',
+        transport=transports.FakeTransport({'getinvoices': reply}),
+        parser=parser
+    )
+
+
+@pytest.fixture
+def parser():
+    parser = parsing.ProcessParser(max_workers=2)
+    yield parser
+    parser.close()
+
+
+class TestParsing:
+
+    def test_parse_page(self):
+        (meta, rows) = parsing.parse_page(
+            b'{"result": "success", "totalresults": 1, "invoices": {"invoice": [{"id": "3"}]}}',
+            'invoices.invoice',
+            lambda record: {'id': int(record['id'])},
+            ['id']
+        )
+
+        assert meta == {'result': 'success', 'totalresults': 1}
+        assert rows == [(3,)]
+
+    def test_process_parser(self, parser):
+        whmcs = invoices_client(get_invoices, parser)
+
+        results = list(whmcs.invoices.iter(page_size=10))
+
+        assert [invoice.id for invoice in results] == list(range(1, 26))
+        assert all(isinstance(invoice, invoices.Invoice) for invoice in results)
+        assert results[0].bridge is whmcs.invoices
+        assert results[0].status is results[-1].status
+        assert len(whmcs.transport.requests) == 3
+
+    def test_concurrent_fetches(self, parser):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def reply(data):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return get_invoices(data)
+
+        results = list(invoices_client(reply, parser).invoices.iter(page_size=5))
+
+        assert [invoice.id for invoice in results] == list(range(1, 26))
+        assert running[1] > 1
+
+    @pytest.mark.parametrize('with_parser', [False, True])
+    def test_short_pages(self, parser, with_parser):
+        whmcs = invoices_client(lambda data: get_invoices(data, cap=7), parser if with_parser else None)
+
+        results = list(whmcs.invoices.iter(page_size=10))
+
+        assert [invoice.id for invoice in results] == list(range(1, 26))
+
+    @pytest.mark.parametrize('with_parser', [False, True])
+    def test_missing_records(self, parser, with_parser):
+        def reply(data):
+            body = get_invoices(data)
+            body['totalresults'] = 30
+            return body
+
+        whmcs = invoices_client(reply, parser if with_parser else None)
+
+        with pytest.raises(exceptions.IncompleteListing):
+            list(whmcs.invoices.iter(page_size=10))
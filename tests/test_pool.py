@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from pywhmcs import exceptions
+from pywhmcs import pool
+from pywhmcs import transports
+
+
+def getinvoices(data):
+    start = int(data['limitstart'])
+    page = [{'id': str(idx)} for idx in range(start, min(start + int(data['limitnum']), 5))]
+
+    return {
+        'result': 'success',
+        'totalresults': 5,
+        'numreturned': len(page),
+        'invoices': {'invoice': page}
+    }
+
+
+@pytest.fixture
+def client_pool():
+    transport = transports.FakeTransport({
+        'getinvoices': getinvoices,
+        'getproducts': {'result': 'success', 'totalresults': 0},
+    })
+    client_pool = pool.ClientPool(transport=transport, max_workers=4, per_tenant=2)
+
+    for name in ('alpha', 'beta', 'gamma'):
+        client_pool.add(name, f'https://{name}.example.com/includes/api.php', 'api', 'secret')
+
+    yield client_pool
+
+    client_pool.close()
+
+
+class TestClientPool:
+
+    def test_map(self, client_pool):
+        results = dict(client_pool.map(lambda client: client.send_request('getproducts', {})))
+
+        assert sorted(results) == ['alpha', 'beta', 'gamma']
+
+    def test_map_exceptions(self, client_pool):
+        def func(client):
+            if 'beta' in client.api_url:
+                raise exceptions.UnknownError('Failed')
+            return client.api_url
+
+        results = dict(client_pool.map(func, return_exceptions=True))
+
+        assert isinstance(results['beta'], exceptions.UnknownError)
+
+        with pytest.raises(exceptions.UnknownError):
+            list(client_pool.map(func))
+
+    def test_stream(self, client_pool):
+        matches = list(client_pool.stream(
+            lambda client: client.stream_request('getinvoices', {'limitstart': 0, 'limitnum': 10}, path='invoices.invoice')
+        ))
+
+        assert len(matches) == 15
+        assert {name for (name, _) in matches} == {'alpha', 'beta', 'gamma'}
+
+    def test_duplicate_tenant(self, client_pool):
+        with pytest.raises(ValueError):
+            client_pool.add('alpha', 'https://alpha.example.com/includes/api.php', 'api', 'secret')
+
+    def test_stream_takes_turns(self, client_pool):
+        client_pool.max_workers = 1
+
+        matches = list(client_pool.stream(lambda client: iter(range(3)), chunk=1))
+
+        assert len(matches) == 9
+        assert len({name for (name, _) in matches[:3]}) == 3
+
+    def test_readd_while_running(self, client_pool):
+        started = threading.Event()
+        finish = threading.Event()
+
+        def slow(client):
+            started.set()
+            finish.wait(5)
+            return client.api_url
+
+        first = client_pool.submit('alpha', slow)
+        assert started.wait(5)
+
+        client_pool.remove('alpha')
+        client_pool.add('alpha', 'https://alpha2.example.com/includes/api.php', 'api', 'secret', max_concurrency=1)
+        second = client_pool.submit('alpha', lambda client: client.api_url)
+
+        # The removed tenant's call still holds the only slot
+        time.sleep(0.1)
+        assert not second.done()
+
+        finish.set()
+        assert first.result(timeout=5) == 'https://alpha.example.com/includes/api.php'
+        assert second.result(timeout=5) == 'https://alpha2.example.com/includes/api.php'
+
+    def test_remove_during_stream(self, client_pool):
+        def func(client):
+            if 'beta' in client.api_url:
+                client_pool.remove('beta')
+            return iter(range(3))
+
+        client_pool.max_workers = 1
+
+        matches = list(client_pool.stream(func, chunk=1))
+
+        assert sorted(name for (name, _) in matches if name != 'beta') == ['alpha'] * 3 + ['gamma'] * 3
+
+    def test_replay_keeps_shared_transport(self, tmpdir, client_pool):
+        closed = []
+        client_pool.transport.close = lambda: closed.append(True)
+        path = str(tmpdir.join('traffic.jsonl'))
+
+        client_pool['alpha'].record(path)
+        client_pool['alpha'].send_request('getproducts', {})
+        client_pool['alpha'].replay(path, latency_scale=0)
+
+        assert client_pool['alpha'].send_request('getproducts', {})['totalresults'] == 0
+        assert closed == []
+        assert client_pool['beta'].transport is client_pool.transport
+        assert client_pool['beta'].send_request('getproducts', {})['result'] == 'success'
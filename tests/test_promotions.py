@@ -1,5 +1,32 @@
+import datetime
+import threading
+import time
+
 import pytest
 
+from pywhmcs import exceptions
+
+
+def promotion_record(promotion_id, code, applies_to='', value='10.00', **fields):
+    record = {
+        'id': str(promotion_id), 'code': code, 'type': 'Percentage', 'recurring': '0', 'value': value,
+        'cycles': '', 'recurfor': '0', 'appliesto': applies_to, 'requires': '', 'requiresexisting': '0',
+        'startdate': '0000-00-00', 'expirationdate': '0000-00-00', 'maxuses': '0', 'uses': '0',
+        'lifetimepromo': '0', 'applyonce': '0', 'newsignups': '0', 'existingclient': '0',
+        'onceperclient': '0', 'upgrades': '0', 'upgradeconfig': '', 'notes': '',
+    }
+    record.update(fields)
+    return record
+
+
+def get_promotions(*records):
+    return {
+        'result': 'success',
+        'totalresults': len(records),
+        'numreturned': len(records),
+        'promotions': {'promotion': list(records)},
+    }
+
 
 class TestPromotions:
 
@@ -9,3 +36,107 @@ class TestPromotions:
     def test_list(self, config, whmcs_client):
         matches = whmcs_client.promotions.list()
         assert config['whmcs']['promotion_code'] in [promotion.code for promotion in matches]
+
+    def test_index(self, config, whmcs_client):
+        index = whmcs_client.promotions.index()
+        promotion = index.get(config['whmcs']['promotion_code'])
+
+        assert promotion
+        assert promotion.code == whmcs_client.promotions.get(promotion.code).code
+        assert index.is_valid('NOT-A-REAL-PROMOTION-CODE') is False
+
+
+class TestPromotionIndex:
+
+    def test_refresh(self, fake_client):
+        fake_client.transport.add('getpromotions', get_promotions(
+            promotion_record(1, 'SPRING', applies_to='1,2'),
+            promotion_record(2, 'SUMMER', applies_to='2'),
+        ))
+        fake_client.transport.add('getpromotions', get_promotions(
+            promotion_record(1, 'SPRING', applies_to='1,2'),
+            promotion_record(2, 'SUMMER', applies_to='3', value='20.00'),
+            promotion_record(3, 'AUTUMN'),
+        ))
+
+        index = fake_client.promotions.index()
+        spring = index.get('spring')
+
+        assert len(index) == 2
+        assert {promotion.code for promotion in index.applying_to(2)} == {'SPRING', 'SUMMER'}
+        assert index.is_valid('SUMMER', product_id=2)
+
+        index.refresh()
+
+        assert len(index) == 3
+        assert index.get('SPRING') is spring
+        assert index.get('SUMMER').value == 20.0
+        assert [promotion.code for promotion in index.applying_to(2)] == ['SPRING']
+        assert index.is_valid('SUMMER', product_id=2) is False
+        assert 'AUTUMN' in index
+
+    def test_validate(self, fake_client):
+        fake_client.transport.add('getpromotions', get_promotions(
+            promotion_record(1, 'DATED', startdate='2020-03-01', expirationdate='2020-03-31'),
+            promotion_record(2, 'LIMITED', maxuses='5', uses='5'),
+            promotion_record(3, 'ONCE', onceperclient='1'),
+            promotion_record(4, 'WELCOME', newsignups='1'),
+            promotion_record(5, 'BUNDLE', requires='7'),
+            promotion_record(6, 'UNLIMITED', maxuses='0', uses='100'),
+        ))
+        index = fake_client.promotions.index()
+
+        def invalid(code, **kwargs):
+            with pytest.raises(exceptions.PromotionInvalid) as excinfo:
+                index.validate(code, today=datetime.date(2020, 3, 15), **kwargs)
+            return str(excinfo.value)
+
+        assert index.validate('DATED', today=datetime.date(2020, 3, 1)).id == 1
+        assert index.validate('DATED', today=datetime.date(2020, 3, 31)).id == 1
+        with pytest.raises(exceptions.PromotionInvalid, match='not started'):
+            index.validate('DATED', today=datetime.date(2020, 2, 29))
+        with pytest.raises(exceptions.PromotionInvalid, match='expired'):
+            index.validate('DATED', today=datetime.date(2020, 4, 1))
+
+        assert 'maximum uses' in invalid('LIMITED')
+        assert index.is_valid('UNLIMITED')
+
+        assert 'once per client' in invalid('ONCE', client_has_used=True)
+        assert index.is_valid('ONCE')
+
+        assert 'new signups' in invalid('WELCOME')
+        assert index.is_valid('WELCOME', new_signup=True)
+
+        assert 'requires' in invalid('BUNDLE', cart_product_ids=[3])
+        assert index.is_valid('BUNDLE', cart_product_ids=[3, 7])
+
+        with pytest.raises(exceptions.PromotionNotFound):
+            index.validate('MISSING')
+
+    def test_refresh_once_when_stale(self, fake_client):
+        calls = []
+
+        def promotions(data):
+            calls.append(data)
+            time.sleep(0.1)
+            return get_promotions(promotion_record(1, 'SPRING'))
+
+        fake_client.transport.add('getpromotions', promotions)
+        index = fake_client.promotions.index(max_age=60)
+        index.refreshed_at -= 120
+
+        barrier = threading.Barrier(8)
+        found = []
+
+        def lookup():
+            barrier.wait()
+            found.append(index.get('SPRING'))
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 2
+        assert all(promotion is not None for promotion in found)
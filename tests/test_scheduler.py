@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from pywhmcs import scheduler
+
+
+class TestPriorityScheduler:
+
+    def test_weighted_order(self):
+        fair = scheduler.PriorityScheduler(max_concurrency=1)
+        served = []
+
+        def request(priority):
+            fair.acquire(priority)
+            served.append(priority)
+            fair.release()
+
+        fair.acquire(scheduler.BATCH)
+
+        threads = []
+        for priority in [scheduler.BATCH] * 3 + [scheduler.INTERACTIVE]:
+            thread = threading.Thread(target=request, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            while sum(fair.queued.values()) < len(threads):
+                time.sleep(0.001)
+
+        fair.release()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert served == [scheduler.INTERACTIVE] + [scheduler.BATCH] * 3
+
+    def test_interrupted_wait(self):
+        fair = scheduler.PriorityScheduler(max_concurrency=1)
+        fair.acquire(scheduler.BATCH)
+
+        def interrupt(predicate, timeout=None):
+            raise KeyboardInterrupt
+
+        fair._condition.wait_for = interrupt
+        with pytest.raises(KeyboardInterrupt):
+            fair.acquire(scheduler.INTERACTIVE)
+        del fair._condition.wait_for
+
+        assert not fair.queued
+
+        waiter = threading.Thread(target=fair.acquire, args=(scheduler.BATCH,))
+        waiter.start()
+        fair.release()
+        waiter.join(timeout=5)
+
+        assert not waiter.is_alive()
+
+    def test_client_priority(self, fake_client):
+        events = []
+        fake_client.scheduler = scheduler.PriorityScheduler()
+        fake_client.add_hook(lambda event, data: events.append((event, data)))
+        fake_client.transport.add('getclientsdetails', {'result': 'success'})
+
+        fake_client.send_request('getclientsdetails', {'clientid': 1})
+        with fake_client.priority(scheduler.BATCH):
+            fake_client.send_request('getclientsdetails', {'clientid': 1})
+
+        priorities = [data['priority'] for (event, data) in events if event == 'schedule']
+        assert priorities == [scheduler.INTERACTIVE, scheduler.BATCH]
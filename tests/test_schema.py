@@ -0,0 +1,85 @@
+import datetime
+import pickle
+
+import pytest
+
+from pywhmcs import invoices
+from pywhmcs import schema
+
+
+def invoice_record(**fields):
+    return {
+        'id': '1', 'userid': '2', 'invoicenum': '', 'date': '2020-01-01', 'duedate': '2020-01-15',
+        'datepaid': '2020-01-03 10:11:12', 'subtotal': '10.00', 'credit': '0.00', 'tax': '0.00',
+        'tax2': '0.00', 'taxrate': '0.00', 'taxrate2': '0.00', 'total': '10.00', 'status': 'Paid',
+        'paymentmethod': 'paypal', 'notes': '', **fields,
+    }
+
+
+class TestSchema:
+
+    def test_compile_parser(self):
+        parse = schema.compile_parser('parse_thing', {
+            'id': schema.Field('id', int, aliases=('thingid',)),
+            'name': 'name',
+            'date': schema.Field('date', schema.date, default=None),
+            'tags': schema.Field('tags', schema.split, default=''),
+            'item': schema.Field('items.item', default=None),
+            'notes': schema.Field('notes', empty_none=True, default=''),
+        })
+
+        assert parse({'thingid': '3', 'name': 'Thing', 'items': {'item': [1]}, 'tags': 'a,,b'}) == {
+            'id': 3,
+            'name': 'Thing',
+            'date': None,
+            'tags': ['a', 'b'],
+            'item': [1],
+            'notes': None,
+        }
+        assert parse({'id': '4', 'name': '', 'date': '2020-01-02', 'items': ''})['date'] == datetime.date(2020, 1, 2)
+
+        with pytest.raises(KeyError):
+            parse({'id': '5'})
+
+    def test_required_nested(self):
+        parse = schema.compile_parser('parse_thing', {'item': schema.Field('items.item', int)})
+
+        assert parse({'items': {'item': '7'}}) == {'item': 7}
+
+        for record in ({}, {'items': ''}, {'items': {'other': 1}}):
+            with pytest.raises(KeyError):
+                parse(record)
+
+    def test_parse_invoice(self):
+        parsed = invoices.parse_invoice(invoice_record())
+
+        assert parsed['date_paid'] == datetime.date(2020, 1, 3)
+        assert parsed['status'] == 'paid'
+        assert pickle.loads(pickle.dumps(invoices.parse_invoice)) is invoices.parse_invoice
+
+    def test_timestamp(self):
+        assert schema.timestamp('0000-00-00 00:00:00') is None
+        assert schema.date('0000-00-00') is None
+        assert schema.timestamp('2020-01-02 03:04:05') is schema.timestamp('2020-01-02 03:04:05')
+
+        schema.set_timezone(datetime.timezone.utc)
+        try:
+            parsed = schema.timestamp('2020-01-02 03:04:05')
+        finally:
+            schema.set_timezone(None)
+
+        assert parsed == datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        assert schema.timestamp('2020-01-02 03:04:05').tzinfo is None
+
+        with pytest.raises(ValueError):
+            schema.date('2020-13-01')
+
+    def test_intern(self):
+        status = ''.join(['Un', 'paid'])
+        first = invoices.parse_invoice(invoice_record(status=status, paymentmethod=''.join(['pay', 'pal'])))
+        second = invoices.parse_invoice(invoice_record(status=status, paymentmethod=''.join(['pay', 'pal'])))
+
+        assert first['status'] is second['status'] == 'unpaid'
+        assert first['payment_method'] is second['payment_method'] == 'paypal'
+        assert invoices.parse_invoice.__interned__ == {'status', 'payment_method'}
+        assert schema.symbol(None) is None
@@ -0,0 +1,85 @@
+import gzip
+import threading
+import time
+
+import pytest
+
+from pywhmcs import breaker
+from pywhmcs import exceptions
+from pywhmcs import limiter
+from pywhmcs import scheduler
+from pywhmcs import transports
+
+
+class TestStreaming:
+
+    def test_stream_request(self, fake_client):
+        fake_client.transport.add('getinvoices', {
+            'result': 'success',
+            'totalresults': 2,
+            'numreturned': 2,
+            'invoices': {'invoice': [{'id': '1'}, {'id': '2', 'items': {'item': [{'id': 3}]}}]}
+        })
+        meta = {}
+
+        records = list(fake_client.stream_request(
+            'getinvoices', {}, path='invoices.invoice', meta=meta
+        ))
+
+        assert records == [{'id': '1'}, {'id': '2', 'items': {'item': [{'id': 3}]}}]
+        assert meta['totalresults'] == 2
+
+    def test_stream_request_error(self, fake_client):
+        fake_client.transport.add('getticket', {'result': 'error', 'message': 'Ticket ID Not Found'})
+
+        with pytest.raises(exceptions.TicketNotFound):
+            list(fake_client.stream_request('getticket', {'ticketid': 1}, path='replies.reply'))
+
+    def test_slots_freed_before_records(self, fake_client):
+        fake_client.limiter = limiter.AdaptiveLimiter(initial=2)
+        fake_client.transport.add('getinvoices', {'result': 'success', 'invoices': {'invoice': [{'id': '1'}, {'id': '2'}]}})
+
+        records = fake_client.stream_request('getinvoices', {}, path='invoices.invoice')
+        next(records)
+
+        assert fake_client.limiter.in_flight == 0
+
+    @pytest.mark.parametrize('setting', ['scheduler', 'limiter'])
+    def test_request_while_iterating(self, fake_client, setting):
+        if setting == 'scheduler':
+            fake_client.scheduler = scheduler.PriorityScheduler(max_concurrency=1)
+        else:
+            fake_client.limiter = limiter.AdaptiveLimiter(initial=1, max_limit=1)
+        fake_client.transport.add('getinvoices', {'result': 'success', 'invoices': {'invoice': [{'id': '1'}, {'id': '2'}]}})
+        fake_client.transport.add('getinvoice', {'result': 'success'})
+        fetched = []
+
+        def iterate():
+            for record in fake_client.stream_request('getinvoices', {}, path='invoices.invoice'):
+                fetched.append(fake_client.send_request('getinvoice', {'invoiceid': record['id']}))
+
+        thread = threading.Thread(target=iterate, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert len(fetched) == 2
+
+    def test_slow_consumer(self, fake_client):
+        fake_client.breaker = breaker.CircuitBreaker(failure_threshold=1, slow_call=0.2)
+        fake_client.transport.add('getinvoices', {'result': 'success', 'invoices': {'invoice': [{'id': str(i)} for i in range(5)]}})
+
+        for _ in fake_client.stream_request('getinvoices', {}, path='invoices.invoice'):
+            time.sleep(0.06)
+
+        assert fake_client.breaker.state('getinvoices') == breaker.CLOSED
+        fake_client.send_request('getinvoices', {})
+
+    def test_chunk_reader(self):
+        body = b'{"products": {"product": [1, 2]}}'
+        compressed = gzip.compress(body)
+        reader = transports.ChunkReader(iter([compressed[:10], compressed[10:]]), 'gzip')
+
+        assert reader.read() == body
+        assert reader.wire_size == len(compressed)
+        assert reader.decoded_size == len(body)
@@ -1,6 +1,22 @@
+import threading
+import time
+
 import pytest
 
 from pywhmcs import exceptions
+from pywhmcs import limiter
+from pywhmcs import tickets
+
+
+def ticket_details(ticket_id, replies=0):
+    return {
+        'result': 'success', 'ticketid': str(ticket_id), 'tid': '123456', 'deptid': '1', 'deptname': 'Support',
+        'userid': '1', 'contactid': '0', 'name': 'John', 'email': 'john@example.com', 'cc': '',
+        'date': '2020-01-01 10:00:00', 'lastreply': '2020-01-02 11:00:00', 'subject': 'Help',
+        'status': 'Open', 'priority': 'Medium', 'admin': '', 'flag': '0', 'service': '',
+        'replies': {'reply': [{'replyid': str(i), 'message': 'x' * 100} for i in range(replies)]},
+        'notes': {'note': [{'noteid': '1', 'message': 'internal'}]},
+    }
 
 
 class TestTicketCreate:
@@ -28,6 +44,56 @@ class TestTickets:
         assert ticket.status == 'open'
         assert ticket.client_id == client_account.id
 
+    def test_list(self, whmcs_client, client_account, ticket):
+        matches = whmcs_client.tickets.list(detailed=False, client_id=client_account.id)
+        assert ticket.id in [summary.id for summary in matches]
+
+        matches = whmcs_client.tickets.iter(client_id=client_account.id, detailed=True, workers=2)
+        assert ticket.id in [match.id for match in matches]
+
+    def test_iter_detailed_offline(self, fake_client):
+        # A single slot: hydrating must not wait on the listing's request
+        fake_client.limiter = limiter.AdaptiveLimiter(initial=1, max_limit=1)
+        details = [ticket_details(ticket_id) for ticket_id in (1, 2)]
+        fake_client.transport.add('gettickets', {
+            'result': 'success',
+            'totalresults': 2,
+            'tickets': {'ticket': [dict(detail, id=detail['ticketid']) for detail in details]}
+        })
+        fake_client.transport.responses['getticket'] = details
+
+        tickets = list(fake_client.tickets.iter(detailed=True, replies=False))
+
+        assert [ticket.id for ticket in tickets] == [1, 2]
+        assert fake_client.limiter.in_flight == 0
+
+    def test_list_offline(self, fake_client):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def details(data):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return ticket_details(data['ticketid'])
+
+        records = [dict(ticket_details(ticket_id), id=str(ticket_id)) for ticket_id in range(1, 9)]
+        fake_client.transport.add('gettickets', {'result': 'success', 'totalresults': 8, 'tickets': {'ticket': records}})
+        fake_client.transport.add('getticket', details)
+
+        summaries = fake_client.tickets.list()
+
+        assert all(isinstance(summary, tickets.TicketSummary) for summary in summaries)
+        assert len(fake_client.transport.requests) == 1
+
+        detailed = fake_client.tickets.list(detailed=True, replies=False)
+
+        assert [ticket.id for ticket in detailed] == list(range(1, 9))
+        assert running[1] > 1
+
 
 class TestTicketDelete:
 
@@ -44,3 +110,30 @@ class TestTicketDelete:
 
         with pytest.raises(exceptions.TicketNotFound):
             whmcs_client.tickets.get(ticket.id)
+
+
+class TestTicketReplies:
+
+    def test_get_without_replies(self, whmcs_client, ticket):
+        header = whmcs_client.tickets.get(ticket.id, replies=False)
+
+        assert not header.replies.loaded
+        assert list(header.replies) == list(whmcs_client.tickets.iter_replies(ticket))
+        assert len(header.replies) == len(list(whmcs_client.tickets.iter_replies(ticket)))
+
+    def test_get_without_replies_offline(self, fake_client):
+        fake_client.transport.add('getticket', ticket_details(7, replies=50))
+
+        header = fake_client.tickets.get(7, replies=False)
+
+        assert header.id == 7
+        assert header.notes == {'note': [{'noteid': '1', 'message': 'internal'}]}
+        assert header.date_last_reply.day == 2
+        assert len(header.replies) == 50
+        assert len(fake_client.transport.requests) == 1
+
+        assert [reply['replyid'] for reply in header.replies][-1] == '49'
+        assert not header.replies.loaded
+        assert header.replies[0]['replyid'] == '0'
+        assert header.replies.loaded
+        assert len(fake_client.transport.requests) == 3
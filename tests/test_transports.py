@@ -0,0 +1,62 @@
+import pytest
+import requests
+
+from pywhmcs import exceptions
+from pywhmcs import transports
+
+
+class TestTransport:
+
+    def test_encode_body_matches_requests(self):
+        data = {
+            'action': 'addorder',
+            'clientid': 1,
+            'pid': [1, 2],
+            'domain': ('example.com', 'example.net'),
+            'notes': 'a & b',
+            'promocode': None,
+        }
+
+        (body, _) = transports.Transport().encode_body(data)
+
+        prepared = requests.Request('POST', 'https://whmcs.example.com/', data=data).prepare()
+        assert body.decode('ascii') == prepared.body
+
+
+class TestFakeTransport:
+
+    def test_send_request(self, fake_client):
+        fake_client.transport.add('getproducts', {'result': 'success', 'totalresults': 0})
+
+        response = fake_client.send_request('getproducts', {'pid': 1})
+
+        assert response['totalresults'] == 0
+        assert fake_client.transport.requests[0][0] == 'getproducts'
+        assert fake_client.transport.requests[0][1]['pid'] == 1
+
+    def test_replies_in_order(self, fake_client):
+        fake_client.transport.add('getproducts', {'result': 'success', 'call': 1})
+        fake_client.transport.add('getproducts', {'result': 'success', 'call': 2})
+
+        assert fake_client.send_request('getproducts', {})['call'] == 1
+        assert fake_client.send_request('getproducts', {})['call'] == 2
+        assert fake_client.send_request('getproducts', {})['call'] == 2
+
+    def test_error(self, fake_client):
+        fake_client.transport.add('getticket', {'result': 'error', 'message': 'Ticket ID Not Found'})
+
+        with pytest.raises(exceptions.TicketNotFound):
+            fake_client.send_request('getticket', {'ticketid': 1})
+
+    def test_unknown_action(self, fake_client):
+        with pytest.raises(exceptions.CommandNotFound):
+            fake_client.send_request('getnothing', {})
+
+    def test_customfields_encoded(self, fake_client):
+        fake_client.transport.add('addorder', {'result': 'success', 'orderid': 1})
+        params = {'clientid': 1, 'customfields': {1: 'value'}}
+
+        fake_client.send_request('addorder', params)
+
+        assert params['customfields'] == {1: 'value'}
+        assert fake_client.transport.requests[0][1]['customfields'] == 'YToxOntpOjE7czo1OiJ2YWx1ZSI7fQ=='